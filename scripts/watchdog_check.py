@@ -33,10 +33,17 @@ import logging
 import os
 import sys
 from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import TYPE_CHECKING
 
-from social_agent.control import HealthStatus, SandboxController
+from social_agent.control import HealthCheck, HealthStatus, SandboxController
 from social_agent.lifecycle import LifecycleManager
 
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+
+    from social_agent.control import SandboxInfo
+
 logger = logging.getLogger("watchdog")
 
 # Watchdog-specific thresholds
@@ -49,11 +56,11 @@ class WatchdogResult:
 
     action: str  # "healthy", "unknown", "deployed", "recovered", "cleaned", "failed"
     sandbox_id: str = ""
-    killed: list[str] = field(default_factory=list)
+    killed: tuple[str, ...] = ()
     error: str = ""
 
 
-@dataclass
+@dataclass(frozen=True)
 class WatchdogConfig:
     """Configuration for watchdog from environment variables."""
 
@@ -61,19 +68,26 @@ class WatchdogConfig:
     brain_repo_url: str
     github_token: str
     stuck_threshold_s: float = _STUCK_THRESHOLD_S
-    # All secrets to inject when deploying a new sandbox
-    envs: dict[str, str] = field(default_factory=dict)
+    # All secrets to inject when deploying a new sandbox. Stored as a
+    # read-only copy, so the frozen config is immutable all the way down.
+    envs: Mapping[str, str] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "envs", MappingProxyType(dict(self.envs)))
 
     @classmethod
-    def from_env(cls) -> WatchdogConfig:
+    def from_env(cls, *, environ: Mapping[str, str] = os.environ) -> WatchdogConfig:
         """Load config from environment variables.
 
+        Args:
+            environ: Variables to read; defaults to the process environment.
+
         Raises:
             SystemExit: If required variables are missing.
         """
-        e2b_key = os.environ.get("E2B_API_KEY", "")
-        brain_url = os.environ.get("BRAIN_REPO_URL", "")
-        gh_token = os.environ.get("GITHUB_TOKEN", "")
+        e2b_key = environ.get("E2B_API_KEY", "")
+        brain_url = environ.get("BRAIN_REPO_URL", "")
+        gh_token = environ.get("GITHUB_TOKEN", "")
 
         missing = []
         if not e2b_key:
@@ -102,7 +116,7 @@ class WatchdogConfig:
             "GIT_SYNC_ENABLED",
             "BRAIN_REPO_URL",
         )
-        envs = {k: v for k in inject_keys if (v := os.environ.get(k, ""))}
+        envs = {k: v for k in inject_keys if (v := environ.get(k, ""))}
 
         return cls(
             e2b_api_key=e2b_key,
@@ -112,33 +126,47 @@ class WatchdogConfig:
         )
 
 
-def run_watchdog(config: WatchdogConfig) -> WatchdogResult:
+def run_watchdog(
+    config: WatchdogConfig,
+    *,
+    controller_factory: Callable[..., SandboxController] = SandboxController,
+    lifecycle_factory: Callable[..., LifecycleManager] = LifecycleManager,
+) -> WatchdogResult:
     """Execute a single watchdog check cycle.
 
     Args:
         config: Watchdog configuration.
+        controller_factory: Builds the controller; called with ``api_key=``.
+        lifecycle_factory: Builds the lifecycle manager; called with
+            ``controller=`` and ``e2b_api_key=``.
 
     Returns:
         WatchdogResult describing what action was taken.
     """
-    controller = SandboxController(api_key=config.e2b_api_key)
-    lifecycle = LifecycleManager(
+    controller = controller_factory(api_key=config.e2b_api_key)
+    lifecycle = lifecycle_factory(
         controller=controller,
         e2b_api_key=config.e2b_api_key,
     )
 
-    # Step 1: List running sandboxes
-    sandboxes = controller.list_sandboxes()
-    logger.info("Found %d running sandbox(es)", len(sandboxes))
+    try:
+        # Step 1: List running sandboxes
+        sandboxes = controller.list_sandboxes()
+        logger.info("Found %d running sandbox(es)", len(sandboxes))
 
-    if len(sandboxes) == 0:
-        return _handle_no_sandboxes(lifecycle, config)
+        if len(sandboxes) == 0:
+            return _handle_no_sandboxes(lifecycle, config)
 
-    if len(sandboxes) == 1:
-        return _handle_one_sandbox(controller, lifecycle, config, sandboxes[0].sandbox_id)
+        if len(sandboxes) == 1:
+            return _handle_one_sandbox(controller, lifecycle, config, sandboxes[0].sandbox_id)
 
-    # Multiple sandboxes — find the healthiest, kill the rest
-    return _handle_multiple_sandboxes(controller, lifecycle, config, sandboxes)
+        # Multiple sandboxes — find the healthiest, kill the rest
+        health_by_id = _check_all_health(controller, config, sandboxes)
+        return _handle_multiple_sandboxes(
+            controller, lifecycle, config, sandboxes, health_by_id,
+        )
+    finally:
+        controller.close()
 
 
 def _handle_no_sandboxes(
@@ -197,7 +225,7 @@ def _handle_one_sandbox(
         if new_id is None:
             return WatchdogResult(
                 action="failed",
-                killed=[sandbox_id],
+                killed=(sandbox_id,),
                 error="Killed stuck sandbox but failed to create replacement",
             )
 
@@ -211,7 +239,7 @@ def _handle_one_sandbox(
             lifecycle.controller.kill(new_id)
             return WatchdogResult(
                 action="failed",
-                killed=[sandbox_id],
+                killed=(sandbox_id,),
                 error="Killed stuck sandbox but failed to deploy replacement",
             )
 
@@ -219,7 +247,7 @@ def _handle_one_sandbox(
         return WatchdogResult(
             action="recovered",
             sandbox_id=new_id,
-            killed=[sandbox_id],
+            killed=(sandbox_id,),
         )
 
     # UNKNOWN status — can't determine health, leave it alone
@@ -230,24 +258,46 @@ def _handle_one_sandbox(
     return WatchdogResult(action="unknown", sandbox_id=sandbox_id)
 
 
+def _check_all_health(
+    controller: SandboxController,
+    config: WatchdogConfig,
+    sandboxes: list[SandboxInfo],
+) -> dict[str, HealthCheck]:
+    """Check each sandbox's health once, keyed by sandbox ID."""
+    return {
+        sb.sandbox_id: controller.check_health(
+            sb.sandbox_id,
+            stuck_threshold=config.stuck_threshold_s,
+        )
+        for sb in sandboxes
+    }
+
+
 def _handle_multiple_sandboxes(
     controller: SandboxController,
     lifecycle: LifecycleManager,
     config: WatchdogConfig,
     sandboxes: list,
+    health_by_id: dict[str, HealthCheck],
 ) -> WatchdogResult:
-    """Keep the healthiest sandbox, kill the rest."""
+    """Keep the healthiest sandbox, kill the rest.
+
+    Args:
+        controller: SandboxController for kills.
+        lifecycle: LifecycleManager for cleanup and redeploys.
+        config: Watchdog configuration.
+        sandboxes: Running sandboxes (at least two).
+        health_by_id: Health per sandbox ID, from _check_all_health. The
+            keeper's entry is reused, so no sandbox is checked twice.
+    """
     logger.warning("Multiple sandboxes running (%d) — cleaning up", len(sandboxes))
 
-    # Check health of each, pick the best
+    # Pick the best
     best_id = ""
     best_elapsed = float("inf")
 
     for sb in sandboxes:
-        health = controller.check_health(
-            sb.sandbox_id,
-            stuck_threshold=config.stuck_threshold_s,
-        )
+        health = health_by_id[sb.sandbox_id]
         if health.status == HealthStatus.HEALTHY:
             elapsed = health.seconds_since_heartbeat or float("inf")
             if elapsed < best_elapsed:
@@ -260,18 +310,15 @@ def _handle_multiple_sandboxes(
         logger.warning("No healthy sandbox found, keeping %s", best_id)
 
     # Kill all others
-    killed = lifecycle.cleanup_orphans(best_id)
+    killed = tuple(lifecycle.cleanup_orphans(best_id))
     logger.info("Kept %s, killed %d orphan(s): %s", best_id, len(killed), killed)
 
     # Now check if the keeper is healthy or needs replacement
-    keeper_health = controller.check_health(
-        best_id,
-        stuck_threshold=config.stuck_threshold_s,
-    )
+    keeper_health = health_by_id[best_id]
     if keeper_health.status in (HealthStatus.STUCK, HealthStatus.DEAD):
         # The "best" is still sick — kill and redeploy
         controller.kill(best_id)
-        killed.append(best_id)
+        killed += (best_id,)
 
         new_id = lifecycle.create_successor()
         if new_id is None:
@@ -114,6 +114,7 @@ def cmd_run(args: argparse.Namespace) -> None:
             signal.signal(signal.SIGTERM, lambda *_: agent.request_shutdown())
             agent.run()
     finally:
+        notifier.close()
         logger.info("Agent stopped. Final state saved.")
 
 
@@ -226,7 +227,6 @@ def cmd_serve(args: argparse.Namespace) -> None:
     """Start the dashboard API server."""
     import signal as sig
 
-    from social_agent.control import SandboxController
     from social_agent.cost import CostTracker
     from social_agent.discovery import get_active_sandbox_id
     from social_agent.server import DashboardServer
@@ -260,7 +260,7 @@ def cmd_serve(args: argparse.Namespace) -> None:
 
     server = DashboardServer(
         sandbox_id=sandbox_id,
-        controller=SandboxController(),
+        # No controller: the server builds one with its health-check TTL
         cost_tracker=cost_tracker,
         brain_repo_path=brain_path,
         state_path=Path("state.json"),
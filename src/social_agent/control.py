@@ -11,13 +11,19 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from enum import StrEnum
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from e2b_code_interpreter import Sandbox
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
 logger = logging.getLogger("social_agent.control")
 
 # --- Paths inside the sandbox (E2B default root: /home/user) ---
@@ -31,6 +37,9 @@ _HEARTBEAT_PATH = f"{_BRAIN_ROOT}/heartbeat.json"
 _DOS_PATH = f"{_BRAIN_ROOT}/governance/DOS.md"
 _OVERRIDES_PATH = f"{_BRAIN_ROOT}/governance/external_overrides.md"
 
+# Max parallel kill calls in bulk_kill (E2B has no batch kill endpoint)
+_BULK_KILL_WORKERS = 8
+
 
 class HealthStatus(StrEnum):
     """Agent health status determined from heartbeat."""
@@ -41,9 +50,13 @@ class HealthStatus(StrEnum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class HealthCheck:
-    """Result of a health check on a sandbox."""
+    """Result of a health check on a sandbox.
+
+    Frozen, so one instance can be cached, shared between threads, or
+    reused as a test fixture without copying.
+    """
 
     sandbox_id: str
     status: HealthStatus
@@ -53,7 +66,7 @@ class HealthCheck:
     error: str | None = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SandboxInfo:
     """Summary of a running sandbox."""
 
@@ -79,10 +92,34 @@ class SandboxController:
 
     Args:
         api_key: E2B API key. If None, uses E2B_API_KEY env var.
+        health_cache_ttl_s: Reuse a check_health result for this many
+            seconds (0 disables caching). Useful when several callers poll
+            the same sandbox, e.g. dashboard clients.
     """
 
-    def __init__(self, api_key: str | None = None) -> None:
+    def __init__(
+        self,
+        api_key: str | None = None,
+        *,
+        health_cache_ttl_s: float = 0.0,
+    ) -> None:
         self._api_key = api_key
+        self._health_cache_ttl_s = health_cache_ttl_s
+        self._health_cache: dict[tuple[str, float, float], tuple[float, HealthCheck]] = {}
+        self._health_lock = threading.Lock()
+        # Kill pool, created on the first bulk_kill and reused after
+        self._kill_pool: ThreadPoolExecutor | None = None
+        self._kill_pool_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Shut down the bulk_kill worker pool, if one was started.
+
+        Safe to call more than once; a later bulk_kill starts a fresh pool.
+        """
+        with self._kill_pool_lock:
+            pool, self._kill_pool = self._kill_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
 
     def _api_params(self) -> dict[str, Any]:
         """Build common API params dict."""
@@ -116,13 +153,35 @@ class SandboxController:
             List of sandbox IDs that were killed.
         """
         logger.warning("KILL_ALL: Killing all sandboxes")
-        killed = []
-        for info in self.list_sandboxes():
-            if self.kill(info.sandbox_id):
-                killed.append(info.sandbox_id)
+        killed = self.bulk_kill(info.sandbox_id for info in self.list_sandboxes())
         logger.info("KILL_ALL: Killed %d sandboxes", len(killed))
         return killed
 
+    def bulk_kill(self, sandbox_ids: Iterable[str]) -> list[str]:
+        """Kill several sandboxes concurrently.
+
+        E2B exposes no batch kill, so the per-sandbox kill calls are
+        overlapped on a worker pool (created once, reused by later calls)
+        instead of run in turn.
+
+        Args:
+            sandbox_ids: Sandboxes to kill.
+
+        Returns:
+            IDs that were killed, in input order.
+        """
+        ids = list(sandbox_ids)
+        if not ids:
+            return []
+        with self._kill_pool_lock:
+            if self._kill_pool is None:
+                self._kill_pool = ThreadPoolExecutor(
+                    max_workers=_BULK_KILL_WORKERS, thread_name_prefix="kill",
+                )
+            pool = self._kill_pool
+        results = list(pool.map(self.kill, ids))
+        return [sid for sid, ok in zip(ids, results, strict=True) if ok]
+
     # --- Observation ---
 
     def is_alive(self, sandbox_id: str) -> bool:
@@ -418,6 +477,7 @@ class SandboxController:
         *,
         healthy_threshold: float = 60.0,
         stuck_threshold: float = 600.0,
+        use_cache: bool = True,
     ) -> HealthCheck:
         """Check agent health by reading heartbeat.json.
 
@@ -431,10 +491,49 @@ class SandboxController:
             sandbox_id: Target sandbox.
             healthy_threshold: Seconds before considering stuck (default 60).
             stuck_threshold: Seconds before considering dead (default 600).
+            use_cache: False forces a fresh read (which still refreshes
+                the cache), e.g. while polling a new sandbox.
+
+        Results are reused for health_cache_ttl_s seconds per
+        (sandbox_id, thresholds) when caching is enabled; expired
+        entries are dropped on each write.
 
         Returns:
             HealthCheck with status and details.
         """
+        if self._health_cache_ttl_s <= 0:
+            return self._read_health(sandbox_id, healthy_threshold, stuck_threshold)
+
+        key = (sandbox_id, healthy_threshold, stuck_threshold)
+        now = time.monotonic()
+        if use_cache:
+            with self._health_lock:
+                cached = self._health_cache.get(key)
+            if cached is not None and now - cached[0] < self._health_cache_ttl_s:
+                return cached[1]
+
+        health = self._read_health(sandbox_id, healthy_threshold, stuck_threshold)
+        with self._health_lock:
+            # Drop expired entries so sandboxes seen once don't pile up
+            ttl = self._health_cache_ttl_s
+            self._health_cache = {
+                k: v for k, v in self._health_cache.items() if now - v[0] < ttl
+            }
+            self._health_cache[key] = (now, health)
+        return health
+
+    def clear_health_cache(self) -> None:
+        """Drop all cached check_health results."""
+        with self._health_lock:
+            self._health_cache.clear()
+
+    def _read_health(
+        self,
+        sandbox_id: str,
+        healthy_threshold: float,
+        stuck_threshold: float,
+    ) -> HealthCheck:
+        """Read heartbeat.json and classify it (uncached check_health)."""
         try:
             content = self.read_file(sandbox_id, _HEARTBEAT_PATH)
             heartbeat = json.loads(content)
@@ -23,8 +23,8 @@ import queue
 import shlex
 import threading
 import time
-from dataclasses import dataclass, field
-from typing import TYPE_CHECKING
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, TextIO
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -39,6 +39,8 @@ _MAX_QUEUE_SIZE = 100
 _MAX_RETRIES = 3
 # Delay between retries (seconds).
 _RETRY_DELAY = 2.0
+# Flush the tracker file after this many buffered results.
+_TRACKER_FLUSH_EVERY = 10
 
 
 @dataclass(frozen=True)
@@ -102,6 +104,8 @@ class GitSync:
     )
     _total_syncs: int = field(default=0, init=False, repr=False)
     _total_failures: int = field(default=0, init=False, repr=False)
+    _tracker_fp: TextIO | None = field(default=None, init=False, repr=False)
+    _tracker_pending: int = field(default=0, init=False, repr=False)
 
     @property
     def is_running(self) -> bool:
@@ -135,7 +139,8 @@ class GitSync:
         """Stop the sync worker, flushing the queue first.
 
         Sends a sentinel (None) to the queue to signal the worker
-        to drain remaining items and exit.
+        to drain remaining items and exit, then flushes and closes
+        the tracker file.
         """
         if not self._running:
             return
@@ -151,6 +156,9 @@ class GitSync:
                 logger.warning(
                     "Git sync worker did not stop within %.1fs timeout", timeout
                 )
+            else:
+                # Worker is gone — safe to flush and close the tracker
+                self._close_tracker()
             self._thread = None
 
         logger.info(
@@ -228,11 +236,13 @@ class GitSync:
             except queue.Empty:
                 continue
 
-            # Sentinel value signals shutdown
-            if entry is None:
-                continue
-
-            self._process_entry(entry)
+            try:
+                # Sentinel value signals shutdown
+                if entry is not None:
+                    self._process_entry(entry)
+            finally:
+                # Lets callers block on _queue.join() until processed
+                self._queue.task_done()
 
     def _process_entry(self, entry: SyncEntry) -> None:
         """Process a single sync entry with retries."""
@@ -329,19 +339,40 @@ class GitSync:
         return commit_hash
 
     def _log_result(self, result: SyncResult) -> None:
-        """Append sync result to git_tracker.jsonl."""
+        """Append sync result to git_tracker.jsonl.
+
+        The tracker file is opened once and kept open for the worker's
+        lifetime. Writes are buffered and flushed every
+        _TRACKER_FLUSH_EVERY results, and on stop().
+        """
         if self.tracker_path is None:
             return
 
         try:
-            from dataclasses import asdict
-
-            self.tracker_path.parent.mkdir(parents=True, exist_ok=True)
-            with self.tracker_path.open("a") as f:
-                f.write(json.dumps(asdict(result), default=str) + "\n")
+            if self._tracker_fp is None:
+                self.tracker_path.parent.mkdir(parents=True, exist_ok=True)
+                self._tracker_fp = self.tracker_path.open("a", buffering=8192)
+            self._tracker_fp.write(json.dumps(asdict(result), default=str) + "\n")
+            self._tracker_pending += 1
+            if self._tracker_pending >= _TRACKER_FLUSH_EVERY:
+                self._tracker_fp.flush()
+                self._tracker_pending = 0
         except Exception:
             logger.exception("Failed to log git sync result")
 
+    def _close_tracker(self) -> None:
+        """Flush and close the tracker file, if open."""
+        if self._tracker_fp is None:
+            return
+
+        try:
+            self._tracker_fp.close()
+        except Exception:
+            logger.exception("Failed to close git sync tracker")
+        finally:
+            self._tracker_fp = None
+            self._tracker_pending = 0
+
     @staticmethod
     def _now_iso() -> str:
         """Return current UTC time as ISO string."""
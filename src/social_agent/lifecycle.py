@@ -7,6 +7,12 @@ The agent is designed to be immortal — when its sandbox approaches
 timeout, it migrates itself to a fresh one. This module provides
 the tools for that migration.
 
+Performance: every step is bound by E2B round trips, not CPU. Sandbox
+creation takes seconds, health checks are remote file
+reads (the controller's TTL cache, backoff while verifying), and orphan
+kills are independent RPCs (overlapped by SandboxController.bulk_kill).
+Prefer overlapping, caching, or removing calls over tuning Python-level work.
+
 Usage:
     lifecycle = LifecycleManager(controller=ctrl, e2b_api_key="...")
     if lifecycle.should_migrate(sandbox_id, threshold=300):
@@ -19,27 +25,63 @@ Usage:
 from __future__ import annotations
 
 import logging
+import threading
 import time
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
 from e2b_code_interpreter import Sandbox
 
+from social_agent.control import HealthStatus
+
 if TYPE_CHECKING:
-    from social_agent.control import SandboxController
+    from collections.abc import Callable, Mapping
+
+    from social_agent.control import SandboxController, SandboxInfo
 
 logger = logging.getLogger("social_agent.lifecycle")
 
 # Safety limits
 _MAX_CONCURRENT_SANDBOXES = 2
 _MAX_MIGRATIONS_PER_DAY = 10
+_DEFAULT_MAX_CONCURRENT_MIGRATIONS = 1  # In-flight migrate() calls
 _DEFAULT_MIGRATION_THRESHOLD_S = 300  # 5 minutes before expiry
 _DEFAULT_VERIFY_TIMEOUT_S = 120  # 2 minutes to verify successor
-_DEFAULT_VERIFY_POLL_INTERVAL_S = 5  # Poll every 5 seconds
+_VERIFY_POLL_INITIAL_S = 0.5  # First poll delay — doubles after each miss
+_DEFAULT_VERIFY_POLL_INTERVAL_S = 5  # Backoff cap between polls
 _SANDBOX_TIMEOUT_S = 3600  # 1 hour — watchdog re-deploys if agent dies
-
-
-@dataclass(frozen=True)
+_SANDBOX_LIST_CACHE_TTL_S = 0.5  # Reuse a sandbox listing for this long
+_SECONDS_PER_DAY = 86400
+
+# Pre-bound statuses for the health comparisons (verify_successor polls)
+_HEALTHY = HealthStatus.HEALTHY
+_STUCK = HealthStatus.STUCK
+_DEAD = HealthStatus.DEAD
+
+# Deploy commands. Secrets come from env vars (GH_TOKEN, BRAIN_REPO_URL_AUTH)
+# injected per call, so the command strings themselves are constant.
+# One RPC for both setup commands; && stops at the first failure.
+_SETUP_CMD = (
+    "pip install"
+    " 'git+https://${GH_TOKEN}@github.com/netanel-systems/social-agent.git"
+    "#egg=social-agent[agent]'"
+    " && git clone \"${BRAIN_REPO_URL_AUTH}\" /home/user/brain"
+)
+_SETUP_TIMEOUT_S = 180  # pip install (120s) + git clone (60s)
+_AGENT_START_CMD = (
+    "cd /home/user/brain &&"
+    " python -m social_agent run"
+    " > /home/user/brain/agent.log 2>&1"
+)
+# Tuples of (command, timeout_seconds | None, log_label).
+# timeout=None means non-blocking — use start_background_command.
+_DEPLOY_STEPS: tuple[tuple[str, int | None, str], ...] = (
+    (_SETUP_CMD, _SETUP_TIMEOUT_S, "pip install social-agent + git clone brain repo"),
+    (_AGENT_START_CMD, None, "start agent process"),  # Process runs indefinitely
+)
+
+
+@dataclass(frozen=True, slots=True)
 class MigrationResult:
     """Result of a migration attempt."""
 
@@ -63,6 +105,13 @@ class LifecycleManager:
         migration_threshold_s: Seconds before expiry to trigger migration.
         verify_timeout_s: Seconds to wait for successor health.
         max_migrations_per_day: Maximum daily migrations.
+        max_concurrent_migrations: In-flight migrate() calls; extra
+            callers block until a slot frees up. Must be at least 1.
+
+    Raises:
+        ValueError: If max_concurrent_migrations is less than 1.
+        clock: Returns the current Unix time; drives the daily migration
+            counter. Injectable so tests can freeze the date.
     """
 
     controller: SandboxController
@@ -70,10 +119,38 @@ class LifecycleManager:
     migration_threshold_s: int = _DEFAULT_MIGRATION_THRESHOLD_S
     verify_timeout_s: int = _DEFAULT_VERIFY_TIMEOUT_S
     max_migrations_per_day: int = _MAX_MIGRATIONS_PER_DAY
+    max_concurrent_migrations: int = _DEFAULT_MAX_CONCURRENT_MIGRATIONS
+    clock: Callable[[], float] = field(default=time.time, repr=False)
 
     # Internal state
     _migrations_today: int = field(default=0, init=False, repr=False)
-    _last_migration_date: str = field(default="", init=False, repr=False)
+    _last_migration_day: int = field(default=-1, init=False, repr=False)
+    # Guards _migrations_today/_last_migration_day (rollover + increment)
+    _counter_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False,
+    )
+    # Held from the concurrency cap check through the create, so concurrent
+    # migrations can't both pass the check
+    _create_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False,
+    )
+    # Guards _sandbox_list_cache, shared by concurrent migrations
+    _listing_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False,
+    )
+    _sandbox_list_cache: tuple[float, list[SandboxInfo]] | None = field(
+        default=None, init=False, repr=False,
+    )
+    _migration_slots: threading.BoundedSemaphore = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.max_concurrent_migrations < 1:
+            msg = (
+                "max_concurrent_migrations must be at least 1, "
+                f"got {self.max_concurrent_migrations}"
+            )
+            raise ValueError(msg)
+        self._migration_slots = threading.BoundedSemaphore(self.max_concurrent_migrations)
 
     @property
     def migrations_today(self) -> int:
@@ -82,9 +159,13 @@ class LifecycleManager:
 
     @property
     def can_migrate(self) -> bool:
-        """Check if migration is allowed (within daily limit)."""
-        self._reset_daily_counter()
-        return self._migrations_today < self.max_migrations_per_day
+        """Check if migration is allowed (within daily limit).
+
+        Resets the daily counter on the first check of a new UTC day;
+        otherwise this is one integer compare plus the limit check.
+        """
+        with self._counter_lock:
+            return self._count_today() < self.max_migrations_per_day
 
     def should_migrate(self, sandbox_id: str, *, threshold: int | None = None) -> bool:
         """Check if sandbox should migrate based on health and time.
@@ -106,8 +187,7 @@ class LifecycleManager:
             return False
 
         health = self.controller.check_health(sandbox_id)
-        from social_agent.control import HealthStatus
-        if health.status in (HealthStatus.STUCK, HealthStatus.DEAD):
+        if health.status in (_STUCK, _DEAD):
             logger.info("Sandbox %s is %s — migration recommended",
                        sandbox_id, health.status.value)
             return True
@@ -120,7 +200,7 @@ class LifecycleManager:
         Returns:
             Number of active sandboxes.
         """
-        sandboxes = self.controller.list_sandboxes()
+        sandboxes = self._list_sandboxes()
         return len(sandboxes)
 
     def create_successor(self) -> str | None:
@@ -131,40 +211,39 @@ class LifecycleManager:
         Returns:
             New sandbox ID, or None if creation failed or limit exceeded.
         """
-        active = self.check_concurrent_sandboxes()
-        if active >= _MAX_CONCURRENT_SANDBOXES:
-            logger.error(
-                "Cannot create successor: %d sandboxes active (max %d)",
-                active, _MAX_CONCURRENT_SANDBOXES,
-            )
-            return None
+        with self._create_lock:
+            active = self.check_concurrent_sandboxes()
+            if active >= _MAX_CONCURRENT_SANDBOXES:
+                logger.error(
+                    "Cannot create successor: %d sandboxes active (max %d)",
+                    active, _MAX_CONCURRENT_SANDBOXES,
+                )
+                return None
 
-        try:
-            sandbox = Sandbox.create(
-                api_key=self.e2b_api_key,
-                timeout=_SANDBOX_TIMEOUT_S,
-            )
-            new_id = sandbox.sandbox_id
-            logger.info(
-                "Created successor sandbox: %s (timeout=%ds)",
-                new_id, _SANDBOX_TIMEOUT_S,
-            )
-            return new_id
-        except Exception:
-            logger.exception("Failed to create successor sandbox")
-            return None
+            try:
+                new_id = self._create_sandbox()
+            except Exception:
+                logger.exception("Failed to create successor sandbox")
+                return None
+
+        logger.info(
+            "Created successor sandbox: %s (timeout=%ds)",
+            new_id, _SANDBOX_TIMEOUT_S,
+        )
+        return new_id
 
     def deploy_self(
         self,
         sandbox_id: str,
         repo_url: str,
         github_token: str,
-        envs: dict[str, str] | None = None,
+        envs: Mapping[str, str] | None = None,
     ) -> bool:
         """Deploy the agent to a new sandbox.
 
-        Installs social-agent from the private GitHub repo, clones the brain
-        repo, and starts the agent process in the background.
+        Installs social-agent from the private GitHub repo and clones the brain
+        repo in a single command, then starts the agent process in the
+        background.
 
         The github_token is injected as GH_TOKEN and BRAIN_REPO_URL_AUTH env
         vars — never embedded as a literal in command strings — to keep tokens
@@ -179,46 +258,24 @@ class LifecycleManager:
         Returns:
             True if all deployment steps succeeded.
         """
-        # Merge provided envs; inject token as env vars (not in command strings)
-        deploy_envs: dict[str, str] = dict(envs or {})
-        deploy_envs["GH_TOKEN"] = github_token
-        # Inject the OUTER sandbox ID so the agent can track it for health checks.
-        # The agent creates an inner execution sandbox (SandboxClient) but the
-        # heartbeat is written in the OUTER sandbox.  Without this, the dashboard
-        # tracks the inner sandbox ID and can never read the heartbeat.
-        deploy_envs["AGENT_SANDBOX_ID"] = sandbox_id
         if repo_url.startswith("https://"):
-            deploy_envs["BRAIN_REPO_URL_AUTH"] = repo_url.replace(
-                "https://", f"https://{github_token}@", 1
-            )
+            auth_repo_url = repo_url.replace("https://", f"https://{github_token}@", 1)
         else:
-            deploy_envs["BRAIN_REPO_URL_AUTH"] = repo_url
-
-        # Tuples of (command, timeout_seconds | None, log_label).
-        # timeout=None means non-blocking — use start_background_command.
-        steps: list[tuple[str, int | None, str]] = [
-            (
-                "pip install"
-                " 'git+https://${GH_TOKEN}@github.com/netanel-systems/social-agent.git"
-                "#egg=social-agent[agent]'",
-                120,
-                "pip install social-agent",
-            ),
-            (
-                "git clone \"${BRAIN_REPO_URL_AUTH}\" /home/user/brain",
-                60,
-                "git clone brain repo",
-            ),
-            (
-                "cd /home/user/brain &&"
-                " python -m social_agent run"
-                " > /home/user/brain/agent.log 2>&1",
-                None,  # Non-blocking — process runs indefinitely
-                "start agent process",
-            ),
-        ]
-
-        for cmd, timeout, label in steps:
+            auth_repo_url = repo_url
+        # Built once and shared by every deploy step; callees must not mutate it.
+        # Token goes in env vars (not in command strings) and overrides `envs`.
+        deploy_envs: dict[str, str] = {
+            **(envs or {}),
+            "GH_TOKEN": github_token,
+            # The OUTER sandbox ID, so the agent can track it for health checks.
+            # The agent creates an inner execution sandbox (SandboxClient) but
+            # the heartbeat is written in the OUTER sandbox.  Without this, the
+            # dashboard tracks the inner sandbox ID and can never read it.
+            "AGENT_SANDBOX_ID": sandbox_id,
+            "BRAIN_REPO_URL_AUTH": auth_repo_url,
+        }
+
+        for cmd, timeout, label in _DEPLOY_STEPS:
             try:
                 if timeout is None:
                     self.controller.start_background_command(
@@ -249,7 +306,9 @@ class LifecycleManager:
     ) -> bool:
         """Verify that a successor sandbox is healthy.
 
-        Polls the heartbeat until HEALTHY or timeout.
+        Polls the heartbeat until HEALTHY or timeout. The poll delay starts
+        at _VERIFY_POLL_INITIAL_S and doubles up to
+        _DEFAULT_VERIFY_POLL_INTERVAL_S, and never sleeps past the deadline.
 
         Args:
             sandbox_id: Successor sandbox ID.
@@ -258,17 +317,21 @@ class LifecycleManager:
         Returns:
             True if successor is healthy within timeout.
         """
-        from social_agent.control import HealthStatus
-
         effective_timeout = timeout or self.verify_timeout_s
-        start = time.monotonic()
+        deadline = time.monotonic() + effective_timeout
+        interval = _VERIFY_POLL_INITIAL_S
 
-        while (time.monotonic() - start) < effective_timeout:
-            health = self.controller.check_health(sandbox_id)
-            if health.status == HealthStatus.HEALTHY:
+        while True:
+            # Each poll must see a fresh heartbeat — bypass the cache
+            health = self.controller.check_health(sandbox_id, use_cache=False)
+            if health.status == _HEALTHY:
                 logger.info("Successor %s verified healthy", sandbox_id)
                 return True
-            time.sleep(_DEFAULT_VERIFY_POLL_INTERVAL_S)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, _DEFAULT_VERIFY_POLL_INTERVAL_S)
 
         logger.warning(
             "Successor %s not healthy after %ds", sandbox_id, effective_timeout
@@ -278,7 +341,9 @@ class LifecycleManager:
     def graceful_shutdown(self, sandbox_id: str) -> bool:
         """Gracefully shut down the old sandbox.
 
-        Logs the migration event and kills the sandbox.
+        Logs the migration event and kills the sandbox. The log is best
+        effort — any failure writing it is logged and the kill still runs,
+        so the old agent doesn't keep running beside its successor.
 
         Args:
             sandbox_id: Old sandbox to shut down.
@@ -286,25 +351,10 @@ class LifecycleManager:
         Returns:
             True if shutdown succeeded.
         """
-        try:
-            self.controller.inject_override(
-                sandbox_id,
-                f"Migration: shutting down in favor of successor "
-                f"(migration #{self._migrations_today + 1})",
-            )
-        except Exception:
-            logger.warning("Could not log migration to old sandbox")
-
-        killed = self.controller.kill(sandbox_id)
+        killed = self._shutdown(sandbox_id, self._migrations_today + 1)
         if killed:
-            self._migrations_today += 1
-            logger.info(
-                "Graceful shutdown of %s complete (migration #%d today)",
-                sandbox_id, self._migrations_today,
-            )
-        else:
-            logger.error("Failed to kill old sandbox %s", sandbox_id)
-
+            with self._counter_lock:
+                self._migrations_today = self._count_today() + 1
         return killed
 
     def migrate(
@@ -312,12 +362,13 @@ class LifecycleManager:
         current_sandbox_id: str,
         repo_url: str,
         github_token: str,
-        envs: dict[str, str] | None = None,
+        envs: Mapping[str, str] | None = None,
     ) -> MigrationResult:
         """Execute a full migration: create → deploy → verify → shutdown.
 
         This is the high-level migration entry point. It enforces all
-        safety limits and handles failures at each stage.
+        safety limits and handles failures at each stage. At most
+        max_concurrent_migrations run at once; extra callers wait.
 
         Args:
             current_sandbox_id: Currently running sandbox.
@@ -327,9 +378,54 @@ class LifecycleManager:
         Returns:
             MigrationResult with success status and details.
         """
-        start = time.monotonic()
+        with self._migration_slots:
+            return self._migrate(current_sandbox_id, repo_url, github_token, envs)
 
-        if not self.can_migrate:
+    def cleanup_orphans(self, keep_sandbox_id: str) -> list[str]:
+        """Kill all sandboxes except the one to keep.
+
+        Used to clean up orphaned sandboxes from failed migrations.
+        Kills go through SandboxController.bulk_kill, which overlaps the
+        kill RPCs.
+
+        Args:
+            keep_sandbox_id: The sandbox to preserve.
+
+        Returns:
+            List of killed sandbox IDs, in listing order.
+        """
+        targets = [
+            sb.sandbox_id for sb in self._list_sandboxes()
+            if sb.sandbox_id != keep_sandbox_id
+        ]
+        if not targets:
+            return []
+
+        try:
+            killed = self.controller.bulk_kill(targets)
+        finally:
+            self._invalidate_listing()
+        for sandbox_id in killed:
+            logger.info("Cleaned up orphan sandbox: %s", sandbox_id)
+        return killed
+
+    # --- Internal ---
+
+    def _migrate(
+        self,
+        current_sandbox_id: str,
+        repo_url: str,
+        github_token: str,
+        envs: Mapping[str, str] | None,
+    ) -> MigrationResult:
+        """Run one migration; the caller holds a migration slot.
+
+        The migration counts against the daily limit from the start, so
+        concurrent migrations can't all pass the check; a failed one
+        gives its count back.
+        """
+        reserved = self._reserve_migration()
+        if reserved is None:
             return MigrationResult(
                 success=False,
                 old_sandbox_id=current_sandbox_id,
@@ -338,6 +434,29 @@ class LifecycleManager:
                 error=f"Daily migration limit reached ({self.max_migrations_per_day})",
             )
 
+        day, number = reserved
+        succeeded = False
+        try:
+            result = self._run_migration(
+                current_sandbox_id, repo_url, github_token, envs, number,
+            )
+            succeeded = result.success
+            return result
+        finally:
+            if not succeeded:
+                self._release_migration(day)
+
+    def _run_migration(
+        self,
+        current_sandbox_id: str,
+        repo_url: str,
+        github_token: str,
+        envs: Mapping[str, str] | None,
+        number: int,
+    ) -> MigrationResult:
+        """Create, deploy, verify, then shut down; number is today's count."""
+        start = time.monotonic()
+
         # Step 1: Create successor
         new_id = self.create_successor()
         if new_id is None:
@@ -353,7 +472,7 @@ class LifecycleManager:
         deployed = self.deploy_self(new_id, repo_url, github_token, envs=envs)
         if not deployed:
             # Clean up failed successor
-            self.controller.kill(new_id)
+            self._kill(new_id)
             return MigrationResult(
                 success=False,
                 old_sandbox_id=current_sandbox_id,
@@ -366,7 +485,7 @@ class LifecycleManager:
         healthy = self.verify_successor(new_id)
         if not healthy:
             # Clean up unhealthy successor
-            self.controller.kill(new_id)
+            self._kill(new_id)
             return MigrationResult(
                 success=False,
                 old_sandbox_id=current_sandbox_id,
@@ -376,7 +495,7 @@ class LifecycleManager:
             )
 
         # Step 4: Graceful shutdown of old
-        shutdown_ok = self.graceful_shutdown(current_sandbox_id)
+        shutdown_ok = self._shutdown(current_sandbox_id, number)
         if not shutdown_ok:
             logger.warning(
                 "Migration succeeded but old sandbox %s may still be running",
@@ -396,34 +515,112 @@ class LifecycleManager:
             duration_s=duration,
         )
 
-    def cleanup_orphans(self, keep_sandbox_id: str) -> list[str]:
-        """Kill all sandboxes except the one to keep.
+    def _reserve_migration(self) -> tuple[int, int] | None:
+        """Count a migration against today's limit before it runs.
 
-        Used to clean up orphaned sandboxes from failed migrations.
+        Returns:
+            (UTC day, migration number today), or None at the limit.
+        """
+        with self._counter_lock:
+            if self._count_today() >= self.max_migrations_per_day:
+                return None
+            self._migrations_today += 1
+            return self._last_migration_day, self._migrations_today
+
+    def _release_migration(self, day: int) -> None:
+        """Give back a reservation for a migration that did not complete.
+
+        A reservation from a day that has since rolled over is dropped.
+        """
+        with self._counter_lock:
+            if self._count_today() and self._last_migration_day == day:
+                self._migrations_today -= 1
+
+    def _shutdown(self, sandbox_id: str, number: int) -> bool:
+        """Log the migration to the old sandbox, then kill it.
 
         Args:
-            keep_sandbox_id: The sandbox to preserve.
+            sandbox_id: Old sandbox to shut down.
+            number: Today's migration number, for the log.
 
         Returns:
-            List of killed sandbox IDs.
+            True if the kill succeeded.
         """
-        sandboxes = self.controller.list_sandboxes()
-        killed = []
-        for sb in sandboxes:
-            if sb.sandbox_id != keep_sandbox_id:
-                success = self.controller.kill(sb.sandbox_id)
-                if success:
-                    killed.append(sb.sandbox_id)
-                    logger.info("Cleaned up orphan sandbox: %s", sb.sandbox_id)
-        return killed
+        # The log lives inside the sandbox being killed — write it first.
+        try:
+            self.controller.inject_override(
+                sandbox_id,
+                f"Migration: shutting down in favor of successor (migration #{number})",
+            )
+        except Exception:
+            logger.warning(
+                "Could not log migration to old sandbox %s", sandbox_id, exc_info=True,
+            )
 
-    # --- Internal ---
+        killed = self._kill(sandbox_id)
+        if killed:
+            logger.info(
+                "Graceful shutdown of %s complete (migration #%d today)",
+                sandbox_id, number,
+            )
+        else:
+            logger.error("Failed to kill old sandbox %s", sandbox_id)
+        return killed
 
-    def _reset_daily_counter(self) -> None:
-        """Reset migration counter if it's a new day."""
-        from datetime import UTC, datetime
+    def _count_today(self) -> int:
+        """Return today's migration count, resetting it on a new UTC day.
 
-        today = datetime.now(tz=UTC).strftime("%Y-%m-%d")
-        if today != self._last_migration_date:
+        Caller must hold _counter_lock.
+        """
+        today = _utc_day(self.clock())
+        if today != self._last_migration_day:
             self._migrations_today = 0
-            self._last_migration_date = today
+            self._last_migration_day = today
+        return self._migrations_today
+
+    def _create_sandbox(self) -> str:
+        """Create a sandbox and invalidate the cached listing."""
+        sandbox = Sandbox.create(
+            api_key=self.e2b_api_key,
+            timeout=_SANDBOX_TIMEOUT_S,
+        )
+        self._invalidate_listing()
+        return sandbox.sandbox_id
+
+    def _list_sandboxes(self) -> list[SandboxInfo]:
+        """List sandboxes, reusing a listing younger than the TTL.
+
+        Creating or killing a sandbox through this manager invalidates
+        the cached listing.
+        """
+        now = time.monotonic()
+        with self._listing_lock:
+            cached = self._sandbox_list_cache
+        if cached is not None and now - cached[0] < _SANDBOX_LIST_CACHE_TTL_S:
+            return cached[1]
+
+        sandboxes = self.controller.list_sandboxes()
+        with self._listing_lock:
+            self._sandbox_list_cache = (now, sandboxes)
+        return sandboxes
+
+    def _invalidate_listing(self) -> None:
+        """Drop the cached listing after creating or killing a sandbox."""
+        with self._listing_lock:
+            self._sandbox_list_cache = None
+
+    def _kill(self, sandbox_id: str) -> bool:
+        """Kill a sandbox and invalidate the cached listing."""
+        try:
+            return self.controller.kill(sandbox_id)
+        finally:
+            self._invalidate_listing()
+
+
+def _utc_day(timestamp: float) -> int:
+    """Return the UTC day of a Unix timestamp as whole days since the epoch.
+
+    Runs on every can_migrate check, so rollover detection is an integer
+    compare rather than formatting and comparing a date string.
+    """
+    return int(timestamp) // _SECONDS_PER_DAY
@@ -20,13 +20,26 @@ logger = logging.getLogger(__name__)
 
 _BASE_URL = "https://www.moltbook.com/api/v1"
 
+# Request-independent tail of the generated HTTP code, joined once at import.
+_HTTP_CODE_TAIL = "\n".join([
+    "        timeout=30,",
+    "    )",
+    "    try:",
+    "        data = resp.json()",
+    "    except Exception:",
+    "        data = resp.text",
+    '    print(json.dumps({"status": resp.status_code, "body": data}))',
+    "except Exception as e:",
+    '    print(json.dumps({"error": str(e)}))',
+])
+
 
 # --- Response types ---
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MoltbookPost:
-    """A single post from a submolt feed."""
+    """A single post from a submolt feed (slotted: feeds build many)."""
 
     id: str
     title: str
@@ -120,17 +133,7 @@ def _build_http_code(
     if params is not None:
         lines.append(f"        params={params!r},")
 
-    lines.extend([
-        "        timeout=30,",
-        "    )",
-        "    try:",
-        "        data = resp.json()",
-        "    except Exception:",
-        "        data = resp.text",
-        '    print(json.dumps({"status": resp.status_code, "body": data}))',
-        "except Exception as e:",
-        '    print(json.dumps({"error": str(e)}))',
-    ])
+    lines.append(_HTTP_CODE_TAIL)
 
     return "\n".join(lines)
 
@@ -158,7 +158,8 @@ class SandboxClient:
         """Execute Python code in the sandbox.
 
         Auto-recovers if the sandbox has expired (timeout). Creates a new
-        sandbox and retries once before reporting failure.
+        sandbox and retries once before reporting failure. Blank code is a
+        no-op and never starts or calls the sandbox.
 
         Args:
             code: Python code to execute.
@@ -166,6 +167,9 @@ class SandboxClient:
         Returns:
             ExecutionResult with stdout, stderr, text output, and success flag.
         """
+        if not code.strip():
+            return ExecutionResult()
+
         sandbox = self._ensure_sandbox()
         for attempt in range(self._MAX_RECOVERY_RETRIES + 1):
             try:
@@ -48,6 +48,8 @@ _DISCOVERY_INTERVAL_S = 120
 _DISCOVERY_PLACEHOLDER = "sbx-not-started"
 # 10,000 x 120s = ~13 days. Prevents infinite loop if stop event fails.
 _MAX_DISCOVERY_ITERATIONS = 10_000
+# /api/status and /api/heartbeat share one heartbeat read per window.
+_HEALTH_CACHE_TTL_S = 1.0
 
 
 class _RequestHandler(BaseHTTPRequestHandler):
@@ -65,6 +67,8 @@ class _RequestHandler(BaseHTTPRequestHandler):
     state_path: Path
     activity_log_path: Path
     heartbeat_path: Path
+    # True while answering HEAD: headers are sent as for GET, body is not.
+    _head_only: bool = False
 
     def log_message(self, format: str, *args: object) -> None:  # noqa: A002
         """Route http.server logs through our logger."""
@@ -128,6 +132,15 @@ class _RequestHandler(BaseHTTPRequestHandler):
 
         handler()
 
+    def do_HEAD(self) -> None:  # noqa: N802
+        """Handle HEAD requests — GET's status and headers, without the body."""
+        self._head_only = True
+        try:
+            self.do_GET()
+        finally:
+            # Keep a later GET on a kept-alive connection sending its body
+            self._head_only = False
+
     def do_OPTIONS(self) -> None:  # noqa: N802
         """Handle CORS preflight requests."""
         self.send_response(204)
@@ -330,7 +343,7 @@ class _RequestHandler(BaseHTTPRequestHandler):
         # Cache static assets for 5 minutes (browser refresh friendly)
         self.send_header("Cache-Control", "public, max-age=300")
         self.end_headers()
-        self.wfile.write(body)
+        self._write_body(body)
 
     # --- Helpers ---
 
@@ -393,7 +406,12 @@ class _RequestHandler(BaseHTTPRequestHandler):
         self.send_header("Content-Type", "application/json")
         self.send_header("Content-Length", str(len(body)))
         self.end_headers()
-        self.wfile.write(body)
+        self._write_body(body)
+
+    def _write_body(self, body: bytes) -> None:
+        """Write the response body, unless answering a HEAD request."""
+        if not self._head_only:
+            self.wfile.write(body)
 
     def _send_cors_headers(self) -> None:
         """Add CORS headers to allow browser access."""
@@ -442,7 +460,11 @@ class DashboardServer:
         from pathlib import Path as _Path
 
         self._sandbox_id = sandbox_id
-        self._controller = controller or SandboxController()
+        # A controller built here is ours to close on stop()
+        self._owns_controller = controller is None
+        self._controller = controller or SandboxController(
+            health_cache_ttl_s=_HEALTH_CACHE_TTL_S,
+        )
         self._cost_tracker = cost_tracker
         self._state_path = state_path or _Path("state.json")
         self._activity_log_path = activity_log_path or _Path("logs/activity.jsonl")
@@ -533,6 +555,8 @@ class DashboardServer:
         self._server.server_close()
         self._server = None
         self._thread = None
+        if self._owns_controller:
+            self._controller.close()
         logger.info("Dashboard server stopped")
 
     def _start_discovery_worker(self) -> None:
@@ -8,12 +8,15 @@ Graceful degradation: never crashes the agent if Telegram fails.
 from __future__ import annotations
 
 import logging
+import time
 from enum import StrEnum
 from typing import TYPE_CHECKING
 
 import httpx
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from pydantic import SecretStr
 
 logger = logging.getLogger(__name__)
@@ -35,8 +38,22 @@ _LEVEL_PREFIX: dict[Level, str] = {
     Level.ERROR: "🚨",
 }
 
+# Notifications go out one at a time to a single host, so a small
+# keep-alive pool is enough to skip the TCP+TLS handshake on each send.
+_POOL_LIMITS = httpx.Limits(max_keepalive_connections=2, max_connections=4)
+# Shared per-send timeout: 10s overall, but give up on connecting after 5s
+_SEND_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+# Circuit breaker: after this many consecutive send failures (connection
+# errors, 429 or 5xx), skip sends for the cooldown, then allow one trial
+# send. A 429 carrying retry_after opens it for that long straight away.
+_BREAKER_THRESHOLD = 5
+_BREAKER_COOLDOWN_S = 30.0
+
 # MarkdownV2 special characters that need escaping
 _ESCAPE_CHARS = r"_*[]()~`>#+-=|{}.!\\"
+# Built once at import: each special char maps to its backslash-escaped form.
+_ESCAPE_TABLE = str.maketrans({char: f"\\{char}" for char in _ESCAPE_CHARS})
 
 
 def _escape_markdown(text: str) -> str:
@@ -44,14 +61,17 @@ def _escape_markdown(text: str) -> str:
 
     Per Telegram docs, these characters must be escaped with backslash:
     _ * [ ] ( ) ~ ` > # + - = | { } . ! \\
+
+    One str.translate pass in C, instead of a per-character Python loop.
     """
-    result = []
-    for char in text:
-        if char in _ESCAPE_CHARS:
-            result.append(f"\\{char}")
-        else:
-            result.append(char)
-    return "".join(result)
+    return text.translate(_ESCAPE_TABLE)
+
+
+# Escaped "<emoji> *LEVEL*" header line per level, built once at import
+_LEVEL_HEADER: dict[Level, str] = {
+    level: f"{prefix} *{_escape_markdown(level.value.upper())}*\n"
+    for level, prefix in _LEVEL_PREFIX.items()
+}
 
 
 class TelegramNotifier:
@@ -67,20 +87,67 @@ class TelegramNotifier:
         notifier.notify("Post created: AI Agents 101", Level.SUCCESS)
 
     If bot_token or chat_id is None, all calls are no-ops (graceful degradation).
+
+    An enabled notifier keeps one pooled ``httpx.Client`` for its lifetime;
+    call ``close()`` (or use it as a context manager) to release it.
+
+    Args:
+        bot_token: Telegram bot token, as a plain string or a SecretStr.
+        chat_id: Target chat ID.
+        post: Callable used to send the request, with ``httpx.post``'s
+            signature. Defaults to the pooled client's ``post``; tests
+            inject a stub.
+        clock: Monotonic time source for the circuit breaker. Injectable
+            so tests can step past the cooldown.
     """
 
     def __init__(
         self,
-        bot_token: SecretStr | None = None,
+        bot_token: str | SecretStr | None = None,
         chat_id: str | None = None,
+        *,
+        post: Callable[..., httpx.Response] | None = None,
+        clock: Callable[[], float] = time.monotonic,
     ) -> None:
-        self._bot_token = bot_token
         self._chat_id = chat_id
         self._enabled = bot_token is not None and chat_id is not None
+        # Built once: the token is unwrapped here, not on every send.
+        # Holds the raw token — never log it.
+        self._url = ""
+        if bot_token is not None:
+            token = bot_token if isinstance(bot_token, str) else bot_token.get_secret_value()
+            self._url = f"https://api.telegram.org/bot{token}/sendMessage"
+        self._client: httpx.Client | None = None
+        if post is None and self._enabled:
+            self._client = httpx.Client(limits=_POOL_LIMITS)
+            post = self._client.post
+        self._post = post or httpx.post
+        self._clock = clock
+        self._fail_count = 0
+        # Breaker open (sends skipped) until this clock() reading
+        self._open_until: float | None = None
 
         if not self._enabled:
             logger.warning("Telegram notifier disabled: missing bot_token or chat_id")
 
+    def close(self) -> None:
+        """Close the pooled HTTP client, if one was opened.
+
+        Safe to call more than once. Later notify() calls fail and return
+        False, as for any other send error.
+        """
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def __enter__(self) -> TelegramNotifier:
+        """Context manager: return the notifier."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Context manager: close the pooled client."""
+        self.close()
+
     @property
     def enabled(self) -> bool:
         """Whether the notifier is configured and active."""
@@ -95,18 +162,17 @@ class TelegramNotifier:
 
         Returns:
             True if sent successfully, False otherwise.
-            Always returns False if notifier is disabled.
+            Always returns False if notifier is disabled or its circuit
+            breaker is open.
         """
         if not self._enabled:
             logger.debug("Telegram disabled, skipping: %s", message)
             return False
+        if self._open_until is not None and self._clock() < self._open_until:
+            logger.debug("Telegram circuit open, skipping: %s", message)
+            return False
 
-        prefix = _LEVEL_PREFIX.get(level, "")
-        level_text = _escape_markdown(level.value.upper())
-        msg_text = _escape_markdown(message)
-        formatted = f"{prefix} *{level_text}*\n{msg_text}"
-
-        return self._send(formatted)
+        return self._send(_LEVEL_HEADER[level] + _escape_markdown(message))
 
     def _send(self, text: str) -> bool:
         """Send a message via Telegram Bot API.
@@ -114,33 +180,67 @@ class TelegramNotifier:
         Uses httpx directly (not E2B) — this is monitoring infrastructure,
         not an agent action. Failures are logged but never crash the agent.
         """
-        if self._bot_token is None:
+        if not self._url:
             logger.warning("_send called but bot_token is None")
             return False
-        token = self._bot_token.get_secret_value()
-        url = f"https://api.telegram.org/bot{token}/sendMessage"
 
         try:
-            response = httpx.post(
-                url,
+            response = self._post(
+                self._url,
                 json={
                     "chat_id": self._chat_id,
                     "text": text,
                     "parse_mode": "MarkdownV2",
                 },
-                timeout=10,
+                timeout=_SEND_TIMEOUT,
             )
-            if response.status_code == 200:
-                logger.debug("Telegram message sent")
-                return True
+        except Exception:
+            logger.exception("Failed to send Telegram message")
+            self._record_failure()
+            return False
+
+        if response.status_code == 200:
+            logger.debug("Telegram message sent")
+            self._fail_count = 0
+            self._open_until = None
+            return True
+
+        logger.warning(
+            "Telegram API returned %d: %s",
+            response.status_code,
+            response.text[:200],
+        )
+        if response.status_code == 429:
+            self._record_failure(retry_after=_retry_after(response))
+        elif response.status_code >= 500:
+            self._record_failure()
+        else:
+            # Any other 4xx means Telegram is reachable; only this message was bad.
+            self._fail_count = 0
+        return False
 
+    def _record_failure(self, *, retry_after: float | None = None) -> None:
+        """Count a failed send and open the breaker when needed.
+
+        Opens for retry_after seconds when Telegram gave one, otherwise
+        for the cooldown once the threshold is reached. While the count
+        stays at or above the threshold, a failed trial send after the
+        cooldown re-opens the breaker immediately.
+        """
+        self._fail_count += 1
+        if retry_after is None and self._fail_count < _BREAKER_THRESHOLD:
+            return
+        if self._open_until is None:
             logger.warning(
-                "Telegram API returned %d: %s",
-                response.status_code,
-                response.text[:200],
+                "Telegram circuit opened after %d failures", self._fail_count
             )
-            return False
+        cooldown = _BREAKER_COOLDOWN_S if retry_after is None else retry_after
+        self._open_until = self._clock() + cooldown
 
-        except Exception:
-            logger.exception("Failed to send Telegram message")
-            return False
+
+def _retry_after(response: httpx.Response) -> float | None:
+    """Seconds Telegram asked us to wait, from a 429's parameters.retry_after."""
+    try:
+        return float(response.json()["parameters"]["retry_after"])
+    except (ValueError, KeyError, TypeError):
+        return None
@@ -0,0 +1,80 @@
+"""Test doubles shared by several test modules.
+
+StubController stands in for SandboxController in the server and
+watchdog tests. Plain module, imported explicitly; conftest.py keeps
+only fixtures.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from social_agent.control import HealthCheck, HealthStatus, SandboxInfo
+
+_STUB_HEALTH = HealthCheck(
+    sandbox_id="sb-1",
+    status=HealthStatus.HEALTHY,
+    seconds_since_heartbeat=10.0,
+)
+
+
+@dataclass
+class StubController:
+    """Hand-rolled SandboxController double.
+
+    Methods keep SandboxController's signatures, return the preset
+    fields, and append ``(method, *args)`` to ``calls``.
+    test_control.test_stub_controller_matches_real_api keeps the
+    signatures in line with the real class.
+    """
+
+    health: HealthCheck = _STUB_HEALTH
+    sandboxes: list[SandboxInfo] = field(default_factory=list)
+    state: dict[str, Any] = field(default_factory=dict)
+    activity: list[dict[str, Any]] = field(default_factory=list)
+    calls: list[tuple[Any, ...]] = field(default_factory=list)
+
+    def check_health(
+        self,
+        sandbox_id: str,
+        *,
+        healthy_threshold: float = 60.0,
+        stuck_threshold: float = 600.0,
+        use_cache: bool = True,
+    ) -> HealthCheck:
+        self.calls.append(("check_health", sandbox_id))
+        return self.health
+
+    def list_sandboxes(self) -> list[SandboxInfo]:
+        self.calls.append(("list_sandboxes",))
+        return self.sandboxes
+
+    def read_state(self, sandbox_id: str) -> dict[str, Any]:
+        self.calls.append(("read_state", sandbox_id))
+        return self.state
+
+    def read_activity(
+        self, sandbox_id: str, last_n: int = 10, *, max_records: int = 1000
+    ) -> list[dict[str, Any]]:
+        self.calls.append(("read_activity", sandbox_id, last_n))
+        return self.activity
+
+    def kill(self, sandbox_id: str) -> bool:
+        self.calls.append(("kill", sandbox_id))
+        return True
+
+    def inject_rule(self, sandbox_id: str, rule: str) -> None:
+        self.calls.append(("inject_rule", sandbox_id, rule))
+
+    def close(self) -> None:
+        self.calls.append(("close",))
+
+    def calls_to(self, method: str) -> list[tuple[Any, ...]]:
+        """Arguments of each recorded call to method, in call order."""
+        return [call[1:] for call in self.calls if call[0] == method]
+
+    @property
+    def kill_calls(self) -> list[str]:
+        """Sandbox IDs passed to kill(), in call order."""
+        return [call[1] for call in self.calls if call[0] == "kill"]
@@ -715,6 +715,7 @@ def test_run_stops_at_max_cycles(
         notifier=mock_notifier,
         state_path=tmp_dir / "state.json",
         activity_log_path=tmp_dir / "logs" / "activity.jsonl",
+        heartbeat_path=tmp_dir / "heartbeat.json",
     )
     agent.run()
 
@@ -742,6 +743,7 @@ def test_run_stops_on_circuit_breaker(
         notifier=mock_notifier,
         state_path=tmp_dir / "state.json",
         activity_log_path=tmp_dir / "logs" / "activity.jsonl",
+        heartbeat_path=tmp_dir / "heartbeat.json",
     )
     agent.run()
 
@@ -779,6 +781,7 @@ def test_run_stops_on_shutdown_request(
         notifier=mock_notifier,
         state_path=tmp_dir / "state.json",
         activity_log_path=tmp_dir / "logs" / "activity.jsonl",
+        heartbeat_path=tmp_dir / "heartbeat.json",
     )
     agent.run()
 
@@ -1586,6 +1589,7 @@ def test_research_miss_count_resets_on_non_research_success(
         notifier=mock_notifier,
         state_path=tmp_dir / "state.json",
         activity_log_path=tmp_dir / "logs" / "activity.jsonl",
+        heartbeat_path=tmp_dir / "heartbeat.json",
     )
     agent._research_miss_count = 2
 
@@ -6,7 +6,10 @@ Follows boundary pattern: defaults, valid inputs, errors, edge cases.
 
 from __future__ import annotations
 
+import inspect
 import json
+import threading
+import time
 from datetime import UTC, datetime, timedelta
 from unittest.mock import MagicMock, patch
 
@@ -19,6 +22,7 @@ from social_agent.control import (
     SandboxController,
     SandboxInfo,
 )
+from tests.stubs import StubController
 
 # --- Fixtures ---
 
@@ -139,12 +143,60 @@ class TestKillAll:
 
         mock_paginator.next_items = _next_partial
         mock_list.return_value = mock_paginator
-        mock_kill.side_effect = [True, False]
+        # Kills run concurrently — decide by ID, not by call order
+        mock_kill.side_effect = lambda sandbox_id, **_: sandbox_id == "sbx_1"
 
         killed = controller.kill_all()
         assert killed == ["sbx_1"]
 
 
+class TestBulkKill:
+    """Tests for bulk_kill() — concurrent kill of several sandboxes."""
+
+    @patch("social_agent.control.Sandbox.kill")
+    def test_returns_killed_in_input_order(
+        self, mock_kill: MagicMock, controller: SandboxController
+    ) -> None:
+        """Only successful kills are returned, in the order given."""
+        mock_kill.side_effect = lambda sandbox_id, **_: sandbox_id != "sbx_2"
+        assert controller.bulk_kill(["sbx_1", "sbx_2", "sbx_3"]) == ["sbx_1", "sbx_3"]
+        assert mock_kill.call_count == 3
+
+    @patch("social_agent.control.Sandbox.kill")
+    def test_empty(self, mock_kill: MagicMock, controller: SandboxController) -> None:
+        """No IDs means no kill calls."""
+        assert controller.bulk_kill([]) == []
+        mock_kill.assert_not_called()
+
+    @patch("social_agent.control.Sandbox.kill")
+    def test_kills_overlap(self, mock_kill: MagicMock, controller: SandboxController) -> None:
+        """Kills are in flight at the same time, not one after another."""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def wait_for_peer(sandbox_id: str, **_: object) -> bool:
+            barrier.wait()  # Breaks (raises) if the kills were serialized
+            return True
+
+        mock_kill.side_effect = wait_for_peer
+        assert controller.bulk_kill(["sbx_1", "sbx_2"]) == ["sbx_1", "sbx_2"]
+        controller.close()
+
+    @patch("social_agent.control.Sandbox.kill", return_value=True)
+    def test_reuses_pool_until_close(
+        self, mock_kill: MagicMock, controller: SandboxController
+    ) -> None:
+        """Successive calls share one pool; close() drops it."""
+        controller.bulk_kill(["sbx_1"])
+        pool = controller._kill_pool
+        assert pool is not None
+        controller.bulk_kill(["sbx_2"])
+        assert controller._kill_pool is pool
+
+        controller.close()
+        assert controller._kill_pool is None
+        controller.close()  # Idempotent
+
+
 # --- Observation tests ---
 
 
@@ -629,6 +681,62 @@ class TestCheckHealth:
         )
         assert result.status == HealthStatus.STUCK
 
+    @patch("social_agent.control.Sandbox.connect")
+    def test_uncached_by_default(
+        self, mock_connect: MagicMock, controller: SandboxController
+    ) -> None:
+        """Without a TTL every call reads the heartbeat."""
+        heartbeat = {"timestamp": datetime.now(UTC).isoformat()}
+        mock_connect.return_value.files.read.return_value = json.dumps(heartbeat)
+
+        controller.check_health("sbx_123")
+        controller.check_health("sbx_123")
+        assert mock_connect.call_count == 2
+
+    @patch("social_agent.control.Sandbox.connect")
+    def test_cache_within_ttl(self, mock_connect: MagicMock) -> None:
+        """With a TTL, repeat calls reuse the result until cleared."""
+        heartbeat = {"timestamp": datetime.now(UTC).isoformat()}
+        mock_connect.return_value.files.read.return_value = json.dumps(heartbeat)
+        cached = SandboxController(api_key="test-key", health_cache_ttl_s=60.0)
+
+        first = cached.check_health("sbx_123")
+        assert cached.check_health("sbx_123") is first
+        assert mock_connect.call_count == 1
+
+        # Different thresholds are a different cache entry
+        cached.check_health("sbx_123", healthy_threshold=10.0)
+        assert mock_connect.call_count == 2
+
+        cached.clear_health_cache()
+        cached.check_health("sbx_123")
+        assert mock_connect.call_count == 3
+
+    @patch("social_agent.control.Sandbox.connect")
+    def test_use_cache_false_reads_and_refreshes(self, mock_connect: MagicMock) -> None:
+        """use_cache=False skips the cached entry but stores the fresh one."""
+        heartbeat = {"timestamp": datetime.now(UTC).isoformat()}
+        mock_connect.return_value.files.read.return_value = json.dumps(heartbeat)
+        cached = SandboxController(api_key="test-key", health_cache_ttl_s=60.0)
+
+        cached.check_health("sbx_123")
+        fresh = cached.check_health("sbx_123", use_cache=False)
+        assert mock_connect.call_count == 2
+        assert cached.check_health("sbx_123") is fresh
+        assert mock_connect.call_count == 2
+
+    @patch("social_agent.control.Sandbox.connect")
+    def test_expired_entries_dropped_on_write(self, mock_connect: MagicMock) -> None:
+        """Sandboxes no longer checked don't stay in the cache forever."""
+        heartbeat = {"timestamp": datetime.now(UTC).isoformat()}
+        mock_connect.return_value.files.read.return_value = json.dumps(heartbeat)
+        cached = SandboxController(api_key="test-key", health_cache_ttl_s=60.0)
+        stale = HealthCheck(sandbox_id="sbx_gone", status=HealthStatus.HEALTHY)
+        cached._health_cache[("sbx_gone", 60.0, 600.0)] = (time.monotonic() - 120.0, stale)
+
+        cached.check_health("sbx_123")
+        assert list(cached._health_cache) == [("sbx_123", 60.0, 600.0)]
+
 
 # --- Dataclass tests ---
 
@@ -665,6 +773,13 @@ class TestDataclasses:
         assert si.started_at is None
         assert si.metadata == {}
 
+    def test_sandbox_info_frozen(self) -> None:
+        """SandboxInfo is immutable and slotted."""
+        si = SandboxInfo(sandbox_id="sbx_1")
+        with pytest.raises(AttributeError):
+            si.sandbox_id = "sbx_2"  # type: ignore[misc]
+        assert not hasattr(si, "__dict__")
+
     def test_process_info(self) -> None:
         """ProcessInfo construction."""
         pi = ProcessInfo(pid=42, cmd="python")
@@ -874,3 +989,23 @@ class TestStartBackgroundCommand:
         controller.start_background_command("sbx_123", "cmd")
 
         mock_connect.assert_called_once_with("sbx_123", api_key="test-key")
+
+
+# --- Shared stub conformance ---
+
+
+def test_stub_controller_matches_real_api() -> None:
+    """Every method on the shared StubController mirrors SandboxController's signature."""
+
+    def params(func: object) -> list[tuple[str, object, object]]:
+        return [
+            (p.name, p.kind, p.default)
+            for p in inspect.signature(func).parameters.values()  # type: ignore[arg-type]
+        ]
+
+    for name, attr in vars(StubController).items():
+        if name.startswith("_") or name == "calls_to" or not inspect.isfunction(attr):
+            continue
+        real = getattr(SandboxController, name, None)
+        assert callable(real), f"SandboxController has no {name}"
+        assert params(attr) == params(real), name
@@ -87,10 +87,11 @@ def test_push_state_calls_add_commit_push(
     """push_state calls git add, commit, and push."""
     push_state(tmp_path, "cycle 42")
 
+    keywords = ("add", "commit", "push")
     commands = [" ".join(c.args[0]) for c in mock_run.call_args_list]
-    assert any("add" in cmd for cmd in commands), "git add not called"
-    assert any("commit" in cmd for cmd in commands), "git commit not called"
-    assert any("push" in cmd for cmd in commands), "git push not called"
+    present = {kw for cmd in commands for kw in keywords if kw in cmd}
+    missing = set(keywords) - present
+    assert not missing, f"git subcommands not called: {sorted(missing)}"
 
 
 @patch("social_agent.git_push.subprocess.run")
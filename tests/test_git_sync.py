@@ -1,6 +1,6 @@
 """Tests for git persistence layer (git_sync.py).
 
-Uses mocked SandboxClient for all git commands.
+Uses a fake SandboxClient for all git commands.
 Tests queue behavior, retry logic, tracker logging, and lifecycle.
 """
 
@@ -8,30 +8,66 @@ from __future__ import annotations
 
 import json
 import time
-from typing import TYPE_CHECKING
-from unittest.mock import MagicMock
+from typing import TYPE_CHECKING, Any
 
 import pytest
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
     from pathlib import Path
 
 from social_agent.git_sync import GitSync, SyncEntry, SyncResult
 from social_agent.sandbox import BashResult
 
+# --- Helpers ---
+
+
+def _read_tracker(path: Path) -> list[dict[str, Any]]:
+    """Parse git_tracker.jsonl line by line, skipping blank lines."""
+    with path.open() as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _wait_processed(sync: GitSync, timeout: float = 5.0) -> None:
+    """Wait until the worker has finished every queued entry, or fail.
+
+    Bounded stand-in for sync._queue.join(): if the worker thread dies,
+    the test fails after timeout instead of hanging the suite.
+    """
+    deadline = time.monotonic() + timeout
+    while sync._queue.unfinished_tasks:
+        assert time.monotonic() < deadline, (
+            f"{sync._queue.unfinished_tasks} sync entries unprocessed after {timeout}s"
+        )
+        time.sleep(0.01)
+
+
 # --- Fixtures ---
 
 
+class FakeSandbox:
+    """Minimal SandboxClient stand-in for git commands.
+
+    Cheaper than MagicMock on the worker's hot path. Returns
+    side_effect(cmd) when set, otherwise the fixed result.
+    """
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.result = BashResult(stdout="", stderr="", exit_code=0)
+        self.side_effect: Callable[[str], BashResult] | None = None
+
+    def run_bash(self, cmd: str) -> BashResult:
+        self.calls.append(cmd)
+        if self.side_effect is not None:
+            return self.side_effect(cmd)
+        return self.result
+
+
 @pytest.fixture
-def mock_sandbox() -> MagicMock:
-    """Mock SandboxClient that succeeds on all git commands."""
-    sandbox = MagicMock()
-    sandbox.run_bash.return_value = BashResult(
-        stdout="",
-        stderr="",
-        exit_code=0,
-    )
-    return sandbox
+def mock_sandbox() -> FakeSandbox:
+    """Fake SandboxClient that succeeds on all git commands."""
+    return FakeSandbox()
 
 
 @pytest.fixture
@@ -41,7 +77,7 @@ def tracker_path(tmp_path: Path) -> Path:
 
 
 @pytest.fixture
-def git_sync(mock_sandbox: MagicMock, tracker_path: Path) -> GitSync:
+def git_sync(mock_sandbox: FakeSandbox, tracker_path: Path) -> GitSync:
     """GitSync instance with mocked sandbox."""
     return GitSync(
         sandbox=mock_sandbox,
@@ -52,6 +88,26 @@ def git_sync(mock_sandbox: MagicMock, tracker_path: Path) -> GitSync:
     )
 
 
+@pytest.fixture
+def no_retry_delay(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Zero the retry delay — tests check retry counts, not timing."""
+    monkeypatch.setattr("social_agent.git_sync._RETRY_DELAY", 0.0)
+
+
+@pytest.fixture(scope="module")
+def readonly_git_sync() -> GitSync:
+    """Shared, never-started GitSync for tests that only read state.
+
+    Has no tracker_path and must not be started or mutated.
+    """
+    return GitSync(
+        sandbox=FakeSandbox(),
+        repo_url="https://github.com/netanel-systems/nathan-brain",
+        token="ghp_test_token",
+        branch="main",
+    )
+
+
 # --- Dataclass tests ---
 
 
@@ -165,14 +221,14 @@ class TestQueue:
         assert result is True
         git_sync.stop()
 
-    def test_queue_sync_when_not_running(self, git_sync: GitSync) -> None:
+    def test_queue_sync_when_not_running(self, readonly_git_sync: GitSync) -> None:
         """Queuing when not running returns False."""
-        result = git_sync.queue_sync(["state.json"], "cycle 1")
+        result = readonly_git_sync.queue_sync(["state.json"], "cycle 1")
         assert result is False
 
-    def test_stats_initial(self, git_sync: GitSync) -> None:
+    def test_stats_initial(self, readonly_git_sync: GitSync) -> None:
         """Initial stats are zero."""
-        assert git_sync.stats == {
+        assert readonly_git_sync.stats == {
             "total_syncs": 0,
             "total_failures": 0,
             "queue_size": 0,
@@ -180,7 +236,7 @@ class TestQueue:
 
     def test_queue_full_returns_false(
         self,
-        mock_sandbox: MagicMock,
+        mock_sandbox: FakeSandbox,
         tracker_path: Path,
     ) -> None:
         """Queuing to a full queue returns False."""
@@ -230,7 +286,7 @@ class TestSyncProcessing:
     def test_successful_sync(
         self,
         git_sync: GitSync,
-        mock_sandbox: MagicMock,
+        mock_sandbox: FakeSandbox,
     ) -> None:
         """Successful sync calls git add, commit, push."""
         # Make git diff --cached return non-zero (there ARE changes)
@@ -241,11 +297,11 @@ class TestSyncProcessing:
                 return BashResult(stdout="abc1234\n", stderr="", exit_code=0)
             return BashResult(stdout="", stderr="", exit_code=0)
 
-        mock_sandbox.run_bash.side_effect = side_effect
+        mock_sandbox.side_effect = side_effect
 
         git_sync.start()
         git_sync.queue_sync(["state.json"], "cycle 1")
-        time.sleep(0.5)  # Let worker process
+        _wait_processed(git_sync)  # Wait for worker to process
         git_sync.stop()
 
         assert git_sync.stats["total_syncs"] == 1
@@ -254,41 +310,42 @@ class TestSyncProcessing:
     def test_no_changes_skips_commit(
         self,
         git_sync: GitSync,
-        mock_sandbox: MagicMock,
+        mock_sandbox: FakeSandbox,
         tracker_path: Path,
     ) -> None:
         """When no changes staged, skip commit and push."""
         # git diff --cached --quiet returns 0 (no changes)
-        mock_sandbox.run_bash.return_value = BashResult(
+        mock_sandbox.result = BashResult(
             stdout="", stderr="", exit_code=0
         )
 
         git_sync.start()
         git_sync.queue_sync(["state.json"], "no changes")
-        time.sleep(0.5)
+        _wait_processed(git_sync)
         git_sync.stop()
 
         # Still counts as a sync (skipped)
         assert git_sync.stats["total_syncs"] == 1
         # Tracker should record status as "skipped"
         assert tracker_path.exists()
-        record = json.loads(tracker_path.read_text().strip().split("\n")[0])
-        assert record["status"] == "skipped"
+        records = _read_tracker(tracker_path)
+        assert records[0]["status"] == "skipped"
 
+    @pytest.mark.usefixtures("no_retry_delay")
     def test_failed_sync_retries(
         self,
         git_sync: GitSync,
-        mock_sandbox: MagicMock,
+        mock_sandbox: FakeSandbox,
     ) -> None:
         """Failed sync retries up to _MAX_RETRIES times."""
         # Always fail on git add
-        mock_sandbox.run_bash.return_value = BashResult(
+        mock_sandbox.result = BashResult(
             stdout="", stderr="error: fatal", exit_code=128
         )
 
         git_sync.start()
         git_sync.queue_sync(["state.json"], "will fail")
-        time.sleep(3.0)  # Allow time for retries (3 * _RETRY_DELAY)
+        _wait_processed(git_sync)  # Wait for all retries to finish
         git_sync.stop()
 
         assert git_sync.stats["total_failures"] == 1
@@ -304,7 +361,7 @@ class TestTrackerLogging:
     def test_success_logged(
         self,
         git_sync: GitSync,
-        mock_sandbox: MagicMock,
+        mock_sandbox: FakeSandbox,
         tracker_path: Path,
     ) -> None:
         """Successful sync is logged to tracker."""
@@ -315,48 +372,86 @@ class TestTrackerLogging:
                 return BashResult(stdout="abc1234\n", stderr="", exit_code=0)
             return BashResult(stdout="", stderr="", exit_code=0)
 
-        mock_sandbox.run_bash.side_effect = side_effect
+        mock_sandbox.side_effect = side_effect
 
         git_sync.start()
         git_sync.queue_sync(["state.json"], "tracked cycle")
-        time.sleep(0.5)
+        _wait_processed(git_sync)
         git_sync.stop()
 
         assert tracker_path.exists()
-        lines = tracker_path.read_text().strip().split("\n")
-        assert len(lines) == 1
-        record = json.loads(lines[0])
+        records = _read_tracker(tracker_path)
+        assert len(records) == 1
+        record = records[0]
         assert record["status"] == "success"
         assert record["commit_hash"] == "abc1234"
         assert record["message"] == "tracked cycle"
         assert "state.json" in record["files"]
 
+    @pytest.mark.usefixtures("no_retry_delay")
     def test_failure_logged(
         self,
         git_sync: GitSync,
-        mock_sandbox: MagicMock,
+        mock_sandbox: FakeSandbox,
         tracker_path: Path,
     ) -> None:
         """Failed sync is logged with error info."""
-        mock_sandbox.run_bash.return_value = BashResult(
+        mock_sandbox.result = BashResult(
             stdout="", stderr="fatal error", exit_code=128
         )
 
         git_sync.start()
         git_sync.queue_sync(["state.json"], "fail tracked")
-        time.sleep(3.0)
+        _wait_processed(git_sync)
         git_sync.stop()
 
         assert tracker_path.exists()
-        lines = tracker_path.read_text().strip().split("\n")
-        record = json.loads(lines[0])
+        record = _read_tracker(tracker_path)[0]
         assert record["status"] == "failed"
         assert record["attempts"] == 3
         assert "fatal" in record["error"].lower() or "git add failed" in record["error"]
 
+    def test_tracker_handle_reused_and_closed_on_stop(
+        self,
+        git_sync: GitSync,
+        tracker_path: Path,
+    ) -> None:
+        """One tracker handle serves every sync and is closed by stop()."""
+        git_sync.start()
+        git_sync.queue_sync(["a.txt"], "first")
+        _wait_processed(git_sync)
+        fp = git_sync._tracker_fp
+        assert fp is not None
+        git_sync.queue_sync(["b.txt"], "second")
+        _wait_processed(git_sync)
+        assert git_sync._tracker_fp is fp
+        git_sync.stop()
+
+        assert fp.closed
+        assert git_sync._tracker_fp is None
+        records = _read_tracker(tracker_path)
+        assert [r["message"] for r in records] == ["first", "second"]
+
+    def test_tracker_flushed_every_batch(
+        self,
+        git_sync: GitSync,
+        tracker_path: Path,
+    ) -> None:
+        """Buffered results reach disk once a full batch is written."""
+        from social_agent.git_sync import _TRACKER_FLUSH_EVERY
+
+        git_sync.start()
+        for i in range(_TRACKER_FLUSH_EVERY):
+            git_sync.queue_sync(["state.json"], f"cycle {i}")
+        _wait_processed(git_sync)
+
+        # Still running — flushed by batch size, not by stop()
+        assert len(_read_tracker(tracker_path)) == _TRACKER_FLUSH_EVERY
+        git_sync.stop()
+
     def test_no_tracker_path(
         self,
-        mock_sandbox: MagicMock,
+        mock_sandbox: FakeSandbox,
     ) -> None:
         """GitSync works without tracker_path."""
         sync = GitSync(
@@ -367,7 +462,7 @@ class TestTrackerLogging:
         )
         sync.start()
         sync.queue_sync(["file.txt"], "no tracker")
-        time.sleep(0.5)
+        _wait_processed(sync)
         sync.stop()
         # Should not raise
 
@@ -378,66 +473,44 @@ class TestTrackerLogging:
 class TestInitRepo:
     """Tests for repository initialization."""
 
-    def test_init_repo_success(
-        self,
-        git_sync: GitSync,
-        mock_sandbox: MagicMock,
-    ) -> None:
-        """init_repo runs git config and clone commands."""
-        result = git_sync.init_repo()
-        assert result is True
-        # 2 config commands + 1 clone = 3 calls
-        assert mock_sandbox.run_bash.call_count == 3
-
-    def test_init_repo_already_cloned(
-        self,
-        git_sync: GitSync,
-        mock_sandbox: MagicMock,
-    ) -> None:
-        """init_repo succeeds when repo already cloned."""
-        def side_effect(cmd: str) -> BashResult:
-            if "git clone" in cmd:
-                return BashResult(
-                    stdout="",
-                    stderr="fatal: destination path already exists",
-                    exit_code=128,
-                )
-            return BashResult(stdout="", stderr="", exit_code=0)
-
-        mock_sandbox.run_bash.side_effect = side_effect
-        result = git_sync.init_repo()
-        assert result is True
-
-    def test_init_repo_clone_failure(
+    @pytest.mark.parametrize(
+        ("config_stderr", "clone_stderr", "expected", "expected_calls"),
+        [
+            pytest.param(None, None, True, 3, id="success"),
+            pytest.param(
+                None, "fatal: destination path already exists", True, 3,
+                id="already-cloned",
+            ),
+            pytest.param(
+                None, "fatal: repository not found", False, 3,
+                id="clone-failure",
+            ),
+            pytest.param(
+                "fatal: could not create", None, False, 1,
+                id="config-failure",
+            ),
+        ],
+    )
+    def test_init_repo(
         self,
         git_sync: GitSync,
-        mock_sandbox: MagicMock,
+        mock_sandbox: FakeSandbox,
+        config_stderr: str | None,
+        clone_stderr: str | None,
+        expected: bool,
+        expected_calls: int,
     ) -> None:
-        """init_repo returns False on real clone failure."""
+        """init_repo runs git config + clone; tolerates only 'already exists'."""
         def side_effect(cmd: str) -> BashResult:
-            if "git clone" in cmd:
-                return BashResult(
-                    stdout="",
-                    stderr="fatal: repository not found",
-                    exit_code=128,
-                )
+            stderr = clone_stderr if "git clone" in cmd else config_stderr
+            if stderr is not None:
+                return BashResult(stdout="", stderr=stderr, exit_code=128)
             return BashResult(stdout="", stderr="", exit_code=0)
 
-        mock_sandbox.run_bash.side_effect = side_effect
-        result = git_sync.init_repo()
-        assert result is False
-
-    def test_init_repo_config_failure(
-        self,
-        git_sync: GitSync,
-        mock_sandbox: MagicMock,
-    ) -> None:
-        """init_repo returns False when git config fails."""
-        mock_sandbox.run_bash.return_value = BashResult(
-            stdout="", stderr="fatal: could not create", exit_code=128
-        )
-        result = git_sync.init_repo()
-        assert result is False
+        mock_sandbox.side_effect = side_effect
+        assert git_sync.init_repo() is expected
+        # 2 config commands + 1 clone, stopping at the first config failure
+        assert len(mock_sandbox.calls) == expected_calls
 
 
 # --- Authenticated URL tests ---
@@ -446,22 +519,22 @@ class TestInitRepo:
 class TestAuthenticatedUrl:
     """Tests for URL authentication."""
 
-    def test_https_url(self, git_sync: GitSync) -> None:
+    def test_https_url(self, readonly_git_sync: GitSync) -> None:
         """HTTPS URL gets token injected."""
-        url = git_sync._authenticated_url()
+        url = readonly_git_sync._authenticated_url()
         assert url == "https://ghp_test_token@github.com/netanel-systems/nathan-brain"
 
-    def test_non_https_url(self, mock_sandbox: MagicMock) -> None:
+    def test_non_https_url(self) -> None:
         """Non-HTTPS URL is returned unchanged."""
         sync = GitSync(
-            sandbox=mock_sandbox,
+            sandbox=FakeSandbox(),
             repo_url="git@github.com:org/repo.git",
             token="tok",
         )
         url = sync._authenticated_url()
         assert url == "git@github.com:org/repo.git"
 
-    def test_token_excluded_from_repr(self, git_sync: GitSync) -> None:
+    def test_token_excluded_from_repr(self, readonly_git_sync: GitSync) -> None:
         """Token must not appear in repr output."""
-        r = repr(git_sync)
+        r = repr(readonly_git_sync)
         assert "ghp_test_token" not in r
@@ -1,50 +1,127 @@
 """Tests for lifecycle management (lifecycle.py).
 
-Uses mocked SandboxController for all E2B operations.
+Uses a spec'd SandboxController mock for all E2B operations.
 Tests migration flow, safety limits, and cleanup.
 """
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+import contextlib
+import logging
+import threading
+import time
+from dataclasses import MISSING, fields
+from typing import Any
+from unittest.mock import MagicMock
+from unittest.mock import call as mock_call
 
+import httpx
 import pytest
+from e2b_code_interpreter import AuthenticationException, SandboxException
+
+from social_agent.control import HealthCheck, HealthStatus, SandboxController, SandboxInfo
+from social_agent.lifecycle import (
+    LifecycleManager,
+    MigrationResult,
+    _utc_day,
+)
+
+# Health results
+_HC_HEALTHY_OLD = HealthCheck(status=HealthStatus.HEALTHY, sandbox_id="sb-old")
+_HC_HEALTHY_NEW = HealthCheck(status=HealthStatus.HEALTHY, sandbox_id="sb-new")
+_HC_STUCK = HealthCheck(status=HealthStatus.STUCK, sandbox_id="sb-1")
+_HC_DEAD = HealthCheck(status=HealthStatus.DEAD, sandbox_id="sb-1")
+_HC_UNKNOWN_NEW = HealthCheck(status=HealthStatus.UNKNOWN, sandbox_id="sb-new")
+
+# Sandbox listing entries
+_SB = {
+    sid: SandboxInfo(sandbox_id=sid)
+    for sid in (
+        "sb-1", "sb-2", "sb-keep", "sb-old",
+        "sb-orphan", "sb-orphan-1", "sb-orphan-2",
+    )
+}
 
-from social_agent.control import HealthCheck, HealthStatus, SandboxInfo
-from social_agent.lifecycle import LifecycleManager, MigrationResult
+# Frozen clock: 2024-06-15 12:00:00 UTC, far from any midnight rollover
+_FROZEN_NOW = 1_718_452_800.0
+_FROZEN_DAY = _utc_day(_FROZEN_NOW)
 
 # --- Fixtures ---
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_controller() -> MagicMock:
-    """Mock SandboxController."""
-    ctrl = MagicMock()
-    ctrl.check_health.return_value = HealthCheck(
-        status=HealthStatus.HEALTHY,
-        sandbox_id="sb-old",
-    )
-    ctrl.list_sandboxes.return_value = []
-    ctrl.kill.return_value = True
-    ctrl.write_file.return_value = None
-    ctrl.inject_override.return_value = None
-    ctrl.run_command.return_value = ""
-    ctrl.start_background_command.return_value = None
-    return ctrl
+    """Spec'd SandboxController mock; unknown attributes raise AttributeError."""
+    return MagicMock(spec=SandboxController)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def lifecycle(mock_controller: MagicMock) -> LifecycleManager:
-    """LifecycleManager with mocked controller."""
+    """LifecycleManager over the mocked controller, shared and reset per test."""
     return LifecycleManager(
         controller=mock_controller,
         e2b_api_key="test_key",
         migration_threshold_s=300,
         verify_timeout_s=1,  # Short for tests
         max_migrations_per_day=10,
+        clock=lambda: _FROZEN_NOW,
     )
 
 
+@pytest.fixture
+def mock_sandbox_cls(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Patched e2b Sandbox class; create() returns sandbox "sb-new"."""
+    sandbox_cls = MagicMock()
+    sandbox_cls.create.return_value.sandbox_id = "sb-new"
+    monkeypatch.setattr("social_agent.lifecycle.Sandbox", sandbox_cls)
+    return sandbox_cls
+
+
+@pytest.fixture(autouse=True)
+def _reset_lifecycle(
+    mock_controller: MagicMock,
+    lifecycle: LifecycleManager,
+) -> None:
+    """Give every test a fresh controller and zeroed internal state."""
+    mock_controller.reset_mock(return_value=True, side_effect=True)
+    mock_controller.check_health.return_value = _HC_HEALTHY_OLD
+    mock_controller.list_sandboxes.return_value = []
+    mock_controller.kill.return_value = True
+    mock_controller.bulk_kill.side_effect = list  # Every kill succeeds
+    mock_controller.run_command.return_value = ""
+    for f in fields(lifecycle):
+        # Fields without a default (e.g. the migration semaphore) are built
+        # in __post_init__ and left as-is.
+        if not f.init and (f.default is not MISSING or f.default_factory is not MISSING):
+            default = f.default_factory() if f.default_factory is not MISSING else f.default
+            setattr(lifecycle, f.name, default)
+
+
+def _assert_cmd_envs(
+    controller: MagicMock,
+    *,
+    token_absent: str = "",
+    env_require: dict[str, str] | None = None,
+) -> None:
+    """Check every deploy command in one pass over recorded calls.
+
+    Each foreground and background command must not contain token_absent
+    and must carry every env_require key/value in its envs.
+    """
+    calls = [
+        *controller.run_command.call_args_list,
+        *controller.start_background_command.call_args_list,
+    ]
+    assert calls, "deploy_self issued no commands"
+    required = (env_require or {}).items()
+    for c in calls:
+        cmd = c.args[1] if len(c.args) > 1 else c.kwargs.get("command", "")
+        if token_absent:
+            assert token_absent not in cmd
+        envs = c.kwargs.get("envs", {})
+        assert required <= envs.items()
+
+
 # --- MigrationResult tests ---
 
 
@@ -82,6 +159,13 @@ class TestMigrationResult:
         with pytest.raises(AttributeError):
             result.success = False  # type: ignore[misc]
 
+    def test_slots(self) -> None:
+        """MigrationResult carries no per-instance __dict__."""
+        result = MigrationResult(
+            success=True, old_sandbox_id="", new_sandbox_id="", duration_s=0.0
+        )
+        assert not hasattr(result, "__dict__")
+
 
 # --- Safety limit tests ---
 
@@ -96,16 +180,50 @@ class TestSafetyLimits:
     def test_migration_limit_reached(self, lifecycle: LifecycleManager) -> None:
         """Cannot migrate when daily limit reached."""
         lifecycle._migrations_today = 10
-        lifecycle._last_migration_date = _today_str()
+        lifecycle._last_migration_day = _FROZEN_DAY
         assert lifecycle.can_migrate is False
 
+    def test_utc_day_matches_utc_date(self) -> None:
+        """_utc_day() counts days from 1970-01-01 to the timestamp's UTC date."""
+        from datetime import date
+
+        assert (date(2024, 6, 15) - date(1970, 1, 1)).days == _FROZEN_DAY
+
     def test_daily_counter_resets(self, lifecycle: LifecycleManager) -> None:
         """Migration counter resets on new day."""
         lifecycle._migrations_today = 10
-        lifecycle._last_migration_date = "2020-01-01"  # Old date
+        lifecycle._last_migration_day = 0  # 1970-01-01
+        assert lifecycle.can_migrate is True
+        assert lifecycle.migrations_today == 0
+
+    def test_counter_resets_when_clock_crosses_midnight(
+        self,
+        lifecycle: LifecycleManager,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """The injected clock decides when a new UTC day starts."""
+        lifecycle._migrations_today = 10
+        lifecycle._last_migration_day = _FROZEN_DAY
+        assert lifecycle.can_migrate is False
+
+        monkeypatch.setattr(lifecycle, "clock", lambda: _FROZEN_NOW + 43_200)  # 00:00 next day
         assert lifecycle.can_migrate is True
         assert lifecycle.migrations_today == 0
 
+    @pytest.mark.parametrize("slots", [0, -1])
+    def test_invalid_concurrent_migrations_rejected(
+        self,
+        mock_controller: MagicMock,
+        slots: int,
+    ) -> None:
+        """max_concurrent_migrations below 1 is a config error, not clamped."""
+        with pytest.raises(ValueError, match="max_concurrent_migrations"):
+            LifecycleManager(
+                controller=mock_controller,
+                e2b_api_key="test_key",
+                max_concurrent_migrations=slots,
+            )
+
     def test_concurrent_sandbox_limit(
         self,
         lifecycle: LifecycleManager,
@@ -113,8 +231,8 @@ class TestSafetyLimits:
     ) -> None:
         """Cannot create successor when max sandboxes active."""
         mock_controller.list_sandboxes.return_value = [
-            SandboxInfo(sandbox_id="sb-1"),
-            SandboxInfo(sandbox_id="sb-2"),
+            _SB["sb-1"],
+            _SB["sb-2"],
         ]
         result = lifecycle.create_successor()
         assert result is None
@@ -139,10 +257,7 @@ class TestShouldMigrate:
         mock_controller: MagicMock,
     ) -> None:
         """Stuck sandbox triggers migration."""
-        mock_controller.check_health.return_value = HealthCheck(
-            status=HealthStatus.STUCK,
-            sandbox_id="sb-1",
-        )
+        mock_controller.check_health.return_value = _HC_STUCK
         assert lifecycle.should_migrate("sb-1") is True
 
     def test_dead_sandbox_triggers_migration(
@@ -151,10 +266,7 @@ class TestShouldMigrate:
         mock_controller: MagicMock,
     ) -> None:
         """Dead sandbox triggers migration."""
-        mock_controller.check_health.return_value = HealthCheck(
-            status=HealthStatus.DEAD,
-            sandbox_id="sb-1",
-        )
+        mock_controller.check_health.return_value = _HC_DEAD
         assert lifecycle.should_migrate("sb-1") is True
 
     def test_migration_limit_prevents_trigger(
@@ -164,31 +276,79 @@ class TestShouldMigrate:
     ) -> None:
         """Migration limit prevents trigger even for stuck sandbox."""
         lifecycle._migrations_today = 10
-        lifecycle._last_migration_date = _today_str()
-        mock_controller.check_health.return_value = HealthCheck(
-            status=HealthStatus.STUCK,
-            sandbox_id="sb-1",
-        )
+        lifecycle._last_migration_day = _FROZEN_DAY
+        mock_controller.check_health.return_value = _HC_STUCK
         assert lifecycle.should_migrate("sb-1") is False
 
 
+# --- Health cache tests ---
+
+
+class TestHealthCache:
+    """verify_successor bypasses the controller's health cache."""
+
+    def test_verify_successor_bypasses_cache(
+        self,
+        lifecycle: LifecycleManager,
+        mock_controller: MagicMock,
+    ) -> None:
+        """verify_successor always polls a fresh heartbeat."""
+        mock_controller.check_health.return_value = _HC_HEALTHY_NEW
+        assert lifecycle.verify_successor("sb-new", timeout=1) is True
+        mock_controller.check_health.assert_called_once_with("sb-new", use_cache=False)
+
+
+# --- Sandbox listing cache tests ---
+
+
+class TestSandboxListCache:
+    """Tests for the short-TTL sandbox listing cache."""
+
+    def test_repeated_listing_reuses_result(
+        self,
+        lifecycle: LifecycleManager,
+        mock_controller: MagicMock,
+    ) -> None:
+        """Back-to-back counts within the TTL make one listing call."""
+        lifecycle.check_concurrent_sandboxes()
+        lifecycle.check_concurrent_sandboxes()
+        assert mock_controller.list_sandboxes.call_count == 1
+
+    def test_kill_invalidates_listing(
+        self,
+        lifecycle: LifecycleManager,
+        mock_controller: MagicMock,
+    ) -> None:
+        """A kill through the manager forces a fresh listing."""
+        lifecycle.check_concurrent_sandboxes()
+        lifecycle.graceful_shutdown("sb-old")
+        lifecycle.check_concurrent_sandboxes()
+        assert mock_controller.list_sandboxes.call_count == 2
+
+    def test_create_invalidates_listing(
+        self,
+        mock_sandbox_cls: MagicMock,
+        lifecycle: LifecycleManager,
+        mock_controller: MagicMock,
+    ) -> None:
+        """Creating a successor forces a fresh listing."""
+        assert lifecycle.create_successor() == "sb-new"
+        lifecycle.check_concurrent_sandboxes()
+        assert mock_controller.list_sandboxes.call_count == 2
+
+
 # --- Create successor tests ---
 
 
 class TestCreateSuccessor:
     """Tests for successor sandbox creation."""
 
-    @patch("social_agent.lifecycle.Sandbox")
     def test_create_success(
         self,
         mock_sandbox_cls: MagicMock,
         lifecycle: LifecycleManager,
     ) -> None:
         """Successfully creates a new sandbox."""
-        mock_instance = MagicMock()
-        mock_instance.sandbox_id = "sb-new"
-        mock_sandbox_cls.create.return_value = mock_instance
-
         result = lifecycle.create_successor()
         assert result == "sb-new"
         mock_sandbox_cls.create.assert_called_once_with(
@@ -196,7 +356,6 @@ class TestCreateSuccessor:
             timeout=3600,
         )
 
-    @patch("social_agent.lifecycle.Sandbox")
     def test_create_failure(
         self,
         mock_sandbox_cls: MagicMock,
@@ -207,6 +366,46 @@ class TestCreateSuccessor:
         result = lifecycle.create_successor()
         assert result is None
 
+    def test_concurrent_creates_share_the_cap(
+        self,
+        mock_sandbox_cls: MagicMock,
+        lifecycle: LifecycleManager,
+        mock_controller: MagicMock,
+    ) -> None:
+        """A create waits for an in-flight create, then sees the cap."""
+        entered = threading.Event()
+        release = threading.Event()
+        created: list[SandboxInfo] = []
+
+        def slow_create(**_: Any) -> MagicMock:
+            entered.set()
+            release.wait(timeout=5)
+            instance = MagicMock()
+            instance.sandbox_id = f"sb-{len(created)}"
+            created.append(SandboxInfo(sandbox_id=instance.sandbox_id))
+            return instance
+
+        mock_sandbox_cls.create.side_effect = slow_create
+        mock_controller.list_sandboxes.side_effect = lambda: [_SB["sb-old"], *created]
+        results: list[str | None] = []
+
+        def create() -> None:
+            results.append(lifecycle.create_successor())
+
+        first = threading.Thread(target=create)
+        second = threading.Thread(target=create)
+        first.start()
+        assert entered.wait(timeout=5)
+        second.start()
+        second.join(timeout=0.2)
+        assert second.is_alive()  # Blocked behind the in-flight create
+
+        release.set()
+        first.join(timeout=5)
+        second.join(timeout=5)
+        assert results == ["sb-0", None]
+        assert mock_sandbox_cls.create.call_count == 1
+
 
 # --- Deploy tests ---
 
@@ -214,14 +413,14 @@ class TestCreateSuccessor:
 class TestDeploySelf:
     """Tests for deploying agent to new sandbox."""
 
-    def test_deploy_runs_two_foreground_and_one_background_command(
+    def test_deploy_runs_one_foreground_and_one_background_command(
         self,
         lifecycle: LifecycleManager,
         mock_controller: MagicMock,
     ) -> None:
-        """Deploy runs 2 blocking commands then 1 background command.
+        """Deploy runs 1 blocking command then 1 background command.
 
-        pip install and git clone use run_command (blocking).
+        pip install and git clone are chained into one run_command (blocking).
         Agent start uses start_background_command (non-blocking).
         """
         result = lifecycle.deploy_self(
@@ -230,10 +429,12 @@ class TestDeploySelf:
             "ghp_token",
         )
         assert result is True
-        assert mock_controller.run_command.call_count == 2
+        assert mock_controller.run_command.call_count == 1
+        cmd = mock_controller.run_command.call_args.args[1]
+        assert cmd.index("pip install") < cmd.index("&& git clone")
         assert mock_controller.start_background_command.call_count == 1
         # The old broken placeholder must NOT be called
-        mock_controller.write_file.assert_not_called()
+        assert mock_controller.write_file.call_count == 0
 
     def test_deploy_token_not_in_command_strings(
         self,
@@ -246,13 +447,8 @@ class TestDeploySelf:
             "https://github.com/org/brain",
             "ghp_super_secret_token",
         )
-        for call in mock_controller.run_command.call_args_list:
-            cmd = call.args[1] if len(call.args) > 1 else call.kwargs.get("command", "")
-            assert "ghp_super_secret_token" not in cmd
-        # Background command also must not expose the token
-        for call in mock_controller.start_background_command.call_args_list:
-            cmd = call.args[1] if len(call.args) > 1 else call.kwargs.get("command", "")
-            assert "ghp_super_secret_token" not in cmd
+        # Foreground and background commands alike
+        _assert_cmd_envs(mock_controller, token_absent="ghp_super_secret_token")
 
     def test_deploy_token_injected_as_env(
         self,
@@ -265,16 +461,12 @@ class TestDeploySelf:
             "https://github.com/org/brain",
             "ghp_token123",
         )
-        # Foreground commands must have GH_TOKEN in envs
-        for call in mock_controller.run_command.call_args_list:
-            envs = call.kwargs.get("envs", {})
-            assert "GH_TOKEN" in envs
-            assert envs["GH_TOKEN"] == "ghp_token123"  # noqa: S105
-        # Background command also has GH_TOKEN
-        for call in mock_controller.start_background_command.call_args_list:
-            envs = call.kwargs.get("envs", {})
-            assert "GH_TOKEN" in envs
-            assert envs["GH_TOKEN"] == "ghp_token123"  # noqa: S105
+        # Foreground and background commands alike
+        _assert_cmd_envs(
+            mock_controller,
+            token_absent="ghp_token123",
+            env_require={"GH_TOKEN": "ghp_token123"},
+        )
 
     def test_deploy_extra_envs_passed_through(
         self,
@@ -288,15 +480,23 @@ class TestDeploySelf:
             "ghp_token",
             envs={"OPENAI_API_KEY": "sk-test", "MOLTBOOK_API_KEY": "mb-test"},
         )
-        for call in mock_controller.run_command.call_args_list:
-            envs = call.kwargs.get("envs", {})
-            assert envs.get("OPENAI_API_KEY") == "sk-test"
-            assert envs.get("MOLTBOOK_API_KEY") == "mb-test"
-        # Background command also receives extra envs
-        for call in mock_controller.start_background_command.call_args_list:
-            envs = call.kwargs.get("envs", {})
-            assert envs.get("OPENAI_API_KEY") == "sk-test"
-            assert envs.get("MOLTBOOK_API_KEY") == "mb-test"
+        _assert_cmd_envs(
+            mock_controller,
+            env_require={"OPENAI_API_KEY": "sk-test", "MOLTBOOK_API_KEY": "mb-test"},
+        )
+
+    def test_deploy_builds_envs_once(
+        self,
+        lifecycle: LifecycleManager,
+        mock_controller: MagicMock,
+    ) -> None:
+        """Every step shares one env mapping; the caller's dict is untouched."""
+        extra = {"OPENAI_API_KEY": "sk-test"}
+        lifecycle.deploy_self("sb-new", "https://github.com/org/brain", "ghp_token", envs=extra)
+        fg_envs = mock_controller.run_command.call_args.kwargs["envs"]
+        bg_envs = mock_controller.start_background_command.call_args.kwargs["envs"]
+        assert fg_envs is bg_envs
+        assert extra == {"OPENAI_API_KEY": "sk-test"}
 
     def test_deploy_injects_agent_sandbox_id(
         self,
@@ -334,7 +534,7 @@ class TestDeploySelf:
             "ghp_token",
         )
         # start_background_command called exactly once (agent start)
-        mock_controller.start_background_command.assert_called_once()
+        assert mock_controller.start_background_command.call_count == 1
         # The command must include the agent run invocation
         call_args = mock_controller.start_background_command.call_args
         cmd = call_args.args[1] if len(call_args.args) > 1 else call_args.kwargs.get("command", "")
@@ -371,20 +571,21 @@ class TestDeploySelf:
         )
         assert result is False
 
-    def test_deploy_failure_on_second_command(
+    def test_deploy_failure_on_setup_command(
         self,
         lifecycle: LifecycleManager,
         mock_controller: MagicMock,
     ) -> None:
-        """Deploy returns False when the second command fails."""
-        mock_controller.run_command.side_effect = [None, RuntimeError("git failed"), None]
+        """A failed install/clone command stops deploy before agent start."""
+        mock_controller.run_command.side_effect = RuntimeError("exit 128: git failed")
         result = lifecycle.deploy_self(
             "sb-new",
             "https://github.com/org/brain",
             "ghp_token",
         )
         assert result is False
-        assert mock_controller.run_command.call_count == 2  # stopped at second
+        assert mock_controller.run_command.call_count == 1
+        assert mock_controller.start_background_command.call_count == 0
 
 
 # --- Verify successor tests ---
@@ -399,10 +600,7 @@ class TestVerifySuccessor:
         mock_controller: MagicMock,
     ) -> None:
         """Returns True when successor is healthy."""
-        mock_controller.check_health.return_value = HealthCheck(
-            status=HealthStatus.HEALTHY,
-            sandbox_id="sb-new",
-        )
+        mock_controller.check_health.return_value = _HC_HEALTHY_NEW
         result = lifecycle.verify_successor("sb-new", timeout=1)
         assert result is True
 
@@ -412,12 +610,31 @@ class TestVerifySuccessor:
         mock_controller: MagicMock,
     ) -> None:
         """Returns False when successor never becomes healthy."""
-        mock_controller.check_health.return_value = HealthCheck(
-            status=HealthStatus.UNKNOWN,
-            sandbox_id="sb-new",
-        )
+        mock_controller.check_health.return_value = _HC_UNKNOWN_NEW
+        start = time.monotonic()
         result = lifecycle.verify_successor("sb-new", timeout=1)
+        elapsed = time.monotonic() - start
         assert result is False
+        # Deadline-bounded: never sleeps a full poll interval past the timeout
+        assert elapsed < 2.0
+        # Backoff 0.5s → deadline: initial poll, one retry, final check
+        assert mock_controller.check_health.call_count <= 4
+
+    def test_verify_becomes_healthy_after_retries(
+        self,
+        lifecycle: LifecycleManager,
+        mock_controller: MagicMock,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Keeps polling until the successor reports HEALTHY."""
+        monkeypatch.setattr("social_agent.lifecycle._VERIFY_POLL_INITIAL_S", 0.01)
+        mock_controller.check_health.side_effect = [
+            _HC_UNKNOWN_NEW,
+            _HC_UNKNOWN_NEW,
+            _HC_HEALTHY_NEW,
+        ]
+        assert lifecycle.verify_successor("sb-new", timeout=5) is True
+        assert mock_controller.check_health.call_count == 3
 
 
 # --- Graceful shutdown tests ---
@@ -435,8 +652,8 @@ class TestGracefulShutdown:
         result = lifecycle.graceful_shutdown("sb-old")
         assert result is True
         assert lifecycle.migrations_today == 1
-        mock_controller.kill.assert_called_once_with("sb-old")
-        mock_controller.inject_override.assert_called_once()
+        assert mock_controller.kill.call_args_list == [mock_call("sb-old")]
+        assert mock_controller.inject_override.call_count == 1
 
     def test_shutdown_kill_failure(
         self,
@@ -449,15 +666,68 @@ class TestGracefulShutdown:
         assert result is False
         assert lifecycle.migrations_today == 0
 
+    def test_shutdown_counts_against_current_day(
+        self,
+        lifecycle: LifecycleManager,
+    ) -> None:
+        """A shutdown after midnight starts the new day's count at 1."""
+        lifecycle._migrations_today = 10
+        lifecycle._last_migration_day = _FROZEN_DAY - 1
+        assert lifecycle.graceful_shutdown("sb-old") is True
+        assert lifecycle.migrations_today == 1
+        assert lifecycle.can_migrate is True
+
+    def test_concurrent_shutdowns_all_counted(
+        self,
+        lifecycle: LifecycleManager,
+    ) -> None:
+        """Parallel shutdowns never lose a counter increment."""
+        threads = [
+            threading.Thread(target=lifecycle.graceful_shutdown, args=(f"sb-{i}",))
+            for i in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5)
+        assert lifecycle.migrations_today == 8
+
+    def test_shutdown_logs_before_kill(
+        self,
+        lifecycle: LifecycleManager,
+        mock_controller: MagicMock,
+    ) -> None:
+        """Override is written before the kill — afterwards the sandbox is gone."""
+        order: list[str] = []
+        mock_controller.inject_override.side_effect = lambda *_: order.append("log")
+        mock_controller.kill.side_effect = lambda *_: order.append("kill") or True
+        assert lifecycle.graceful_shutdown("sb-old") is True
+        assert order == ["log", "kill"]
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            pytest.param(RuntimeError("fail"), id="runtime"),
+            pytest.param(SandboxException("gone"), id="sandbox"),
+            pytest.param(AuthenticationException("bad key"), id="auth"),
+            pytest.param(httpx.ConnectError("refused"), id="transport"),
+            pytest.param(TypeError("bug"), id="unexpected"),
+        ],
+    )
     def test_shutdown_override_failure_tolerated(
         self,
         lifecycle: LifecycleManager,
         mock_controller: MagicMock,
+        caplog: pytest.LogCaptureFixture,
+        error: Exception,
     ) -> None:
-        """Override write failure doesn't block shutdown."""
-        mock_controller.inject_override.side_effect = RuntimeError("fail")
-        result = lifecycle.graceful_shutdown("sb-old")
+        """Override write failure doesn't block shutdown, but is logged."""
+        mock_controller.inject_override.side_effect = error
+        with caplog.at_level(logging.WARNING, logger="social_agent.lifecycle"):
+            result = lifecycle.graceful_shutdown("sb-old")
         assert result is True  # Kill still succeeds
+        mock_controller.kill.assert_called_once_with("sb-old")
+        assert "Could not log migration to old sandbox sb-old" in caplog.text
 
 
 # --- Full migration tests ---
@@ -466,7 +736,6 @@ class TestGracefulShutdown:
 class TestMigrate:
     """Tests for the full migration flow."""
 
-    @patch("social_agent.lifecycle.Sandbox")
     def test_full_migration_success(
         self,
         mock_sandbox_cls: MagicMock,
@@ -474,14 +743,7 @@ class TestMigrate:
         mock_controller: MagicMock,
     ) -> None:
         """Full migration: create → deploy → verify → shutdown."""
-        mock_instance = MagicMock()
-        mock_instance.sandbox_id = "sb-new"
-        mock_sandbox_cls.create.return_value = mock_instance
-
-        mock_controller.check_health.return_value = HealthCheck(
-            status=HealthStatus.HEALTHY,
-            sandbox_id="sb-new",
-        )
+        mock_controller.check_health.return_value = _HC_HEALTHY_NEW
 
         result = lifecycle.migrate("sb-old", "https://github.com/org/brain", "tok")
         assert result.success is True
@@ -495,12 +757,11 @@ class TestMigrate:
     ) -> None:
         """Migration blocked when daily limit reached."""
         lifecycle._migrations_today = 10
-        lifecycle._last_migration_date = _today_str()
+        lifecycle._last_migration_day = _FROZEN_DAY
         result = lifecycle.migrate("sb-old", "url", "tok")
         assert result.success is False
         assert "limit" in result.error
 
-    @patch("social_agent.lifecycle.Sandbox")
     def test_migration_create_failure(
         self,
         mock_sandbox_cls: MagicMock,
@@ -511,8 +772,8 @@ class TestMigrate:
         result = lifecycle.migrate("sb-old", "url", "tok")
         assert result.success is False
         assert "create" in result.error.lower()
+        assert lifecycle.migrations_today == 0  # Reservation given back
 
-    @patch("social_agent.lifecycle.Sandbox")
     def test_migration_deploy_failure_cleans_up(
         self,
         mock_sandbox_cls: MagicMock,
@@ -520,17 +781,13 @@ class TestMigrate:
         mock_controller: MagicMock,
     ) -> None:
         """Failed deploy kills the successor sandbox."""
-        mock_instance = MagicMock()
-        mock_instance.sandbox_id = "sb-new"
-        mock_sandbox_cls.create.return_value = mock_instance
         mock_controller.run_command.side_effect = RuntimeError("fail")
 
         result = lifecycle.migrate("sb-old", "url", "tok")
         assert result.success is False
         # Verify the successor was cleaned up
-        mock_controller.kill.assert_called_with("sb-new")
+        assert mock_controller.kill.call_args == mock_call("sb-new")
 
-    @patch("social_agent.lifecycle.Sandbox")
     def test_migration_verify_failure_cleans_up(
         self,
         mock_sandbox_cls: MagicMock,
@@ -538,19 +795,15 @@ class TestMigrate:
         mock_controller: MagicMock,
     ) -> None:
         """Failed verification kills the successor sandbox."""
-        mock_instance = MagicMock()
-        mock_instance.sandbox_id = "sb-new"
-        mock_sandbox_cls.create.return_value = mock_instance
-        mock_controller.check_health.return_value = HealthCheck(
-            status=HealthStatus.UNKNOWN,
-            sandbox_id="sb-new",
-        )
+        mock_controller.check_health.return_value = _HC_UNKNOWN_NEW
 
         result = lifecycle.migrate("sb-old", "url", "tok")
         assert result.success is False
         assert "health" in result.error.lower() or "verification" in result.error.lower()
+        # The old sandbox is never touched before the successor is verified
+        assert mock_controller.kill.call_args_list == [mock_call("sb-new")]
+        assert mock_controller.inject_override.call_count == 0
 
-    @patch("social_agent.lifecycle.Sandbox")
     def test_migration_shutdown_failure_still_succeeds(
         self,
         mock_sandbox_cls: MagicMock,
@@ -558,14 +811,7 @@ class TestMigrate:
         mock_controller: MagicMock,
     ) -> None:
         """Migration succeeds even if old sandbox shutdown fails."""
-        mock_instance = MagicMock()
-        mock_instance.sandbox_id = "sb-new"
-        mock_sandbox_cls.create.return_value = mock_instance
-
-        mock_controller.check_health.return_value = HealthCheck(
-            status=HealthStatus.HEALTHY,
-            sandbox_id="sb-new",
-        )
+        mock_controller.check_health.return_value = _HC_HEALTHY_NEW
         # Old sandbox kill fails
         mock_controller.kill.return_value = False
 
@@ -574,6 +820,92 @@ class TestMigrate:
         assert result.success is True
         assert result.new_sandbox_id == "sb-new"
 
+    def test_concurrent_migration_limit(
+        self,
+        mock_sandbox_cls: MagicMock,
+        lifecycle: LifecycleManager,
+        mock_controller: MagicMock,
+    ) -> None:
+        """A second migrate() waits until the in-flight one finishes."""
+        entered = threading.Event()
+        release = threading.Event()
+
+        def slow_create(**_: Any) -> MagicMock:
+            entered.set()
+            release.wait(timeout=5)
+            instance = MagicMock()
+            instance.sandbox_id = "sb-new"
+            return instance
+
+        mock_sandbox_cls.create.side_effect = slow_create
+        mock_controller.check_health.return_value = _HC_HEALTHY_NEW
+        results: list[MigrationResult] = []
+
+        def run() -> None:
+            results.append(lifecycle.migrate("sb-old", "https://github.com/org/brain", "tok"))
+
+        first = threading.Thread(target=run)
+        second = threading.Thread(target=run)
+        first.start()
+        assert entered.wait(timeout=5)
+        second.start()
+        second.join(timeout=0.2)
+
+        assert second.is_alive()  # Blocked on the migration slot
+        assert mock_sandbox_cls.create.call_count == 1
+
+        release.set()
+        first.join(timeout=5)
+        second.join(timeout=5)
+        assert mock_sandbox_cls.create.call_count == 2
+        assert [r.success for r in results] == [True, True]
+
+    def test_parallel_migrations_respect_daily_limit(
+        self,
+        mock_sandbox_cls: MagicMock,
+        mock_controller: MagicMock,
+    ) -> None:
+        """With two slots and one migration left today, only one runs."""
+        manager = LifecycleManager(
+            controller=mock_controller,
+            e2b_api_key="test_key",
+            verify_timeout_s=1,
+            max_migrations_per_day=1,
+            max_concurrent_migrations=2,
+            clock=lambda: _FROZEN_NOW,
+        )
+        entered = threading.Event()
+        release = threading.Event()
+
+        def slow_create(**_: Any) -> MagicMock:
+            entered.set()
+            release.wait(timeout=5)
+            instance = MagicMock()
+            instance.sandbox_id = "sb-new"
+            return instance
+
+        mock_sandbox_cls.create.side_effect = slow_create
+        mock_controller.check_health.return_value = _HC_HEALTHY_NEW
+
+        results: list[MigrationResult] = []
+        first = threading.Thread(
+            target=lambda: results.append(
+                manager.migrate("sb-old", "https://github.com/org/brain", "tok"),
+            ),
+        )
+        first.start()
+        assert entered.wait(timeout=5)
+        # The in-flight migration already holds today's only count
+        second = manager.migrate("sb-old", "https://github.com/org/brain", "tok")
+        assert second.success is False
+        assert "limit" in second.error.lower()
+
+        release.set()
+        first.join(timeout=5)
+        assert [r.success for r in results] == [True]
+        assert mock_sandbox_cls.create.call_count == 1
+        assert manager.migrations_today == 1
+
 
 # --- Cleanup tests ---
 
@@ -588,13 +920,13 @@ class TestCleanupOrphans:
     ) -> None:
         """Cleanup kills all sandboxes except the keeper."""
         mock_controller.list_sandboxes.return_value = [
-            SandboxInfo(sandbox_id="sb-keep"),
-            SandboxInfo(sandbox_id="sb-orphan-1"),
-            SandboxInfo(sandbox_id="sb-orphan-2"),
+            _SB["sb-keep"],
+            _SB["sb-orphan-1"],
+            _SB["sb-orphan-2"],
         ]
         killed = lifecycle.cleanup_orphans("sb-keep")
-        assert len(killed) == 2
-        assert "sb-keep" not in killed
+        assert killed == ["sb-orphan-1", "sb-orphan-2"]
+        mock_controller.bulk_kill.assert_called_once_with(["sb-orphan-1", "sb-orphan-2"])
 
     def test_cleanup_empty(
         self,
@@ -605,6 +937,7 @@ class TestCleanupOrphans:
         mock_controller.list_sandboxes.return_value = []
         killed = lifecycle.cleanup_orphans("sb-keep")
         assert killed == []
+        mock_controller.bulk_kill.assert_not_called()
 
     def test_cleanup_kill_failure(
         self,
@@ -613,19 +946,30 @@ class TestCleanupOrphans:
     ) -> None:
         """Failed kill not included in result."""
         mock_controller.list_sandboxes.return_value = [
-            SandboxInfo(sandbox_id="sb-keep"),
-            SandboxInfo(sandbox_id="sb-orphan"),
+            _SB["sb-keep"],
+            _SB["sb-orphan"],
         ]
-        mock_controller.kill.return_value = False
+        mock_controller.bulk_kill.side_effect = lambda ids: []
         killed = lifecycle.cleanup_orphans("sb-keep")
         assert killed == []
 
-
-# --- Helper ---
-
-
-def _today_str() -> str:
-    """Get today's date string."""
-    from datetime import UTC, datetime
-
-    return datetime.now(tz=UTC).strftime("%Y-%m-%d")
+    @pytest.mark.parametrize(
+        "bulk_kill",
+        [
+            pytest.param(list, id="killed"),
+            pytest.param(RuntimeError("E2B down"), id="raised"),
+        ],
+    )
+    def test_cleanup_invalidates_listing(
+        self,
+        lifecycle: LifecycleManager,
+        mock_controller: MagicMock,
+        bulk_kill: object,
+    ) -> None:
+        """The next listing is fetched fresh after a cleanup, even a failed one."""
+        mock_controller.list_sandboxes.return_value = [_SB["sb-keep"], _SB["sb-orphan"]]
+        mock_controller.bulk_kill.side_effect = bulk_kill
+        with contextlib.suppress(RuntimeError):
+            lifecycle.cleanup_orphans("sb-keep")
+        lifecycle.check_concurrent_sandboxes()
+        assert mock_controller.list_sandboxes.call_count == 2
@@ -6,6 +6,8 @@ All tests use mocked SandboxClient — no real E2B or Moltbook calls.
 from __future__ import annotations
 
 import json
+import re
+from typing import Any
 from unittest.mock import MagicMock
 
 import pytest
@@ -16,23 +18,32 @@ from social_agent.moltbook import (
     _build_http_code,
     _parse_response,
 )
-from social_agent.sandbox import ExecutionResult
+from social_agent.sandbox import ExecutionResult, SandboxClient
 
 # --- Fixtures ---
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_sandbox() -> MagicMock:
-    """Mock SandboxClient."""
-    return MagicMock()
+    """Mock SandboxClient, shared by the module and reset per test.
 
+    Specced against SandboxClient so a misspelled method fails loudly.
+    """
+    return MagicMock(spec=SandboxClient)
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def client(mock_sandbox: MagicMock) -> MoltbookClient:
-    """MoltbookClient with mocked sandbox."""
+    """MoltbookClient with mocked sandbox (stateless, so safe to share)."""
     return MoltbookClient(sandbox=mock_sandbox, api_key="test_api_key")
 
 
+@pytest.fixture(autouse=True)
+def _reset_sandbox(mock_sandbox: MagicMock) -> None:
+    """Clear calls, return values and side effects left by the last test."""
+    mock_sandbox.reset_mock(return_value=True, side_effect=True)
+
+
 def _sandbox_success(data: dict[str, object]) -> ExecutionResult:
     """Create a successful sandbox result with JSON output."""
     return ExecutionResult(
@@ -46,63 +57,91 @@ def _sandbox_error(error: str) -> ExecutionResult:
     return ExecutionResult(success=False, error=error)
 
 
-# --- _build_http_code ---
+# Results shared by several tests, built once at import
+_OK_EMPTY_LIST = _sandbox_success({"status": 200, "body": []})
+_OK_EMPTY = _sandbox_success({"status": 200, "body": {}})
+_CREATED_EMPTY = _sandbox_success({"status": 201, "body": {}})
+_POST_CREATED = _sandbox_success({"status": 201, "body": {"id": "1"}})
+_POST_NOT_FOUND = _sandbox_success({"status": 404, "body": "Post not found"})
+_ERR_CRASH = _sandbox_error("sandbox crashed")
 
+# Token in the generated Authorization header (stops at the closing quote).
+_BEARER_RE = re.compile(r"Bearer ([^'\"\s]+)")
 
-def test_build_http_code_get() -> None:
-    """GET request code includes URL, headers, and params."""
-    code = _build_http_code("get", "/test", "key123", params={"limit": 5})
-    assert "httpx.get(" in code
-    assert "/test" in code
-    assert "Bearer key123" in code
-    assert "'limit': 5" in code
 
-
-def test_build_http_code_post_with_body() -> None:
-    """POST request code includes JSON body."""
-    code = _build_http_code("post", "/test", "key123", body={"title": "hi"})
-    assert "httpx.post(" in code
-    assert "'title': 'hi'" in code
+# --- _build_http_code ---
 
 
-def test_build_http_code_has_error_handling() -> None:
-    """Generated code handles exceptions."""
-    code = _build_http_code("get", "/test", "key123")
-    assert "except Exception" in code
-    assert '"error"' in code
+@pytest.mark.parametrize(
+    ("method", "kwargs", "fragments"),
+    [
+        pytest.param(
+            "get", {"params": {"limit": 5}},
+            ("httpx.get(", "/test", "Bearer key123", "'limit': 5"),
+            id="get-with-params",
+        ),
+        pytest.param(
+            "post", {"body": {"title": "hi"}},
+            ("httpx.post(", "'title': 'hi'"),
+            id="post-with-body",
+        ),
+        pytest.param(
+            "get", {}, ("except Exception", '"error"'),
+            id="error-handling",
+        ),
+    ],
+)
+def test_build_http_code(
+    method: str, kwargs: dict[str, Any], fragments: tuple[str, ...]
+) -> None:
+    """Generated code carries method, URL, auth, payload and error handling."""
+    code = _build_http_code(method, "/test", "key123", **kwargs)
+    for fragment in fragments:
+        assert fragment in code
 
 
 # --- _parse_response ---
 
 
-def test_parse_response_valid_json() -> None:
-    """Parses valid JSON output."""
-    result = _parse_response('{"status": 200, "body": {"id": "1"}}')
-    assert result["status"] == 200
-
-
-def test_parse_response_multiline() -> None:
-    """Parses JSON from last line when there's extra output."""
-    result = _parse_response('Installing...\nDone\n{"status": 200, "body": []}')
-    assert result["status"] == 200
-
-
-def test_parse_response_none() -> None:
-    """Returns error for None input."""
-    result = _parse_response(None)
-    assert "error" in result
-
-
-def test_parse_response_no_json() -> None:
-    """Returns error when no JSON found."""
-    result = _parse_response("just plain text")
-    assert "error" in result
+@pytest.mark.parametrize(
+    "output",
+    [
+        pytest.param('{"status": 200, "body": {"id": "1"}}', id="valid-json"),
+        pytest.param(
+            'Installing...\nDone\n{"status": 200, "body": []}', id="multiline"
+        ),
+        pytest.param(
+            '{"status": 200, "body": {}}\r\nwarning: cache miss\n', id="trailing-noise"
+        ),
+        pytest.param(
+            'Downloading 45%\rDownloading 100%\r{"status": 200, "body": []}',
+            id="carriage-return-progress",
+        ),
+    ],
+)
+def test_parse_response_success(output: str) -> None:
+    """Parses JSON output, taking the last line when there's extra output."""
+    assert _parse_response(output)["status"] == 200
+
+
+@pytest.mark.parametrize(
+    "output",
+    [
+        pytest.param(None, id="none"),
+        pytest.param("just plain text", id="no-json"),
+        pytest.param("{broken json", id="invalid-json"),
+    ],
+)
+def test_parse_response_error(output: str | None) -> None:
+    """Returns an error for missing, non-JSON or malformed output."""
+    assert "error" in _parse_response(output)
 
 
-def test_parse_response_invalid_json() -> None:
-    """Returns error for invalid JSON."""
-    result = _parse_response("{broken json")
-    assert "error" in result
+def test_parse_response_large_output_without_json() -> None:
+    """Output with no JSON line at all is reported, truncated to 200 chars."""
+    output = "progress line\n" * 300_000 + "done\r" * 10_000
+    result = _parse_response(output)
+    assert result == {"error": f"No JSON in output: {output[:200]}"}
 
 
 # --- check_status ---
@@ -136,7 +175,7 @@ def test_check_status_sandbox_error(
     client: MoltbookClient, mock_sandbox: MagicMock
 ) -> None:
     """Returns unknown status on sandbox error."""
-    mock_sandbox.execute_code.return_value = _sandbox_error("sandbox crashed")
+    mock_sandbox.execute_code.return_value = _ERR_CRASH
     result = client.check_status()
     assert result["status"] == "unknown"
     assert "error" in result
@@ -163,7 +202,7 @@ def test_register_sandbox_failure(
     client: MoltbookClient, mock_sandbox: MagicMock
 ) -> None:
     """Registration fails gracefully on sandbox error."""
-    mock_sandbox.execute_code.return_value = _sandbox_error("sandbox crashed")
+    mock_sandbox.execute_code.return_value = _ERR_CRASH
     result = client.register("Nathan", "Agent")
     assert result.success is False
     assert "sandbox crashed" in (result.error or "")
@@ -204,6 +243,14 @@ def test_get_feed_success(
     assert result.posts[0].submolt == "agents"
 
 
+def test_moltbook_post_frozen() -> None:
+    """MoltbookPost is immutable and slotted."""
+    post = MoltbookPost(id="1", title="Hello", body="World", submolt="agents", author="bot1")
+    with pytest.raises(AttributeError):
+        post.title = "Changed"  # type: ignore[misc]
+    assert not hasattr(post, "__dict__")
+
+
 def test_get_feed_global(
     client: MoltbookClient, mock_sandbox: MagicMock
 ) -> None:
@@ -224,9 +271,7 @@ def test_get_feed_empty(
     client: MoltbookClient, mock_sandbox: MagicMock
 ) -> None:
     """Empty feed returns empty list."""
-    mock_sandbox.execute_code.return_value = _sandbox_success({
-        "status": 200, "body": []
-    })
+    mock_sandbox.execute_code.return_value = _OK_EMPTY_LIST
     result = client.get_feed("agents")
     assert result.success is True
     assert result.posts == []
@@ -259,39 +304,30 @@ def test_create_post_success(
     assert result.post_id == "post-42"
 
 
-def test_create_post_title_too_short(
-    client: MoltbookClient, mock_sandbox: MagicMock
-) -> None:
-    """Title < 10 chars rejected locally (no API call)."""
-    result = client.create_post("Short", "Body", "agents")
-    assert result.success is False
-    assert "10-120" in (result.error or "")
-    mock_sandbox.execute_code.assert_not_called()
-
-
-def test_create_post_title_too_long(
-    client: MoltbookClient, mock_sandbox: MagicMock
+@pytest.mark.parametrize(
+    "title",
+    ["", "X", "Short", "X" * 9, "X" * 121, "X" * 200],
+    ids=["empty", "one", "short", "below-min", "above-max", "long"],
+)
+def test_create_post_title_invalid(
+    client: MoltbookClient, mock_sandbox: MagicMock, title: str
 ) -> None:
-    """Title > 120 chars rejected locally."""
-    result = client.create_post("X" * 121, "Body", "agents")
+    """Titles outside 10-120 chars are rejected locally (no API call)."""
+    result = client.create_post(title, "Body", "agents")
     assert result.success is False
     assert "10-120" in (result.error or "")
     mock_sandbox.execute_code.assert_not_called()
 
 
+@pytest.mark.parametrize("length", [10, 50, 120], ids=["min", "mid", "max"])
 def test_create_post_title_boundary(
-    client: MoltbookClient, mock_sandbox: MagicMock
+    client: MoltbookClient, mock_sandbox: MagicMock, length: int
 ) -> None:
-    """Title at exactly 10 and 120 chars accepted."""
-    mock_sandbox.execute_code.return_value = _sandbox_success({
-        "status": 201, "body": {"id": "1"}
-    })
-    # 10 chars
-    result_10 = client.create_post("A" * 10, "Body", "agents")
-    assert result_10.success is True
-    # 120 chars
-    result_120 = client.create_post("B" * 120, "Body", "agents")
-    assert result_120.success is True
+    """Titles at both bounds (10 and 120 chars) and in between are accepted."""
+    mock_sandbox.execute_code.return_value = _POST_CREATED
+    result = client.create_post("A" * length, "Body", "agents")
+    assert result.success is True
+    mock_sandbox.execute_code.assert_called_once()
 
 
 def test_create_post_rate_limited(
@@ -325,9 +361,7 @@ def test_reply_not_found(
     client: MoltbookClient, mock_sandbox: MagicMock
 ) -> None:
     """Reply to non-existent post reports error."""
-    mock_sandbox.execute_code.return_value = _sandbox_success({
-        "status": 404, "body": "Post not found"
-    })
+    mock_sandbox.execute_code.return_value = _POST_NOT_FOUND
     result = client.reply("nonexistent", "Reply text")
     assert result.success is False
     assert "404" in (result.error or "")
@@ -395,13 +429,13 @@ def test_heartbeat_failure(
 def test_auth_header_in_generated_code(mock_sandbox: MagicMock) -> None:
     """API key is included in generated code as Bearer token."""
     client = MoltbookClient(sandbox=mock_sandbox, api_key="secret_key_123")
-    mock_sandbox.execute_code.return_value = _sandbox_success({
-        "status": 200, "body": []
-    })
+    mock_sandbox.execute_code.return_value = _OK_EMPTY_LIST
     client.get_feed("agents")
 
     call_args = mock_sandbox.execute_code.call_args[0][0]
-    assert "Bearer secret_key_123" in call_args
+    match = _BEARER_RE.search(call_args)
+    assert match is not None
+    assert match.group(1) == "secret_key_123"
 
 
 # --- upvote_post ---
@@ -411,9 +445,7 @@ def test_upvote_post_success(
     client: MoltbookClient, mock_sandbox: MagicMock
 ) -> None:
     """Upvote returns success with post_id."""
-    mock_sandbox.execute_code.return_value = _sandbox_success({
-        "status": 200, "body": {}
-    })
+    mock_sandbox.execute_code.return_value = _OK_EMPTY
     result = client.upvote_post("post-42")
     assert result.success is True
     assert result.post_id == "post-42"
@@ -423,9 +455,7 @@ def test_upvote_post_api_failure(
     client: MoltbookClient, mock_sandbox: MagicMock
 ) -> None:
     """Upvote API failure reports error."""
-    mock_sandbox.execute_code.return_value = _sandbox_success({
-        "status": 404, "body": "Post not found"
-    })
+    mock_sandbox.execute_code.return_value = _POST_NOT_FOUND
     result = client.upvote_post("nonexistent")
     assert result.success is False
     assert "404" in (result.error or "")
@@ -438,9 +468,7 @@ def test_downvote_post_success(
     client: MoltbookClient, mock_sandbox: MagicMock
 ) -> None:
     """Downvote returns success with post_id."""
-    mock_sandbox.execute_code.return_value = _sandbox_success({
-        "status": 200, "body": {}
-    })
+    mock_sandbox.execute_code.return_value = _OK_EMPTY
     result = client.downvote_post("post-42")
     assert result.success is True
     assert result.post_id == "post-42"
@@ -465,9 +493,7 @@ def test_follow_agent_success(
     client: MoltbookClient, mock_sandbox: MagicMock
 ) -> None:
     """Follow agent returns success with agent name as post_id."""
-    mock_sandbox.execute_code.return_value = _sandbox_success({
-        "status": 201, "body": {}
-    })
+    mock_sandbox.execute_code.return_value = _CREATED_EMPTY
     result = client.follow_agent("some-agent")
     assert result.success is True
     assert result.post_id == "some-agent"
@@ -492,9 +518,7 @@ def test_subscribe_submolt_success(
     client: MoltbookClient, mock_sandbox: MagicMock
 ) -> None:
     """Subscribe submolt returns success with submolt name as post_id."""
-    mock_sandbox.execute_code.return_value = _sandbox_success({
-        "status": 201, "body": {}
-    })
+    mock_sandbox.execute_code.return_value = _CREATED_EMPTY
     result = client.subscribe_submolt("agents")
     assert result.success is True
     assert result.post_id == "agents"
@@ -2,13 +2,16 @@
 
 from __future__ import annotations
 
+import pytest
+
 from social_agent.prompts import NAMESPACES, PROMPTS
 
 
-def test_all_namespaces_have_prompts() -> None:
-    """Every namespace in NAMESPACES has a corresponding prompt."""
-    for ns in NAMESPACES:
-        assert ns in PROMPTS, f"Missing prompt for namespace: {ns}"
+@pytest.mark.parametrize("ns", NAMESPACES, ids=NAMESPACES)
+def test_namespace_has_prompt(ns: str) -> None:
+    """Every namespace has a prompt with substantive content."""
+    assert ns in PROMPTS, f"Missing prompt for namespace: {ns}"
+    assert len(PROMPTS[ns].strip()) > 50, f"Prompt for {ns} is too short"
 
 
 def test_five_namespaces() -> None:
@@ -28,12 +31,6 @@ def test_expected_namespaces() -> None:
     assert set(NAMESPACES) == expected
 
 
-def test_prompts_not_empty() -> None:
-    """Every prompt has substantive content."""
-    for ns, prompt in PROMPTS.items():
-        assert len(prompt.strip()) > 50, f"Prompt for {ns} is too short"
-
-
 def test_namespaces_matches_prompts_keys() -> None:
     """NAMESPACES list is exactly the PROMPTS keys (same order)."""
     assert list(PROMPTS.keys()) == NAMESPACES
@@ -5,7 +5,8 @@ All tests use mocks — no real E2B sandbox created.
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
 import pytest
 from pydantic import SecretStr
@@ -15,9 +16,9 @@ from social_agent.sandbox import BashResult, ExecutionResult, SandboxClient
 # --- Fixtures ---
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def api_key() -> SecretStr:
-    """Test API key."""
+    """Test API key (immutable, so built once for the session)."""
     return SecretStr("e2b_test_key")
 
 
@@ -29,6 +30,39 @@ def mock_sandbox() -> MagicMock:
     return sandbox
 
 
+@pytest.fixture
+def client(api_key: SecretStr) -> SandboxClient:
+    """SandboxClient with the test key (the Sandbox class is mocked)."""
+    return SandboxClient(api_key=api_key)
+
+
+@pytest.fixture(autouse=True)
+def mock_sandbox_cls(
+    monkeypatch: pytest.MonkeyPatch, mock_sandbox: MagicMock
+) -> MagicMock:
+    """Replace the E2B Sandbox class so no test can reach the real API."""
+    sandbox_cls = MagicMock()
+    sandbox_cls.create.return_value = mock_sandbox
+    monkeypatch.setattr("social_agent.sandbox.Sandbox", sandbox_cls)
+    return sandbox_cls
+
+
+def _execution(
+    stdout: list[str] | None = None,
+    stderr: list[str] | None = None,
+    text: str | None = None,
+    error: SimpleNamespace | None = None,
+) -> SimpleNamespace:
+    """Create a run_code() result (a plain namespace; no call tracking needed)."""
+    logs = SimpleNamespace(stdout=stdout or [], stderr=stderr or [])
+    return SimpleNamespace(error=error, logs=logs, text=text)
+
+
+def _cmd_result(stdout: str = "", stderr: str = "", exit_code: int = 0) -> SimpleNamespace:
+    """Create a commands.run() result."""
+    return SimpleNamespace(stdout=stdout, stderr=stderr, exit_code=exit_code)
+
+
 # --- ExecutionResult ---
 
 
@@ -96,13 +130,11 @@ def test_bash_result_frozen() -> None:
 # --- SandboxClient lifecycle ---
 
 
-def test_client_not_running_initially(api_key: SecretStr) -> None:
+def test_client_not_running_initially(client: SandboxClient) -> None:
     """Client starts without a sandbox."""
-    client = SandboxClient(api_key=api_key)
     assert client.is_running is False
 
 
-@patch("social_agent.sandbox.Sandbox")
 def test_start_creates_sandbox(mock_sandbox_cls: MagicMock, api_key: SecretStr) -> None:
     """start() creates an E2B sandbox via Sandbox.create()."""
     mock_sandbox_cls.create.return_value = MagicMock(sandbox_id="sb-1")
@@ -117,11 +149,9 @@ def test_start_creates_sandbox(mock_sandbox_cls: MagicMock, api_key: SecretStr)
     )
 
 
-@patch("social_agent.sandbox.Sandbox")
-def test_start_idempotent(mock_sandbox_cls: MagicMock, api_key: SecretStr) -> None:
+def test_start_idempotent(mock_sandbox_cls: MagicMock, client: SandboxClient) -> None:
     """Calling start() twice doesn't create a second sandbox."""
     mock_sandbox_cls.create.return_value = MagicMock(sandbox_id="sb-1")
-    client = SandboxClient(api_key=api_key)
 
     client.start()
     client.start()
@@ -129,12 +159,10 @@ def test_start_idempotent(mock_sandbox_cls: MagicMock, api_key: SecretStr) -> No
     mock_sandbox_cls.create.assert_called_once()
 
 
-@patch("social_agent.sandbox.Sandbox")
-def test_stop_kills_sandbox(mock_sandbox_cls: MagicMock, api_key: SecretStr) -> None:
+def test_stop_kills_sandbox(mock_sandbox_cls: MagicMock, client: SandboxClient) -> None:
     """stop() kills the sandbox and resets state."""
     mock_instance = MagicMock(sandbox_id="sb-1")
     mock_sandbox_cls.create.return_value = mock_instance
-    client = SandboxClient(api_key=api_key)
 
     client.start()
     client.stop()
@@ -143,9 +171,8 @@ def test_stop_kills_sandbox(mock_sandbox_cls: MagicMock, api_key: SecretStr) ->
     assert client.is_running is False
 
 
-def test_stop_without_start(api_key: SecretStr) -> None:
+def test_stop_without_start(client: SandboxClient) -> None:
     """stop() without start() is a no-op."""
-    client = SandboxClient(api_key=api_key)
     client.stop()  # Should not raise
     assert client.is_running is False
 
@@ -153,7 +180,6 @@ def test_stop_without_start(api_key: SecretStr) -> None:
 # --- Context manager ---
 
 
-@patch("social_agent.sandbox.Sandbox")
 def test_context_manager(mock_sandbox_cls: MagicMock, api_key: SecretStr) -> None:
     """Context manager starts and stops the sandbox."""
     mock_instance = MagicMock(sandbox_id="sb-1")
@@ -168,22 +194,16 @@ def test_context_manager(mock_sandbox_cls: MagicMock, api_key: SecretStr) -> Non
 # --- execute_code ---
 
 
-@patch("social_agent.sandbox.Sandbox")
 def test_execute_code_success(
-    mock_sandbox_cls: MagicMock, api_key: SecretStr
+    mock_sandbox_cls: MagicMock, client: SandboxClient
 ) -> None:
     """execute_code returns structured result on success."""
-    mock_execution = MagicMock()
-    mock_execution.error = None
-    mock_execution.logs.stdout = ["hello"]
-    mock_execution.logs.stderr = []
-    mock_execution.text = "hello"
+    mock_execution = _execution(stdout=["hello"], text="hello")
 
     mock_instance = MagicMock(sandbox_id="sb-1")
     mock_instance.run_code.return_value = mock_execution
     mock_sandbox_cls.create.return_value = mock_instance
 
-    client = SandboxClient(api_key=api_key)
     result = client.execute_code("print('hello')")
 
     assert result.success is True
@@ -192,26 +212,18 @@ def test_execute_code_success(
     assert result.error is None
 
 
-@patch("social_agent.sandbox.Sandbox")
 def test_execute_code_with_error(
-    mock_sandbox_cls: MagicMock, api_key: SecretStr
+    mock_sandbox_cls: MagicMock, client: SandboxClient
 ) -> None:
     """execute_code captures execution errors."""
-    mock_error = MagicMock()
-    mock_error.name = "NameError"
-    mock_error.value = "name 'x' is not defined"
+    mock_error = SimpleNamespace(name="NameError", value="name 'x' is not defined")
 
-    mock_execution = MagicMock()
-    mock_execution.error = mock_error
-    mock_execution.logs.stdout = []
-    mock_execution.logs.stderr = ["Traceback..."]
-    mock_execution.text = None
+    mock_execution = _execution(stderr=["Traceback..."], error=mock_error)
 
     mock_instance = MagicMock(sandbox_id="sb-1")
     mock_instance.run_code.return_value = mock_execution
     mock_sandbox_cls.create.return_value = mock_instance
 
-    client = SandboxClient(api_key=api_key)
     result = client.execute_code("print(x)")
 
     assert result.success is False
@@ -219,16 +231,14 @@ def test_execute_code_with_error(
     assert result.stderr == ["Traceback..."]
 
 
-@patch("social_agent.sandbox.Sandbox")
 def test_execute_code_exception(
-    mock_sandbox_cls: MagicMock, api_key: SecretStr
+    mock_sandbox_cls: MagicMock, client: SandboxClient
 ) -> None:
     """execute_code handles SDK exceptions gracefully."""
     mock_instance = MagicMock(sandbox_id="sb-1")
     mock_instance.run_code.side_effect = ConnectionError("network down")
     mock_sandbox_cls.create.return_value = mock_instance
 
-    client = SandboxClient(api_key=api_key)
     result = client.execute_code("1 + 1")
 
     assert result.success is False
@@ -238,19 +248,14 @@ def test_execute_code_exception(
 # --- run_bash ---
 
 
-@patch("social_agent.sandbox.Sandbox")
-def test_run_bash_success(mock_sandbox_cls: MagicMock, api_key: SecretStr) -> None:
+def test_run_bash_success(mock_sandbox_cls: MagicMock, client: SandboxClient) -> None:
     """run_bash returns structured result on success."""
-    mock_cmd_result = MagicMock()
-    mock_cmd_result.stdout = "file1.txt\nfile2.txt"
-    mock_cmd_result.stderr = ""
-    mock_cmd_result.exit_code = 0
+    mock_cmd_result = _cmd_result(stdout="file1.txt\nfile2.txt")
 
     mock_instance = MagicMock(sandbox_id="sb-1")
     mock_instance.commands.run.return_value = mock_cmd_result
     mock_sandbox_cls.create.return_value = mock_instance
 
-    client = SandboxClient(api_key=api_key)
     result = client.run_bash("ls")
 
     assert result.success is True
@@ -258,19 +263,14 @@ def test_run_bash_success(mock_sandbox_cls: MagicMock, api_key: SecretStr) -> No
     assert result.exit_code == 0
 
 
-@patch("social_agent.sandbox.Sandbox")
-def test_run_bash_nonzero_exit(mock_sandbox_cls: MagicMock, api_key: SecretStr) -> None:
+def test_run_bash_nonzero_exit(mock_sandbox_cls: MagicMock, client: SandboxClient) -> None:
     """run_bash marks non-zero exit codes as failure."""
-    mock_cmd_result = MagicMock()
-    mock_cmd_result.stdout = ""
-    mock_cmd_result.stderr = "No such file"
-    mock_cmd_result.exit_code = 1
+    mock_cmd_result = _cmd_result(stderr="No such file", exit_code=1)
 
     mock_instance = MagicMock(sandbox_id="sb-1")
     mock_instance.commands.run.return_value = mock_cmd_result
     mock_sandbox_cls.create.return_value = mock_instance
 
-    client = SandboxClient(api_key=api_key)
     result = client.run_bash("cat missing.txt")
 
     assert result.success is False
@@ -278,14 +278,12 @@ def test_run_bash_nonzero_exit(mock_sandbox_cls: MagicMock, api_key: SecretStr)
     assert result.stderr == "No such file"
 
 
-@patch("social_agent.sandbox.Sandbox")
-def test_run_bash_exception(mock_sandbox_cls: MagicMock, api_key: SecretStr) -> None:
+def test_run_bash_exception(mock_sandbox_cls: MagicMock, client: SandboxClient) -> None:
     """run_bash handles SDK exceptions gracefully."""
     mock_instance = MagicMock(sandbox_id="sb-1")
     mock_instance.commands.run.side_effect = TimeoutError("timed out")
     mock_sandbox_cls.create.return_value = mock_instance
 
-    client = SandboxClient(api_key=api_key)
     result = client.run_bash("sleep 999")
 
     assert result.success is False
@@ -295,20 +293,14 @@ def test_run_bash_exception(mock_sandbox_cls: MagicMock, api_key: SecretStr) ->
 # --- Lazy init ---
 
 
-@patch("social_agent.sandbox.Sandbox")
-def test_lazy_init_on_execute(mock_sandbox_cls: MagicMock, api_key: SecretStr) -> None:
+def test_lazy_init_on_execute(mock_sandbox_cls: MagicMock, client: SandboxClient) -> None:
     """Sandbox is created on first execute_code, not at construction."""
-    mock_execution = MagicMock()
-    mock_execution.error = None
-    mock_execution.logs.stdout = []
-    mock_execution.logs.stderr = []
-    mock_execution.text = None
+    mock_execution = _execution()
 
     mock_instance = MagicMock(sandbox_id="sb-1")
     mock_instance.run_code.return_value = mock_execution
     mock_sandbox_cls.create.return_value = mock_instance
 
-    client = SandboxClient(api_key=api_key)
     assert client.is_running is False
 
     client.execute_code("pass")
@@ -316,19 +308,22 @@ def test_lazy_init_on_execute(mock_sandbox_cls: MagicMock, api_key: SecretStr) -
     mock_sandbox_cls.create.assert_called_once()
 
 
-@patch("social_agent.sandbox.Sandbox")
-def test_lazy_init_on_bash(mock_sandbox_cls: MagicMock, api_key: SecretStr) -> None:
+def test_blank_code_skips_sandbox(mock_sandbox_cls: MagicMock, client: SandboxClient) -> None:
+    """Blank code returns an empty success without creating a sandbox."""
+    result = client.execute_code("  \n\t")
+    assert result == ExecutionResult()
+    assert client.is_running is False
+    mock_sandbox_cls.create.assert_not_called()
+
+
+def test_lazy_init_on_bash(mock_sandbox_cls: MagicMock, client: SandboxClient) -> None:
     """Sandbox is created on first run_bash, not at construction."""
-    mock_cmd_result = MagicMock()
-    mock_cmd_result.stdout = ""
-    mock_cmd_result.stderr = ""
-    mock_cmd_result.exit_code = 0
+    mock_cmd_result = _cmd_result()
 
     mock_instance = MagicMock(sandbox_id="sb-1")
     mock_instance.commands.run.return_value = mock_cmd_result
     mock_sandbox_cls.create.return_value = mock_instance
 
-    client = SandboxClient(api_key=api_key)
     assert client.is_running is False
 
     client.run_bash("echo hi")
@@ -338,9 +333,8 @@ def test_lazy_init_on_bash(mock_sandbox_cls: MagicMock, api_key: SecretStr) -> N
 # --- Auto-recovery on sandbox timeout ---
 
 
-@patch("social_agent.sandbox.Sandbox")
 def test_execute_code_recovers_from_timeout(
-    mock_sandbox_cls: MagicMock, api_key: SecretStr
+    mock_sandbox_cls: MagicMock, client: SandboxClient
 ) -> None:
     """execute_code creates a new sandbox when the old one expires."""
     from e2b.exceptions import TimeoutException
@@ -352,18 +346,13 @@ def test_execute_code_recovers_from_timeout(
     )
 
     # Recovery sandbox works
-    mock_execution = MagicMock()
-    mock_execution.error = None
-    mock_execution.logs.stdout = ["ok"]
-    mock_execution.logs.stderr = []
-    mock_execution.text = "ok"
+    mock_execution = _execution(stdout=["ok"], text="ok")
 
     fresh = MagicMock(sandbox_id="sb-new")
     fresh.run_code.return_value = mock_execution
 
     mock_sandbox_cls.create.side_effect = [expired, fresh]
 
-    client = SandboxClient(api_key=api_key)
     result = client.execute_code("print('ok')")
 
     assert result.success is True
@@ -371,9 +360,8 @@ def test_execute_code_recovers_from_timeout(
     assert mock_sandbox_cls.create.call_count == 2
 
 
-@patch("social_agent.sandbox.Sandbox")
 def test_run_bash_recovers_from_timeout(
-    mock_sandbox_cls: MagicMock, api_key: SecretStr
+    mock_sandbox_cls: MagicMock, client: SandboxClient
 ) -> None:
     """run_bash creates a new sandbox when the old one expires."""
     from e2b.exceptions import TimeoutException
@@ -385,17 +373,13 @@ def test_run_bash_recovers_from_timeout(
     )
 
     # Recovery sandbox works
-    mock_cmd_result = MagicMock()
-    mock_cmd_result.stdout = "hi"
-    mock_cmd_result.stderr = ""
-    mock_cmd_result.exit_code = 0
+    mock_cmd_result = _cmd_result(stdout="hi")
 
     fresh = MagicMock(sandbox_id="sb-new")
     fresh.commands.run.return_value = mock_cmd_result
 
     mock_sandbox_cls.create.side_effect = [expired, fresh]
 
-    client = SandboxClient(api_key=api_key)
     result = client.run_bash("echo hi")
 
     assert result.success is True
@@ -403,16 +387,14 @@ def test_run_bash_recovers_from_timeout(
     assert mock_sandbox_cls.create.call_count == 2
 
 
-@patch("social_agent.sandbox.Sandbox")
 def test_execute_code_no_recovery_on_other_errors(
-    mock_sandbox_cls: MagicMock, api_key: SecretStr
+    mock_sandbox_cls: MagicMock, client: SandboxClient
 ) -> None:
     """execute_code does NOT retry on non-timeout exceptions."""
     mock_instance = MagicMock(sandbox_id="sb-1")
     mock_instance.run_code.side_effect = ConnectionError("network down")
     mock_sandbox_cls.create.return_value = mock_instance
 
-    client = SandboxClient(api_key=api_key)
     result = client.execute_code("1 + 1")
 
     assert result.success is False
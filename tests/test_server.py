@@ -3,23 +3,37 @@
 Tests HTTP endpoints with a real running server on localhost.
 Uses mocked SandboxController for sandbox operations.
 Follows boundary pattern: happy path, auth, errors.
+
+Every server binds port=0, so the module is safe under pytest-xdist:
+each worker that runs these tests starts its own shared server on its
+own free port. Keep new servers on port=0 (or unstarted) to keep it so.
 """
 
 from __future__ import annotations
 
 import json
-import time
-from typing import TYPE_CHECKING
-from unittest.mock import MagicMock
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
     from pathlib import Path
 
 import pytest
 
 from social_agent.control import HealthCheck, HealthStatus
 from social_agent.cost import CostTracker
-from social_agent.server import DashboardServer
+from social_agent.server import _HEALTH_CACHE_TTL_S, DashboardServer, _RequestHandler
+from tests.stubs import StubController
+
+# Canonical heartbeat reading
+_HEALTH_CHECK = HealthCheck(
+    sandbox_id="sbx_test",
+    status=HealthStatus.HEALTHY,
+    last_heartbeat="2026-02-16T12:00:00Z",
+    current_action="READ_FEED",
+    seconds_since_heartbeat=5.0,
+)
 
 
 def _make_request(
@@ -43,43 +57,44 @@ def _make_request(
 
     try:
         with urllib.request.urlopen(req) as resp:
-            body = json.loads(resp.read().decode("utf-8"))
+            body = json.loads(resp.read())
             return resp.status, body
     except urllib.error.HTTPError as e:
-        body = json.loads(e.read().decode("utf-8"))
+        body = json.loads(e.read())
         return e.code, body
 
 
 # --- Fixtures ---
 
 
-@pytest.fixture
-def mock_controller() -> MagicMock:
-    """Mock SandboxController."""
-    ctrl = MagicMock()
-    ctrl.check_health.return_value = HealthCheck(
-        sandbox_id="sbx_test",
-        status=HealthStatus.HEALTHY,
-        last_heartbeat="2026-02-16T12:00:00Z",
-        current_action="READ_FEED",
-        seconds_since_heartbeat=5.0,
-    )
-    ctrl.read_state.return_value = {
-        "cycle_count": 42,
-        "posts_today": 3,
-    }
-    ctrl.read_activity.return_value = [
+@pytest.fixture(scope="module")
+def mock_controller() -> StubController:
+    """Dashboard controller double, shared by the module."""
+    return StubController()
+
+
+@pytest.fixture(autouse=True)
+def _reset_controller(mock_controller: StubController) -> None:
+    """Restore canonical responses and clear calls left by the last test."""
+    mock_controller.health = _HEALTH_CHECK
+    mock_controller.state = {"cycle_count": 42, "posts_today": 3}
+    mock_controller.activity = [
         {"action": "READ_FEED", "success": True, "timestamp": "2026-02-16T12:00:00Z"},
         {"action": "REPLY", "success": True, "timestamp": "2026-02-16T12:01:00Z"},
     ]
-    ctrl.kill.return_value = True
-    return ctrl
+    mock_controller.calls.clear()
 
 
-@pytest.fixture
-def tmp_state(tmp_path: Path) -> Path:
-    """Create temporary state.json."""
-    state_path = tmp_path / "state.json"
+@pytest.fixture(scope="module")
+def server_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Directory for the module's shared state and log files."""
+    return tmp_path_factory.mktemp("server")
+
+
+@pytest.fixture(scope="module")
+def tmp_state(server_dir: Path) -> Path:
+    """Create temporary state.json (read-only for the server)."""
+    state_path = server_dir / "state.json"
     state_path.write_text(json.dumps({
         "cycle_count": 42,
         "posts_today": 3,
@@ -90,10 +105,10 @@ def tmp_state(tmp_path: Path) -> Path:
     return state_path
 
 
-@pytest.fixture
-def tmp_activity(tmp_path: Path) -> Path:
-    """Create temporary activity.jsonl."""
-    log_path = tmp_path / "logs" / "activity.jsonl"
+@pytest.fixture(scope="module")
+def tmp_activity(server_dir: Path) -> Path:
+    """Create temporary activity.jsonl (read-only for the server)."""
+    log_path = server_dir / "logs" / "activity.jsonl"
     log_path.parent.mkdir(parents=True, exist_ok=True)
     records = [
         {
@@ -120,30 +135,64 @@ def tmp_activity(tmp_path: Path) -> Path:
     return log_path
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def server(
-    mock_controller: MagicMock,
+    mock_controller: StubController,
     tmp_state: Path,
     tmp_activity: Path,
-    tmp_path: Path,
-) -> DashboardServer:
-    """Running dashboard server with mocked controller."""
+    server_dir: Path,
+) -> Iterator[DashboardServer]:
+    """Running dashboard server with mocked controller.
+
+    Shared by the module: the handlers keep no per-request state, and the
+    controller mock is reset before each test. Tests that need a different
+    configuration build their own server.
+    """
     srv = DashboardServer(
         sandbox_id="sbx_test",
         controller=mock_controller,
         state_path=tmp_state,
         activity_log_path=tmp_activity,
-        heartbeat_path=tmp_path / "heartbeat.json",
+        heartbeat_path=server_dir / "heartbeat.json",
         dashboard_token="test-secret-token",
         port=0,  # Let OS pick a free port
     )
+    # start() binds and listens before returning, so requests queue in the
+    # backlog until serve_forever picks them up — no readiness wait needed.
     srv.start()
-    # Wait for server to be ready
-    time.sleep(0.1)
     yield srv
     srv.stop()
 
 
+@pytest.fixture
+def make_server(
+    mock_controller: StubController,
+    tmp_state: Path,
+    tmp_activity: Path,
+    tmp_path: Path,
+) -> Callable[..., DashboardServer]:
+    """Factory for a test's own (unstarted) server; kwargs override defaults."""
+
+    def _make(**overrides: Any) -> DashboardServer:
+        kwargs: dict[str, Any] = {
+            "sandbox_id": "sbx_test",
+            "controller": mock_controller,
+            "state_path": tmp_state,
+            "activity_log_path": tmp_activity,
+            "heartbeat_path": tmp_path / "heartbeat.json",
+            "port": 0,
+        }
+        return DashboardServer(**(kwargs | overrides))
+
+    return _make
+
+
+@pytest.fixture(scope="module")
+def base_url(server: DashboardServer) -> str:
+    """Base URL of the shared server, formatted once per module."""
+    return _base_url(server)
+
+
 def _base_url(srv: DashboardServer) -> str:
     """Get base URL for server using the public port property."""
     return f"http://127.0.0.1:{srv.port}"
@@ -156,10 +205,10 @@ class TestStatus:
     """Tests for GET /api/status."""
 
     def test_status_returns_health_and_state(
-        self, server: DashboardServer
+        self, base_url: str
     ) -> None:
         """Status includes health and state info."""
-        status, body = _make_request(f"{_base_url(server)}/api/status")
+        status, body = _make_request(f"{base_url}/api/status")
         assert status == 200
         assert body["sandbox_id"] == "sbx_test"
         assert body["health"]["status"] == "healthy"
@@ -174,35 +223,31 @@ class TestActivity:
     """Tests for GET /api/activity."""
 
     def test_activity_returns_records(
-        self, server: DashboardServer
+        self, base_url: str
     ) -> None:
         """Activity returns recent records."""
-        status, body = _make_request(f"{_base_url(server)}/api/activity")
+        status, body = _make_request(f"{base_url}/api/activity")
         assert status == 200
         assert body["count"] == 2
         assert len(body["records"]) == 2
 
     def test_activity_with_limit(
-        self, server: DashboardServer, mock_controller: MagicMock
+        self, base_url: str, mock_controller: StubController
     ) -> None:
         """Activity respects limit parameter."""
-        mock_controller.read_activity.return_value = [
-            {"action": "READ_FEED", "success": True}
-        ]
+        mock_controller.activity = [{"action": "READ_FEED", "success": True}]
         status, _body = _make_request(
-            f"{_base_url(server)}/api/activity?limit=1"
+            f"{base_url}/api/activity?limit=1"
         )
         assert status == 200
-        mock_controller.read_activity.assert_called_with(
-            "sbx_test", last_n=1
-        )
+        assert mock_controller.calls_to("read_activity")[-1] == ("sbx_test", 1)
 
     def test_activity_invalid_limit(
-        self, server: DashboardServer
+        self, base_url: str
     ) -> None:
         """Invalid limit falls back to default."""
         status, body = _make_request(
-            f"{_base_url(server)}/api/activity?limit=abc"
+            f"{base_url}/api/activity?limit=abc"
         )
         assert status == 200
         assert body["limit"] == 50  # default
@@ -215,10 +260,10 @@ class TestStats:
     """Tests for GET /api/stats."""
 
     def test_stats_returns_aggregates(
-        self, server: DashboardServer
+        self, base_url: str
     ) -> None:
         """Stats returns aggregated data."""
-        status, body = _make_request(f"{_base_url(server)}/api/stats")
+        status, body = _make_request(f"{base_url}/api/stats")
         assert status == 200
         assert "total_actions" in body
         assert "success_rate" in body
@@ -232,16 +277,34 @@ class TestHeartbeat:
     """Tests for GET /api/heartbeat."""
 
     def test_heartbeat_returns_health(
-        self, server: DashboardServer
+        self, base_url: str
     ) -> None:
         """Heartbeat returns health status."""
-        status, body = _make_request(f"{_base_url(server)}/api/heartbeat")
+        status, body = _make_request(f"{base_url}/api/heartbeat")
         assert status == 200
         assert body["status"] == "healthy"
         assert body["sandbox_id"] == "sbx_test"
         assert body["current_action"] == "READ_FEED"
 
 
+# --- Public endpoint smoke test ---
+
+
+class TestPublicEndpoints:
+    """Tests that run across every public GET endpoint."""
+
+    def test_smoke_all_endpoints(self, base_url: str) -> None:
+        """Concurrent GETs to every public endpoint all succeed."""
+        paths = ("/api/status", "/api/activity", "/api/stats", "/api/heartbeat", "/api/cost")
+        # The server answers one request at a time; the overlap is client-side.
+        with ThreadPoolExecutor(max_workers=len(paths)) as pool:
+            results = list(pool.map(_make_request, (f"{base_url}{p}" for p in paths)))
+
+        for path, (status, body) in zip(paths, results, strict=True):
+            assert status == 200, path
+            assert not body.get("error"), path
+
+
 # --- Kill endpoint (admin) ---
 
 
@@ -249,11 +312,11 @@ class TestKill:
     """Tests for POST /api/kill."""
 
     def test_kill_with_valid_token(
-        self, server: DashboardServer
+        self, base_url: str, mock_controller: StubController
     ) -> None:
         """Kill succeeds with valid admin token."""
         status, body = _make_request(
-            f"{_base_url(server)}/api/kill",
+            f"{base_url}/api/kill",
             method="POST",
             data={},
             headers={"Authorization": "Bearer test-secret-token"},
@@ -261,30 +324,7 @@ class TestKill:
         assert status == 200
         assert body["killed"] is True
         assert body["sandbox_id"] == "sbx_test"
-
-    def test_kill_without_token(
-        self, server: DashboardServer
-    ) -> None:
-        """Kill rejected without token."""
-        status, body = _make_request(
-            f"{_base_url(server)}/api/kill",
-            method="POST",
-            data={},
-        )
-        assert status == 401
-        assert "Unauthorized" in body["error"]
-
-    def test_kill_with_wrong_token(
-        self, server: DashboardServer
-    ) -> None:
-        """Kill rejected with wrong token."""
-        status, _body = _make_request(
-            f"{_base_url(server)}/api/kill",
-            method="POST",
-            data={},
-            headers={"Authorization": "Bearer wrong-token"},
-        )
-        assert status == 401
+        assert mock_controller.kill_calls == ["sbx_test"]
 
 
 # --- Inject rule endpoint (admin) ---
@@ -294,11 +334,11 @@ class TestInjectRule:
     """Tests for POST /api/inject-rule."""
 
     def test_inject_rule_success(
-        self, server: DashboardServer, mock_controller: MagicMock
+        self, base_url: str, mock_controller: StubController
     ) -> None:
         """Inject rule succeeds with valid token and rule."""
         status, body = _make_request(
-            f"{_base_url(server)}/api/inject-rule",
+            f"{base_url}/api/inject-rule",
             method="POST",
             data={"rule": "Never post after midnight"},
             headers={"Authorization": "Bearer test-secret-token"},
@@ -306,16 +346,16 @@ class TestInjectRule:
         assert status == 200
         assert body["injected"] is True
         assert body["rule"] == "Never post after midnight"
-        mock_controller.inject_rule.assert_called_once_with(
-            "sbx_test", "Never post after midnight"
-        )
+        assert mock_controller.calls_to("inject_rule") == [
+            ("sbx_test", "Never post after midnight")
+        ]
 
     def test_inject_rule_missing_rule(
-        self, server: DashboardServer
+        self, base_url: str
     ) -> None:
         """Inject rule fails without rule field."""
         status, body = _make_request(
-            f"{_base_url(server)}/api/inject-rule",
+            f"{base_url}/api/inject-rule",
             method="POST",
             data={},
             headers={"Authorization": "Bearer test-secret-token"},
@@ -323,17 +363,6 @@ class TestInjectRule:
         assert status == 400
         assert "rule" in body["error"].lower()
 
-    def test_inject_rule_no_auth(
-        self, server: DashboardServer
-    ) -> None:
-        """Inject rule rejected without auth."""
-        status, _body = _make_request(
-            f"{_base_url(server)}/api/inject-rule",
-            method="POST",
-            data={"rule": "test"},
-        )
-        assert status == 401
-
 
 # --- 404 handling ---
 
@@ -341,22 +370,20 @@ class TestInjectRule:
 class TestNotFound:
     """Tests for unknown routes."""
 
-    def test_unknown_get(self, server: DashboardServer) -> None:
-        """Unknown GET returns 404."""
-        status, body = _make_request(f"{_base_url(server)}/api/nonexistent")
+    @pytest.mark.parametrize(
+        "path",
+        [
+            pytest.param("/api/nonexistent", id="unknown-route"),
+            pytest.param("/static/nonexistent.txt", id="missing-static"),
+            pytest.param("/static/../server.py", id="path-traversal"),
+        ],
+    )
+    def test_unknown_get(self, base_url: str, path: str) -> None:
+        """Unknown routes, missing files and traversal attempts return 404 JSON."""
+        status, body = _make_request(f"{base_url}{path}")
         assert status == 404
         assert "Not found" in body["error"]
 
-    def test_unknown_post(self, server: DashboardServer) -> None:
-        """Unknown POST returns 404."""
-        status, _body = _make_request(
-            f"{_base_url(server)}/api/nonexistent",
-            method="POST",
-            data={},
-            headers={"Authorization": "Bearer test-secret-token"},
-        )
-        assert status == 404
-
 
 # --- CORS ---
 
@@ -364,20 +391,20 @@ class TestNotFound:
 class TestCORS:
     """Tests for CORS headers."""
 
-    def test_cors_headers_on_get(self, server: DashboardServer) -> None:
+    def test_cors_headers_on_get(self, base_url: str) -> None:
         """GET responses include CORS headers."""
         import urllib.request
 
-        req = urllib.request.Request(f"{_base_url(server)}/api/status")
+        req = urllib.request.Request(f"{base_url}/api/status")
         with urllib.request.urlopen(req) as resp:
             assert resp.headers.get("Access-Control-Allow-Origin") == "*"
 
-    def test_options_preflight(self, server: DashboardServer) -> None:
+    def test_options_preflight(self, base_url: str) -> None:
         """OPTIONS returns 204 with CORS headers."""
         import urllib.request
 
         req = urllib.request.Request(
-            f"{_base_url(server)}/api/status",
+            f"{base_url}/api/status",
             method="OPTIONS",
         )
         with urllib.request.urlopen(req) as resp:
@@ -397,40 +424,51 @@ class TestServerLifecycle:
 
     def test_context_manager(
         self,
-        mock_controller: MagicMock,
-        tmp_state: Path,
-        tmp_activity: Path,
-        tmp_path: Path,
+        make_server: Callable[..., DashboardServer],
     ) -> None:
         """Server works as context manager."""
-        srv = DashboardServer(
-            sandbox_id="sbx_test",
-            controller=mock_controller,
-            state_path=tmp_state,
-            activity_log_path=tmp_activity,
-            heartbeat_path=tmp_path / "heartbeat.json",
-            port=0,
-        )
+        srv = make_server()
         with srv:
             assert srv.is_running
         assert not srv.is_running
 
+    def test_default_controller_caches_health(
+        self,
+        make_server: Callable[..., DashboardServer],
+    ) -> None:
+        """Without an injected controller (as in cmd_serve), health reads are cached."""
+        srv = make_server(controller=None)
+        assert srv._controller._health_cache_ttl_s == _HEALTH_CACHE_TTL_S
+
+    def test_stop_closes_default_controller(
+        self,
+        make_server: Callable[..., DashboardServer],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """A controller the server built is closed on stop()."""
+        srv = make_server(controller=None)
+        closed: list[bool] = []
+        monkeypatch.setattr(srv._controller, "close", lambda: closed.append(True))
+        with srv:
+            pass
+        assert closed == [True]
+
+    def test_stop_leaves_injected_controller_open(
+        self,
+        make_server: Callable[..., DashboardServer],
+        mock_controller: StubController,
+    ) -> None:
+        """An injected controller belongs to the caller and stays open."""
+        with make_server():
+            pass
+        assert mock_controller.calls_to("close") == []
+
     def test_double_start(
         self,
-        mock_controller: MagicMock,
-        tmp_state: Path,
-        tmp_activity: Path,
-        tmp_path: Path,
+        make_server: Callable[..., DashboardServer],
     ) -> None:
         """Starting twice is idempotent."""
-        srv = DashboardServer(
-            sandbox_id="sbx_test",
-            controller=mock_controller,
-            state_path=tmp_state,
-            activity_log_path=tmp_activity,
-            heartbeat_path=tmp_path / "heartbeat.json",
-            port=0,
-        )
+        srv = make_server()
         srv.start()
         thread1 = srv._thread
         srv.start()  # Should not create a new thread
@@ -439,20 +477,10 @@ class TestServerLifecycle:
 
     def test_stop_when_not_running(
         self,
-        mock_controller: MagicMock,
-        tmp_state: Path,
-        tmp_activity: Path,
-        tmp_path: Path,
+        make_server: Callable[..., DashboardServer],
     ) -> None:
         """Stopping when not running is a no-op."""
-        srv = DashboardServer(
-            sandbox_id="sbx_test",
-            controller=mock_controller,
-            state_path=tmp_state,
-            activity_log_path=tmp_activity,
-            heartbeat_path=tmp_path / "heartbeat.json",
-            port=0,
-        )
+        srv = make_server()
         srv.stop()  # Should not raise
 
 
@@ -462,25 +490,57 @@ class TestServerLifecycle:
 class TestAdminAuth:
     """Tests for admin authentication edge cases."""
 
+    @pytest.mark.parametrize(
+        ("path", "data", "headers", "expected_status", "expected_error"),
+        [
+            pytest.param(
+                "/api/kill", {}, None, 401, "Unauthorized", id="kill-no-token"
+            ),
+            pytest.param(
+                "/api/kill", {}, {"Authorization": "Bearer wrong-token"},
+                401, "Unauthorized", id="kill-wrong-token",
+            ),
+            pytest.param(
+                "/api/inject-rule", {"rule": "test"}, None, 401, "Unauthorized",
+                id="inject-no-token",
+            ),
+            # Unknown POST routes 404 before the auth check runs.
+            pytest.param(
+                "/api/nonexistent", {},
+                {"Authorization": "Bearer test-secret-token"},
+                404, "Not found", id="unknown-post",
+            ),
+        ],
+    )
+    def test_admin_post_rejected(
+        self,
+        base_url: str,
+        mock_controller: StubController,
+        path: str,
+        data: dict[str, Any],
+        headers: dict[str, str] | None,
+        expected_status: int,
+        expected_error: str,
+    ) -> None:
+        """Rejected admin POSTs return an error and never reach the controller."""
+        status, body = _make_request(
+            f"{base_url}{path}",
+            method="POST",
+            data=data,
+            headers=headers,
+        )
+        assert status == expected_status
+        assert expected_error in body["error"]
+        assert mock_controller.kill_calls == []
+        assert mock_controller.calls_to("inject_rule") == []
+
     def test_no_dashboard_token_configured(
         self,
-        mock_controller: MagicMock,
-        tmp_state: Path,
-        tmp_activity: Path,
-        tmp_path: Path,
+        make_server: Callable[..., DashboardServer],
     ) -> None:
         """Admin endpoints return 403 when no token is configured."""
-        srv = DashboardServer(
-            sandbox_id="sbx_test",
-            controller=mock_controller,
-            state_path=tmp_state,
-            activity_log_path=tmp_activity,
-            heartbeat_path=tmp_path / "heartbeat.json",
-            dashboard_token="",  # No token
-            port=0,
-        )
+        srv = make_server(dashboard_token="")  # No token
         with srv:
-            time.sleep(0.1)
             status, body = _make_request(
                 f"{_base_url(srv)}/api/kill",
                 method="POST",
@@ -498,18 +558,17 @@ class TestBodySizeLimit:
     """Tests for request body size enforcement."""
 
     def test_oversized_body_rejected(
-        self, server: DashboardServer
+        self, base_url: str
     ) -> None:
         """Request body exceeding _MAX_BODY_SIZE returns 413."""
         import urllib.error
         import urllib.request
 
-        # Build a payload larger than 64KB
-        oversized = {"rule": "x" * 70000}
-        raw = json.dumps(oversized).encode("utf-8")
+        # Payload larger than 64KB, built as bytes (no encoder round trip)
+        raw = b'{"rule": "' + b"x" * 70000 + b'"}'
 
         req = urllib.request.Request(
-            f"{_base_url(server)}/api/inject-rule",
+            f"{base_url}/api/inject-rule",
             method="POST",
         )
         req.add_header("Authorization", "Bearer test-secret-token")
@@ -519,10 +578,10 @@ class TestBodySizeLimit:
         try:
             with urllib.request.urlopen(req) as resp:
                 status = resp.status
-                body = json.loads(resp.read().decode("utf-8"))
+                body = json.loads(resp.read())
         except urllib.error.HTTPError as e:
             status = e.code
-            body = json.loads(e.read().decode("utf-8"))
+            body = json.loads(e.read())
 
         assert status == 413
         assert "too large" in body["error"].lower()
@@ -536,26 +595,15 @@ class TestPortProperty:
 
     def test_port_returns_actual_bound_port(
         self,
-        mock_controller: MagicMock,
-        tmp_state: Path,
-        tmp_activity: Path,
-        tmp_path: Path,
+        make_server: Callable[..., DashboardServer],
     ) -> None:
         """Port property returns OS-assigned port when running with port=0."""
-        srv = DashboardServer(
-            sandbox_id="sbx_test",
-            controller=mock_controller,
-            state_path=tmp_state,
-            activity_log_path=tmp_activity,
-            heartbeat_path=tmp_path / "heartbeat.json",
-            port=0,
-        )
+        srv = make_server()
         # Before start, returns configured port
         assert srv.port == 0
 
         srv.start()
         try:
-            time.sleep(0.1)
             # After start, returns actual bound port (non-zero)
             assert srv.port > 0
             assert srv.port != 0
@@ -567,20 +615,10 @@ class TestPortProperty:
 
     def test_port_returns_configured_when_explicit(
         self,
-        mock_controller: MagicMock,
-        tmp_state: Path,
-        tmp_activity: Path,
-        tmp_path: Path,
+        make_server: Callable[..., DashboardServer],
     ) -> None:
         """Port property returns configured port when not using port=0."""
-        srv = DashboardServer(
-            sandbox_id="sbx_test",
-            controller=mock_controller,
-            state_path=tmp_state,
-            activity_log_path=tmp_activity,
-            heartbeat_path=tmp_path / "heartbeat.json",
-            port=9999,
-        )
+        srv = make_server(port=9999)
         assert srv.port == 9999
 
 
@@ -591,19 +629,22 @@ def _fetch_raw(
     url: str,
     *,
     method: str = "GET",
-) -> tuple[int, str, dict[str, str]]:
-    """Fetch a URL and return (status_code, body_text, headers)."""
+) -> tuple[int, bytes, dict[str, str]]:
+    """Fetch a URL and return (status_code, body_bytes, headers).
+
+    The body stays undecoded; callers match ASCII markers as bytes.
+    """
     import urllib.error
     import urllib.request
 
     req = urllib.request.Request(url, method=method)
     try:
         with urllib.request.urlopen(req) as resp:
-            body = resp.read().decode("utf-8")
+            body = resp.read()
             headers = {k.lower(): v for k, v in resp.headers.items()}
             return resp.status, body, headers
     except urllib.error.HTTPError as e:
-        body = e.read().decode("utf-8")
+        body = e.read()
         headers = {k.lower(): v for k, v in e.headers.items()}
         return e.code, body, headers
 
@@ -611,71 +652,83 @@ def _fetch_raw(
 class TestStaticFiles:
     """Tests for static file serving."""
 
-    def test_index_served_at_root(self, server: DashboardServer) -> None:
-        """GET / serves index.html."""
-        status, body, headers = _fetch_raw(f"{_base_url(server)}/")
-        assert status == 200
-        assert "text/html" in headers.get("content-type", "")
-        assert "Nathan" in body
-        assert "<html" in body
-
-    def test_css_served(self, server: DashboardServer) -> None:
-        """GET /static/style.css serves the stylesheet."""
-        status, body, headers = _fetch_raw(
-            f"{_base_url(server)}/static/style.css"
-        )
-        assert status == 200
-        assert "text/css" in headers.get("content-type", "")
-        assert "--bg-primary" in body
-
-    def test_js_served(self, server: DashboardServer) -> None:
-        """GET /static/dashboard.js serves the JavaScript."""
-        status, body, headers = _fetch_raw(
-            f"{_base_url(server)}/static/dashboard.js"
-        )
+    @pytest.mark.parametrize(
+        ("path", "content_types", "markers"),
+        [
+            pytest.param("/", ("text/html",), (b"Nathan", b"<html"), id="index"),
+            pytest.param(
+                "/static/style.css", ("text/css",), (b"--bg-primary",), id="css"
+            ),
+            # JS MIME type may vary by platform
+            pytest.param(
+                "/static/dashboard.js", ("javascript", "text/"), (b"Dashboard",),
+                id="js",
+            ),
+        ],
+    )
+    def test_static_file_served(
+        self,
+        base_url: str,
+        path: str,
+        content_types: tuple[str, ...],
+        markers: tuple[bytes, ...],
+    ) -> None:
+        """Index, stylesheet and script are served with a fitting type."""
+        status, body, headers = _fetch_raw(f"{base_url}{path}")
         assert status == 200
-        # JS MIME type may vary
         content_type = headers.get("content-type", "")
-        assert "javascript" in content_type or "text/" in content_type
-        assert "Dashboard" in body
+        assert any(t in content_type for t in content_types)
+        for marker in markers:
+            assert marker in body
 
-    def test_js_renders_details_field(self, server: DashboardServer) -> None:
+    def test_js_renders_details_field(self, base_url: str) -> None:
         """dashboard.js includes r.details in feed item rendering.
 
         Fix 4 (Issue #47): The details field of ActivityRecord must be
         shown in the activity feed so operators can see what the agent did.
         """
         status, body, _ = _fetch_raw(
-            f"{_base_url(server)}/static/dashboard.js"
+            f"{base_url}/static/dashboard.js"
         )
         assert status == 200
-        assert "r.details" in body
+        assert b"r.details" in body
 
-    def test_missing_static_returns_404(
-        self, server: DashboardServer
-    ) -> None:
-        """Missing static file returns 404 JSON."""
-        status, _body = _make_request(
-            f"{_base_url(server)}/static/nonexistent.txt"
+    def test_cache_header_set(self, base_url: str) -> None:
+        """Static files have Cache-Control header (checked via HEAD)."""
+        status, body, headers = _fetch_raw(
+            f"{base_url}/static/style.css", method="HEAD"
         )
-        assert status == 404
+        assert status == 200
+        assert "max-age=" in headers.get("cache-control", "")
+        assert "text/css" in headers.get("content-type", "")
+        assert int(headers.get("content-length", "0")) > 0
+        assert body == b""
 
-    def test_path_traversal_blocked(
-        self, server: DashboardServer
-    ) -> None:
-        """Path traversal attempts are rejected."""
-        status, _body = _make_request(
-            f"{_base_url(server)}/static/../server.py"
-        )
+    def test_head_unknown_route_returns_404(self, base_url: str) -> None:
+        """HEAD follows GET routing and sends no body."""
+        status, body, _ = _fetch_raw(f"{base_url}/api/nonexistent", method="HEAD")
         assert status == 404
+        assert body == b""
 
-    def test_cache_header_set(self, server: DashboardServer) -> None:
-        """Static files have Cache-Control header."""
-        status, _body, headers = _fetch_raw(
-            f"{_base_url(server)}/static/style.css"
-        )
-        assert status == 200
-        assert "max-age=" in headers.get("cache-control", "")
+    @pytest.mark.parametrize("fails", [False, True], ids=["ok", "raises"])
+    def test_head_flag_reset_after_request(self, fails: bool) -> None:
+        """The HEAD flag never outlives its request, even if GET raises."""
+        handler = _RequestHandler.__new__(_RequestHandler)
+        seen: list[bool] = []
+
+        def do_get() -> None:
+            seen.append(handler._head_only)
+            if fails:
+                raise OSError("client went away")
+
+        handler.do_GET = do_get  # type: ignore[method-assign]
+        if fails:
+            with pytest.raises(OSError):
+                handler.do_HEAD()
+        else:
+            handler.do_HEAD()
+        assert seen == [True]
+        assert handler._head_only is False
 
 
 # --- Cost endpoint ---
@@ -685,11 +738,11 @@ class TestCost:
     """Tests for GET /api/cost."""
 
     def test_cost_without_tracker(
-        self, server: DashboardServer
+        self, base_url: str
     ) -> None:
         """Cost returns zeroed data when no CostTracker is configured."""
         # Default server fixture has no cost_tracker
-        status, body = _make_request(f"{_base_url(server)}/api/cost")
+        status, body = _make_request(f"{base_url}/api/cost")
         assert status == 200
         assert body["configured"] is False
         assert body["total_cost_usd"] == 0.0
@@ -701,9 +754,7 @@ class TestCost:
 
     def test_cost_with_tracker(
         self,
-        mock_controller: MagicMock,
-        tmp_state: Path,
-        tmp_activity: Path,
+        make_server: Callable[..., DashboardServer],
         tmp_path: Path,
     ) -> None:
         """Cost returns real data from CostTracker."""
@@ -716,18 +767,11 @@ class TestCost:
         tracker.record_llm_call("test-ns", tokens_estimated=500_000)
         tracker.record_e2b_time(120.0)
 
-        srv = DashboardServer(
-            sandbox_id="sbx_test",
-            controller=mock_controller,
+        srv = make_server(
             cost_tracker=tracker,
-            state_path=tmp_state,
-            activity_log_path=tmp_activity,
-            heartbeat_path=tmp_path / "heartbeat.json",
             dashboard_token="test-secret-token",
-            port=0,
         )
         with srv:
-            time.sleep(0.1)
             status, body = _make_request(f"{_base_url(srv)}/api/cost")
 
         assert status == 200
@@ -744,9 +788,7 @@ class TestCost:
 
     def test_cost_alert_triggered(
         self,
-        mock_controller: MagicMock,
-        tmp_state: Path,
-        tmp_activity: Path,
+        make_server: Callable[..., DashboardServer],
         tmp_path: Path,
     ) -> None:
         """Cost shows alert when threshold exceeded."""
@@ -760,17 +802,8 @@ class TestCost:
         # 0.40/1M tokens × 2M tokens = $0.80 → 80% of budget
         tracker.record_llm_call("test-ns", tokens_estimated=2_000_000)
 
-        srv = DashboardServer(
-            sandbox_id="sbx_test",
-            controller=mock_controller,
-            cost_tracker=tracker,
-            state_path=tmp_state,
-            activity_log_path=tmp_activity,
-            heartbeat_path=tmp_path / "heartbeat.json",
-            port=0,
-        )
+        srv = make_server(cost_tracker=tracker)
         with srv:
-            time.sleep(0.1)
             status, body = _make_request(f"{_base_url(srv)}/api/cost")
 
         assert status == 200
@@ -779,9 +812,7 @@ class TestCost:
 
     def test_cost_over_budget(
         self,
-        mock_controller: MagicMock,
-        tmp_state: Path,
-        tmp_activity: Path,
+        make_server: Callable[..., DashboardServer],
         tmp_path: Path,
     ) -> None:
         """Cost shows over budget when limit exceeded."""
@@ -793,17 +824,8 @@ class TestCost:
         # Record enough to exceed the budget
         tracker.record_llm_call("test-ns", tokens_estimated=1_000_000)
 
-        srv = DashboardServer(
-            sandbox_id="sbx_test",
-            controller=mock_controller,
-            cost_tracker=tracker,
-            state_path=tmp_state,
-            activity_log_path=tmp_activity,
-            heartbeat_path=tmp_path / "heartbeat.json",
-            port=0,
-        )
+        srv = make_server(cost_tracker=tracker)
         with srv:
-            time.sleep(0.1)
             status, body = _make_request(f"{_base_url(srv)}/api/cost")
 
         assert status == 200
@@ -820,9 +842,7 @@ class TestDiscoveryWorker:
 
     def test_discovery_worker_updates_sandbox_id(
         self,
-        mock_controller: MagicMock,
-        tmp_state: Path,
-        tmp_activity: Path,
+        make_server: Callable[..., DashboardServer],
         tmp_path: Path,
     ) -> None:
         """Discovery worker updates _sandbox_id when new active sandbox found."""
@@ -839,15 +859,7 @@ class TestDiscoveryWorker:
             called.set()
             return "sbx_new_discovered"
 
-        srv = DashboardServer(
-            sandbox_id="sbx_test",
-            controller=mock_controller,
-            brain_repo_path=brain_path,
-            state_path=tmp_state,
-            activity_log_path=tmp_activity,
-            heartbeat_path=tmp_path / "heartbeat.json",
-            port=0,
-        )
+        srv = make_server(brain_repo_path=brain_path)
 
         with (
             patch("social_agent.server._DISCOVERY_INTERVAL_S", 0.01),
@@ -867,9 +879,7 @@ class TestDiscoveryWorker:
 
     def test_discovery_worker_ignores_placeholder(
         self,
-        mock_controller: MagicMock,
-        tmp_state: Path,
-        tmp_activity: Path,
+        make_server: Callable[..., DashboardServer],
         tmp_path: Path,
     ) -> None:
         """Discovery worker does not update sandbox_id for sbx-not-started."""
@@ -885,15 +895,7 @@ class TestDiscoveryWorker:
             called.set()
             return "sbx-not-started"
 
-        srv = DashboardServer(
-            sandbox_id="sbx_test",
-            controller=mock_controller,
-            brain_repo_path=brain_path,
-            state_path=tmp_state,
-            activity_log_path=tmp_activity,
-            heartbeat_path=tmp_path / "heartbeat.json",
-            port=0,
-        )
+        srv = make_server(brain_repo_path=brain_path)
 
         with (
             patch("social_agent.server._DISCOVERY_INTERVAL_S", 0.01),
@@ -912,21 +914,10 @@ class TestDiscoveryWorker:
 
     def test_no_discovery_without_brain_repo_path(
         self,
-        mock_controller: MagicMock,
-        tmp_state: Path,
-        tmp_activity: Path,
-        tmp_path: Path,
+        make_server: Callable[..., DashboardServer],
     ) -> None:
         """Discovery worker does not start when brain_repo_path is None."""
-        srv = DashboardServer(
-            sandbox_id="sbx_test",
-            controller=mock_controller,
-            brain_repo_path=None,
-            state_path=tmp_state,
-            activity_log_path=tmp_activity,
-            heartbeat_path=tmp_path / "heartbeat.json",
-            port=0,
-        )
+        srv = make_server(brain_repo_path=None)
         with srv:
             assert srv._discovery_thread is None
             assert not srv._discovery_running
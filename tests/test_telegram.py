@@ -1,16 +1,59 @@
 """Tests for social_agent.telegram.
 
-All tests use mocked httpx — no real Telegram API calls.
+All tests inject a recording stub in place of httpx.post — no real
+Telegram API calls.
 """
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from typing import Any
 
+import pytest
 from pydantic import SecretStr
 
+from social_agent import telegram
 from social_agent.telegram import Level, TelegramNotifier, _escape_markdown
 
+# Shared responses; the notifier only reads status_code (and text on failure).
+_OK = SimpleNamespace(status_code=200)
+_BAD = SimpleNamespace(status_code=400, text="Bad Request")
+
+
+class FakePost:
+    """Stand-in for httpx.post that records (url, json) per call.
+
+    Returns ``response`` or, when ``error`` is set, raises it instead.
+    """
+
+    def __init__(self, response: Any = None, error: Exception | None = None) -> None:
+        self.response = response or _OK
+        self.error = error
+        self.calls: list[tuple[str, dict[str, Any]]] = []
+
+    def __call__(self, url: str, *, json: dict[str, Any], timeout: object = None) -> Any:
+        self.calls.append((url, json))
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+
+@pytest.fixture
+def fake_post() -> FakePost:
+    """Recording httpx.post stub answering 200."""
+    return FakePost()
+
+
+@pytest.fixture
+def notifier(fake_post: FakePost) -> TelegramNotifier:
+    """Enabled notifier wired to fake_post."""
+    return TelegramNotifier(
+        bot_token=SecretStr("bot_token"),
+        chat_id="12345",
+        post=fake_post,
+    )
+
+
 # --- _escape_markdown ---
 
 
@@ -36,6 +79,12 @@ def test_escape_multiple_chars() -> None:
     assert "\\]" in result
 
 
+def test_escape_every_special_char() -> None:
+    """Each MarkdownV2 special character, backslash included, gets one escape."""
+    specials = "_*[]()~`>#+-=|{}.!\\"
+    assert _escape_markdown(specials) == "".join(f"\\{c}" for c in specials)
+
+
 # --- TelegramNotifier disabled ---
 
 
@@ -68,144 +117,227 @@ def test_disabled_notify_does_not_crash() -> None:
 
 def test_enabled_when_both_set() -> None:
     """Notifier is enabled with both token and chat_id."""
-    notifier = TelegramNotifier(
+    with TelegramNotifier(
         bot_token=SecretStr("test_token"),
         chat_id="12345",
-    )
-    assert notifier.enabled is True
-
-
-@patch("social_agent.telegram.httpx")
-def test_notify_info(mock_httpx: MagicMock) -> None:
-    """INFO notification sends with info prefix."""
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_httpx.post.return_value = mock_response
-
-    notifier = TelegramNotifier(
-        bot_token=SecretStr("bot_token"),
-        chat_id="12345",
-    )
-    result = notifier.notify("Agent started", Level.INFO)
+    ) as notifier:
+        assert notifier.enabled is True
+
+
+@pytest.mark.parametrize(
+    ("level", "expected"),
+    [
+        pytest.param(Level.INFO, "INFO", id="info"),
+        pytest.param(Level.SUCCESS, "SUCCESS", id="success"),
+        pytest.param(Level.WARNING, "WARNING", id="warning"),
+        pytest.param(Level.ERROR, "ERROR", id="error"),
+        pytest.param(None, "INFO", id="default-is-info"),
+    ],
+)
+def test_notify_level(
+    notifier: TelegramNotifier,
+    fake_post: FakePost,
+    level: Level | None,
+    expected: str,
+) -> None:
+    """Each level is sent once with its name in the text; the default is INFO."""
+    if level is None:
+        result = notifier.notify("Agent started")
+    else:
+        result = notifier.notify("Agent started", level)
 
     assert result is True
-    mock_httpx.post.assert_called_once()
-    call_kwargs = mock_httpx.post.call_args
-    body = call_kwargs.kwargs["json"] if "json" in call_kwargs.kwargs else call_kwargs[1]["json"]
+    assert len(fake_post.calls) == 1
+    _, body = fake_post.calls[0]
     assert body["chat_id"] == "12345"
     assert body["parse_mode"] == "MarkdownV2"
-    assert "INFO" in body["text"]
-
-
-@patch("social_agent.telegram.httpx")
-def test_notify_success_level(mock_httpx: MagicMock) -> None:
-    """SUCCESS notification includes success prefix."""
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_httpx.post.return_value = mock_response
-
-    notifier = TelegramNotifier(
-        bot_token=SecretStr("token"),
-        chat_id="123",
-    )
-    result = notifier.notify("Post created", Level.SUCCESS)
-    assert result is True
-
+    assert expected in body["text"]
 
-@patch("social_agent.telegram.httpx")
-def test_notify_warning_level(mock_httpx: MagicMock) -> None:
-    """WARNING notification works."""
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_httpx.post.return_value = mock_response
 
-    notifier = TelegramNotifier(
-        bot_token=SecretStr("token"),
-        chat_id="123",
-    )
-    result = notifier.notify("Rate limited", Level.WARNING)
-    assert result is True
+def test_notify_text_format(notifier: TelegramNotifier, fake_post: FakePost) -> None:
+    """Text is the level header line followed by the escaped message."""
+    notifier.notify("v1.0 ready!", Level.SUCCESS)
 
+    _, body = fake_post.calls[0]
+    assert body["text"] == "✅ *SUCCESS*\nv1\\.0 ready\\!"
 
-@patch("social_agent.telegram.httpx")
-def test_notify_error_level(mock_httpx: MagicMock) -> None:
-    """ERROR notification works."""
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_httpx.post.return_value = mock_response
 
-    notifier = TelegramNotifier(
-        bot_token=SecretStr("token"),
-        chat_id="123",
-    )
-    result = notifier.notify("Circuit breaker tripped", Level.ERROR)
-    assert result is True
+# --- Connection pooling ---
 
 
-@patch("social_agent.telegram.httpx")
-def test_notify_default_level_is_info(mock_httpx: MagicMock) -> None:
-    """Default level is INFO."""
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_httpx.post.return_value = mock_response
+def test_enabled_notifier_pools_client() -> None:
+    """Without an injected post, an enabled notifier opens one client and closes it on exit."""
+    with TelegramNotifier(bot_token=SecretStr("token"), chat_id="123") as notifier:
+        client = notifier._client
+        assert client is not None
+        assert notifier._post == client.post
+    assert client.is_closed
+    assert notifier._client is None
+    notifier.close()  # idempotent
 
-    notifier = TelegramNotifier(
-        bot_token=SecretStr("token"),
-        chat_id="123",
-    )
-    result = notifier.notify("Test message")
-    assert result is True
 
-    call_kwargs = mock_httpx.post.call_args
-    body = call_kwargs.kwargs["json"] if "json" in call_kwargs.kwargs else call_kwargs[1]["json"]
-    assert "INFO" in body["text"]
+def test_disabled_notifier_opens_no_client() -> None:
+    """A disabled notifier never opens an HTTP client."""
+    assert TelegramNotifier()._client is None
 
 
 # --- Graceful degradation ---
 
 
-@patch("social_agent.telegram.httpx")
-def test_api_error_returns_false(mock_httpx: MagicMock) -> None:
+def test_api_error_returns_false(notifier: TelegramNotifier, fake_post: FakePost) -> None:
     """Non-200 response returns False, doesn't crash."""
-    mock_response = MagicMock()
-    mock_response.status_code = 400
-    mock_response.text = "Bad Request"
-    mock_httpx.post.return_value = mock_response
+    fake_post.response = _BAD
 
-    notifier = TelegramNotifier(
-        bot_token=SecretStr("token"),
-        chat_id="123",
-    )
     result = notifier.notify("Test")
     assert result is False
 
 
-@patch("social_agent.telegram.httpx")
-def test_network_error_returns_false(mock_httpx: MagicMock) -> None:
+def test_network_error_returns_false(notifier: TelegramNotifier, fake_post: FakePost) -> None:
     """Network error returns False, doesn't crash."""
-    mock_httpx.post.side_effect = ConnectionError("network down")
+    fake_post.error = ConnectionError("network down")
 
-    notifier = TelegramNotifier(
-        bot_token=SecretStr("token"),
-        chat_id="123",
-    )
     result = notifier.notify("Test")
     assert result is False
 
 
-@patch("social_agent.telegram.httpx")
-def test_token_used_in_url(mock_httpx: MagicMock) -> None:
+def test_token_used_in_url(fake_post: FakePost) -> None:
     """Bot token is included in the API URL."""
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_httpx.post.return_value = mock_response
-
     notifier = TelegramNotifier(
         bot_token=SecretStr("my_bot_token_123"),
         chat_id="12345",
+        post=fake_post,
     )
     notifier.notify("Test")
 
-    url = mock_httpx.post.call_args[0][0]
+    url, _ = fake_post.calls[0]
     assert "my_bot_token_123" in url
     assert "sendMessage" in url
+
+
+def test_plain_string_token_enables_notifier(fake_post: FakePost) -> None:
+    """A plain str bot_token works the same as a SecretStr."""
+    notifier = TelegramNotifier(bot_token="plain_token", chat_id="12345", post=fake_post)
+    assert notifier.enabled is True
+
+    assert notifier.notify("Test") is True
+    url, _ = fake_post.calls[0]
+    assert url == "https://api.telegram.org/botplain_token/sendMessage"
+
+
+def test_plain_string_and_secret_token_build_same_url(fake_post: FakePost) -> None:
+    """Plain and SecretStr tokens produce the same request URL."""
+    for token in ("same_token", SecretStr("same_token")):
+        TelegramNotifier(bot_token=token, chat_id="1", post=fake_post).notify("Test")
+    assert fake_post.calls[0][0] == fake_post.calls[1][0]
+
+
+class FakeClock:
+    """Settable monotonic clock for the circuit breaker."""
+
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Clock the breaker_notifier reads; tests advance it by hand."""
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker_notifier(fake_post: FakePost, clock: FakeClock) -> TelegramNotifier:
+    """Enabled notifier wired to fake_post and a hand-driven clock."""
+    return TelegramNotifier(
+        bot_token=SecretStr("bot_token"),
+        chat_id="12345",
+        post=fake_post,
+        clock=clock,
+    )
+
+
+def _too_many_requests(retry_after: int | None = None) -> SimpleNamespace:
+    """429 response, with Telegram's parameters.retry_after when given."""
+    body: dict[str, Any] = {"ok": False, "error_code": 429}
+    if retry_after is not None:
+        body["parameters"] = {"retry_after": retry_after}
+    return SimpleNamespace(status_code=429, text="Too Many Requests", json=lambda: body)
+
+
+def test_circuit_breaker_opens_after_repeated_errors(
+    breaker_notifier: TelegramNotifier,
+    fake_post: FakePost,
+    clock: FakeClock,
+) -> None:
+    """Consecutive failures open the breaker; one trial send is allowed after cooldown."""
+    fake_post.error = ConnectionError("network down")
+
+    for _ in range(telegram._BREAKER_THRESHOLD):
+        assert breaker_notifier.notify("Test") is False
+    assert len(fake_post.calls) == telegram._BREAKER_THRESHOLD
+
+    # Open: short-circuits without touching the network
+    assert breaker_notifier.notify("Test") is False
+    assert len(fake_post.calls) == telegram._BREAKER_THRESHOLD
+
+    # Half-open after cooldown: a successful trial send closes it again
+    clock.now += telegram._BREAKER_COOLDOWN_S
+    fake_post.error = None
+    assert breaker_notifier.notify("Test") is True
+    assert breaker_notifier.notify("Test") is True
+    assert len(fake_post.calls) == telegram._BREAKER_THRESHOLD + 2
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        pytest.param(SimpleNamespace(status_code=503, text="Unavailable"), id="5xx"),
+        pytest.param(_too_many_requests(), id="429"),
+    ],
+)
+def test_server_errors_count_toward_breaker(
+    breaker_notifier: TelegramNotifier,
+    fake_post: FakePost,
+    response: SimpleNamespace,
+) -> None:
+    """Repeated 5xx or 429 responses open the breaker like connection errors."""
+    fake_post.response = response
+
+    for _ in range(telegram._BREAKER_THRESHOLD + 2):
+        breaker_notifier.notify("Test")
+    assert len(fake_post.calls) == telegram._BREAKER_THRESHOLD
+
+
+def test_client_error_resets_fail_count(
+    breaker_notifier: TelegramNotifier,
+    fake_post: FakePost,
+) -> None:
+    """A 4xx other than 429 proves Telegram is up and clears the count."""
+    fake_post.response = SimpleNamespace(status_code=503, text="Unavailable")
+    for _ in range(telegram._BREAKER_THRESHOLD - 1):
+        breaker_notifier.notify("Test")
+    assert breaker_notifier._fail_count == telegram._BREAKER_THRESHOLD - 1
+
+    fake_post.response = _BAD
+    breaker_notifier.notify("Test")
+    assert breaker_notifier._fail_count == 0
+
+
+def test_retry_after_opens_breaker_for_that_long(
+    breaker_notifier: TelegramNotifier,
+    fake_post: FakePost,
+    clock: FakeClock,
+) -> None:
+    """A 429 with retry_after skips sends for exactly that many seconds."""
+    fake_post.response = _too_many_requests(retry_after=60)
+    assert breaker_notifier.notify("Test") is False
+
+    clock.now += 59
+    assert breaker_notifier.notify("Test") is False
+    assert len(fake_post.calls) == 1
+
+    clock.now += 1
+    fake_post.response = _OK
+    assert breaker_notifier.notify("Test") is True
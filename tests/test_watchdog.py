@@ -1,12 +1,15 @@
 """Tests for watchdog check script (scripts/watchdog_check.py).
 
-Uses mocked SandboxController and LifecycleManager for all E2B operations.
-Tests all three scenarios: no sandboxes, one sandbox, multiple sandboxes.
+Uses the shared StubController and a hand-rolled LifecycleManager stub for all E2B
+operations. Tests all three scenarios: no sandboxes, one sandbox, multiple
+sandboxes.
 """
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+import inspect
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
 
 import pytest
 
@@ -19,13 +22,99 @@ from scripts.watchdog_check import (
     run_watchdog,
 )
 from social_agent.control import HealthCheck, HealthStatus, SandboxInfo
+from social_agent.lifecycle import LifecycleManager
+from tests.stubs import StubController
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+# Health results
+_HC_HEALTHY = HealthCheck(
+    status=HealthStatus.HEALTHY,
+    sandbox_id="sb-1",
+    seconds_since_heartbeat=10.0,
+)
+_HC_STUCK = HealthCheck(status=HealthStatus.STUCK, sandbox_id="sb-1")
+_HC_DEAD = HealthCheck(status=HealthStatus.DEAD, sandbox_id="sb-1")
+_HC_UNKNOWN = HealthCheck(
+    status=HealthStatus.UNKNOWN,
+    sandbox_id="sb-1",
+    error="cannot read heartbeat",
+)
+# sb-fresh has the newer heartbeat, so it should be kept over sb-old
+_HEALTH_FRESH_AND_OLD = {
+    "sb-fresh": HealthCheck(
+        status=HealthStatus.HEALTHY,
+        sandbox_id="sb-fresh",
+        seconds_since_heartbeat=5.0,
+    ),
+    "sb-old": HealthCheck(
+        status=HealthStatus.HEALTHY,
+        sandbox_id="sb-old",
+        seconds_since_heartbeat=30.0,
+    ),
+}
+
+# --- Stubs ---
+
+
+@dataclass
+class StubLifecycle:
+    """Hand-rolled LifecycleManager double, recording calls like StubController."""
+
+    successor: str | None = "sb-new"
+    deployed: bool = True
+    orphans: list[str] = field(default_factory=lambda: ["sb-orphan"])
+    controller: StubController = field(default_factory=StubController)
+    calls: list[tuple[Any, ...]] = field(default_factory=list)
+
+    def create_successor(self) -> str | None:
+        self.calls.append(("create_successor",))
+        return self.successor
+
+    def deploy_self(
+        self,
+        sandbox_id: str,
+        repo_url: str,
+        github_token: str,
+        envs: Mapping[str, str] | None = None,
+    ) -> bool:
+        self.calls.append(("deploy_self", sandbox_id, repo_url, github_token, envs))
+        return self.deployed
+
+    def cleanup_orphans(self, keep_sandbox_id: str) -> list[str]:
+        self.calls.append(("cleanup_orphans", keep_sandbox_id))
+        return list(self.orphans)
+
+    @property
+    def call_names(self) -> list[str]:
+        """Method names called, in call order."""
+        return [call[0] for call in self.calls]
+
+
+def test_stub_lifecycle_matches_real_api() -> None:
+    """Every method on StubLifecycle mirrors LifecycleManager's signature."""
+
+    def params(func: object) -> list[tuple[str, object, object]]:
+        return [
+            (p.name, p.kind, p.default)
+            for p in inspect.signature(func).parameters.values()  # type: ignore[arg-type]
+        ]
+
+    for name, attr in vars(StubLifecycle).items():
+        if name.startswith("_") or not inspect.isfunction(attr):
+            continue
+        real = getattr(LifecycleManager, name, None)
+        assert callable(real), f"LifecycleManager has no {name}"
+        assert params(attr) == params(real), name
+
 
 # --- Fixtures ---
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def config() -> WatchdogConfig:
-    """Watchdog config for tests."""
+    """Watchdog config shared by every test."""
     return WatchdogConfig(
         e2b_api_key="test-key",
         brain_repo_url="https://github.com/org/brain",
@@ -34,28 +123,52 @@ def config() -> WatchdogConfig:
 
 
 @pytest.fixture
-def mock_controller() -> MagicMock:
-    """Mock SandboxController."""
-    ctrl = MagicMock()
-    ctrl.check_health.return_value = HealthCheck(
-        status=HealthStatus.HEALTHY,
-        sandbox_id="sb-1",
-        seconds_since_heartbeat=10.0,
-    )
-    ctrl.list_sandboxes.return_value = []
-    ctrl.kill.return_value = True
-    return ctrl
+def mock_controller() -> StubController:
+    """Stub SandboxController reporting a healthy sb-1."""
+    return StubController()
+
+
+@pytest.fixture
+def mock_lifecycle() -> StubLifecycle:
+    """Stub LifecycleManager whose successor sb-new deploys cleanly."""
+    return StubLifecycle()
+
+
+@pytest.fixture
+def environ() -> dict[str, str]:
+    """Plain dict passed to from_env(environ=...), preset with the required vars.
+
+    Keeps the developer's real environment out of the envs assertions.
+    """
+    return {
+        "E2B_API_KEY": "key1",
+        "BRAIN_REPO_URL": "https://example.com/brain",
+        "GITHUB_TOKEN": "ghp_tok",
+    }
 
 
 @pytest.fixture
-def mock_lifecycle() -> MagicMock:
-    """Mock LifecycleManager."""
-    lm = MagicMock()
-    lm.create_successor.return_value = "sb-new"
-    lm.deploy_self.return_value = True
-    lm.cleanup_orphans.return_value = ["sb-orphan"]
-    lm.controller = MagicMock()
-    return lm
+def controller_kwargs() -> list[dict[str, Any]]:
+    """Keyword arguments the controller factory was called with, per call."""
+    return []
+
+
+@pytest.fixture
+def factories(
+    controller_kwargs: list[dict[str, Any]],
+    mock_controller: StubController,
+    mock_lifecycle: StubLifecycle,
+) -> dict[str, Any]:
+    """run_watchdog factory keyword arguments that hand back the stubs."""
+
+    def make_controller(**kwargs: Any) -> StubController:
+        controller_kwargs.append(kwargs)
+        return mock_controller
+
+    return {
+        "controller_factory": make_controller,
+        "lifecycle_factory": lambda **kwargs: mock_lifecycle,
+    }
 
 
 # --- WatchdogResult tests ---
@@ -69,7 +182,7 @@ class TestWatchdogResult:
         result = WatchdogResult(action="healthy", sandbox_id="sb-1")
         assert result.action == "healthy"
         assert result.sandbox_id == "sb-1"
-        assert result.killed == []
+        assert result.killed == ()
         assert result.error == ""
 
     def test_failed_result(self) -> None:
@@ -91,27 +204,37 @@ class TestWatchdogResult:
 class TestWatchdogConfig:
     """Tests for WatchdogConfig."""
 
-    def test_from_env_success(self, monkeypatch: pytest.MonkeyPatch) -> None:
+    def test_from_env_success(self, environ: dict[str, str]) -> None:
         """Config loads from environment variables."""
-        monkeypatch.setenv("E2B_API_KEY", "key1")
-        monkeypatch.setenv("BRAIN_REPO_URL", "https://example.com/brain")
-        monkeypatch.setenv("GITHUB_TOKEN", "ghp_tok")
-
-        cfg = WatchdogConfig.from_env()
+        cfg = WatchdogConfig.from_env(environ=environ)
         assert cfg.e2b_api_key == "key1"
         assert cfg.brain_repo_url == "https://example.com/brain"
         assert cfg.github_token == "ghp_tok"
 
-    def test_from_env_missing_vars(self, monkeypatch: pytest.MonkeyPatch) -> None:
+    def test_from_env_missing_vars(self, environ: dict[str, str]) -> None:
         """Missing env vars causes SystemExit(2)."""
-        monkeypatch.delenv("E2B_API_KEY", raising=False)
-        monkeypatch.delenv("BRAIN_REPO_URL", raising=False)
-        monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+        environ.clear()
 
         with pytest.raises(SystemExit) as exc_info:
-            WatchdogConfig.from_env()
+            WatchdogConfig.from_env(environ=environ)
         assert exc_info.value.code == 2
 
+    def test_frozen(self, config: WatchdogConfig) -> None:
+        """WatchdogConfig is immutable, so the session fixture is safe to share."""
+        with pytest.raises(AttributeError):
+            config.github_token = "changed"  # type: ignore[misc]
+        with pytest.raises(TypeError):
+            config.envs["OPENAI_API_KEY"] = "changed"  # type: ignore[index]
+
+    def test_envs_copied_from_caller(self) -> None:
+        """Mutating the dict passed in does not change the config."""
+        envs = {"OPENAI_API_KEY": "sk-test"}
+        cfg = WatchdogConfig(
+            e2b_api_key="k", brain_repo_url="u", github_token="t", envs=envs
+        )
+        envs["OPENAI_API_KEY"] = "changed"
+        assert cfg.envs == {"OPENAI_API_KEY": "sk-test"}
+
     def test_default_threshold(self) -> None:
         """Default stuck threshold is 600s."""
         cfg = WatchdogConfig(
@@ -127,33 +250,32 @@ class TestHandleNoSandboxes:
     """Tests for the 'no sandboxes running' scenario."""
 
     def test_deploy_success(
-        self, mock_lifecycle: MagicMock, config: WatchdogConfig
+        self, mock_lifecycle: StubLifecycle, config: WatchdogConfig
     ) -> None:
         """Deploys fresh sandbox when none running."""
         result = _handle_no_sandboxes(mock_lifecycle, config)
         assert result.action == "deployed"
         assert result.sandbox_id == "sb-new"
-        mock_lifecycle.create_successor.assert_called_once()
-        mock_lifecycle.deploy_self.assert_called_once()
+        assert mock_lifecycle.call_names == ["create_successor", "deploy_self"]
 
     def test_create_failure(
-        self, mock_lifecycle: MagicMock, config: WatchdogConfig
+        self, mock_lifecycle: StubLifecycle, config: WatchdogConfig
     ) -> None:
         """Returns failed when sandbox creation fails."""
-        mock_lifecycle.create_successor.return_value = None
+        mock_lifecycle.successor = None
         result = _handle_no_sandboxes(mock_lifecycle, config)
         assert result.action == "failed"
         assert "create" in result.error.lower()
 
     def test_deploy_failure_cleans_up(
-        self, mock_lifecycle: MagicMock, config: WatchdogConfig
+        self, mock_lifecycle: StubLifecycle, config: WatchdogConfig
     ) -> None:
         """Cleans up sandbox when deployment fails."""
-        mock_lifecycle.deploy_self.return_value = False
+        mock_lifecycle.deployed = False
         result = _handle_no_sandboxes(mock_lifecycle, config)
         assert result.action == "failed"
         assert "deploy" in result.error.lower()
-        mock_lifecycle.controller.kill.assert_called_once_with("sb-new")
+        assert mock_lifecycle.controller.kill_calls == ["sb-new"]
 
 
 # --- One sandbox tests ---
@@ -162,110 +284,62 @@ class TestHandleNoSandboxes:
 class TestHandleOneSandbox:
     """Tests for the 'one sandbox running' scenario."""
 
-    def test_healthy_agent(
-        self,
-        mock_controller: MagicMock,
-        mock_lifecycle: MagicMock,
-        config: WatchdogConfig,
-    ) -> None:
-        """Healthy sandbox returns healthy result."""
-        result = _handle_one_sandbox(
-            mock_controller, mock_lifecycle, config, "sb-1"
-        )
-        assert result.action == "healthy"
-        assert result.sandbox_id == "sb-1"
-
-    def test_stuck_agent_recovered(
-        self,
-        mock_controller: MagicMock,
-        mock_lifecycle: MagicMock,
-        config: WatchdogConfig,
-    ) -> None:
-        """Stuck agent is killed and replaced."""
-        mock_controller.check_health.return_value = HealthCheck(
-            status=HealthStatus.STUCK,
-            sandbox_id="sb-1",
-        )
-        result = _handle_one_sandbox(
-            mock_controller, mock_lifecycle, config, "sb-1"
-        )
-        assert result.action == "recovered"
-        assert result.sandbox_id == "sb-new"
-        assert "sb-1" in result.killed
-        mock_controller.kill.assert_called_once_with("sb-1")
-
-    def test_dead_agent_recovered(
-        self,
-        mock_controller: MagicMock,
-        mock_lifecycle: MagicMock,
-        config: WatchdogConfig,
-    ) -> None:
-        """Dead agent is killed and replaced."""
-        mock_controller.check_health.return_value = HealthCheck(
-            status=HealthStatus.DEAD,
-            sandbox_id="sb-1",
-        )
-        result = _handle_one_sandbox(
-            mock_controller, mock_lifecycle, config, "sb-1"
-        )
-        assert result.action == "recovered"
-        assert "sb-1" in result.killed
-
-    def test_stuck_create_fails(
-        self,
-        mock_controller: MagicMock,
-        mock_lifecycle: MagicMock,
-        config: WatchdogConfig,
-    ) -> None:
-        """Stuck agent killed but replacement creation fails."""
-        mock_controller.check_health.return_value = HealthCheck(
-            status=HealthStatus.STUCK,
-            sandbox_id="sb-1",
-        )
-        mock_lifecycle.create_successor.return_value = None
-        result = _handle_one_sandbox(
-            mock_controller, mock_lifecycle, config, "sb-1"
-        )
-        assert result.action == "failed"
-        assert "sb-1" in result.killed
-
-    def test_stuck_deploy_fails(
+    @pytest.mark.parametrize(
+        ("health", "fail_mode", "action", "sandbox_id", "killed", "new_killed"),
+        [
+            pytest.param(_HC_HEALTHY, None, "healthy", "sb-1", (), [], id="healthy"),
+            pytest.param(
+                _HC_STUCK, None, "recovered", "sb-new", ("sb-1",), [], id="stuck-recovered"
+            ),
+            pytest.param(
+                _HC_DEAD, None, "recovered", "sb-new", ("sb-1",), [], id="dead-recovered"
+            ),
+            pytest.param(
+                _HC_STUCK, "create", "failed", "", ("sb-1",), [], id="stuck-create-fails"
+            ),
+            # Replacement is cleaned up when deployment fails
+            pytest.param(
+                _HC_STUCK,
+                "deploy",
+                "failed",
+                "",
+                ("sb-1",),
+                ["sb-new"],
+                id="stuck-deploy-fails",
+            ),
+            # Unknown health leaves the sandbox running
+            pytest.param(_HC_UNKNOWN, None, "unknown", "sb-1", (), [], id="unknown-left-alone"),
+        ],
+    )
+    def test_handle_one_sandbox(
         self,
-        mock_controller: MagicMock,
-        mock_lifecycle: MagicMock,
+        mock_controller: StubController,
+        mock_lifecycle: StubLifecycle,
         config: WatchdogConfig,
+        health: HealthCheck,
+        fail_mode: str | None,
+        action: str,
+        sandbox_id: str,
+        killed: tuple[str, ...],
+        new_killed: list[str],
     ) -> None:
-        """Stuck agent killed but deployment to replacement fails."""
-        mock_controller.check_health.return_value = HealthCheck(
-            status=HealthStatus.STUCK,
-            sandbox_id="sb-1",
-        )
-        mock_lifecycle.deploy_self.return_value = False
-        result = _handle_one_sandbox(
-            mock_controller, mock_lifecycle, config, "sb-1"
-        )
-        assert result.action == "failed"
-        assert "deploy" in result.error.lower()
-        # New sandbox cleaned up
-        mock_lifecycle.controller.kill.assert_called_once_with("sb-new")
+        """Each health status maps to its action; stuck/dead sandboxes are replaced."""
+        mock_controller.health = health
+        if fail_mode == "create":
+            mock_lifecycle.successor = None
+        elif fail_mode == "deploy":
+            mock_lifecycle.deployed = False
 
-    def test_unknown_status_left_alone(
-        self,
-        mock_controller: MagicMock,
-        mock_lifecycle: MagicMock,
-        config: WatchdogConfig,
-    ) -> None:
-        """Unknown health status leaves sandbox running."""
-        mock_controller.check_health.return_value = HealthCheck(
-            status=HealthStatus.UNKNOWN,
-            sandbox_id="sb-1",
-            error="cannot read heartbeat",
-        )
         result = _handle_one_sandbox(
             mock_controller, mock_lifecycle, config, "sb-1"
         )
-        assert result.action == "unknown"
-        mock_controller.kill.assert_not_called()
+        assert result.action == action
+        assert result.sandbox_id == sandbox_id
+        assert result.killed == killed
+        assert mock_controller.kill_calls == list(killed)
+        assert mock_lifecycle.controller.kill_calls == new_killed
+        if fail_mode is not None:
+            assert fail_mode in result.error.lower()
 
 
 # --- Multiple sandboxes tests ---
@@ -276,8 +350,8 @@ class TestHandleMultipleSandboxes:
 
     def test_keeps_healthiest(
         self,
-        mock_controller: MagicMock,
-        mock_lifecycle: MagicMock,
+        mock_controller: StubController,
+        mock_lifecycle: StubLifecycle,
         config: WatchdogConfig,
     ) -> None:
         """Keeps the sandbox with the freshest heartbeat."""
@@ -286,33 +360,20 @@ class TestHandleMultipleSandboxes:
             SandboxInfo(sandbox_id="sb-fresh"),
         ]
 
-        def health_side_effect(sandbox_id, **kwargs):
-            if sandbox_id == "sb-fresh":
-                return HealthCheck(
-                    status=HealthStatus.HEALTHY,
-                    sandbox_id="sb-fresh",
-                    seconds_since_heartbeat=5.0,
-                )
-            return HealthCheck(
-                status=HealthStatus.HEALTHY,
-                sandbox_id="sb-old",
-                seconds_since_heartbeat=30.0,
-            )
-
-        mock_controller.check_health.side_effect = health_side_effect
-        mock_lifecycle.cleanup_orphans.return_value = ["sb-old"]
+        mock_lifecycle.orphans = ["sb-old"]
 
         result = _handle_multiple_sandboxes(
-            mock_controller, mock_lifecycle, config, sandboxes
+            mock_controller, mock_lifecycle, config, sandboxes, _HEALTH_FRESH_AND_OLD
         )
         assert result.action == "cleaned"
         assert result.sandbox_id == "sb-fresh"
         assert "sb-old" in result.killed
+        assert mock_controller.calls == []  # Health came in pre-fetched
 
     def test_all_unhealthy_redeploys(
         self,
-        mock_controller: MagicMock,
-        mock_lifecycle: MagicMock,
+        mock_controller: StubController,
+        mock_lifecycle: StubLifecycle,
         config: WatchdogConfig,
     ) -> None:
         """When all sandboxes are unhealthy, kills all and redeploys."""
@@ -321,23 +382,23 @@ class TestHandleMultipleSandboxes:
             SandboxInfo(sandbox_id="sb-2"),
         ]
 
-        mock_controller.check_health.return_value = HealthCheck(
-            status=HealthStatus.STUCK,
-            sandbox_id="sb-1",
-        )
-        mock_lifecycle.cleanup_orphans.return_value = ["sb-2"]
+        mock_lifecycle.orphans = ["sb-2"]
 
         result = _handle_multiple_sandboxes(
-            mock_controller, mock_lifecycle, config, sandboxes
+            mock_controller,
+            mock_lifecycle,
+            config,
+            sandboxes,
+            {"sb-1": _HC_STUCK, "sb-2": _HC_STUCK},
         )
         assert result.action == "recovered"
         assert result.sandbox_id == "sb-new"
-        assert "sb-1" in result.killed
+        assert result.killed == ("sb-2", "sb-1")
 
     def test_no_healthy_keeps_first(
         self,
-        mock_controller: MagicMock,
-        mock_lifecycle: MagicMock,
+        mock_controller: StubController,
+        mock_lifecycle: StubLifecycle,
         config: WatchdogConfig,
     ) -> None:
         """When no sandbox is HEALTHY, keeps the first one."""
@@ -346,15 +407,15 @@ class TestHandleMultipleSandboxes:
             SandboxInfo(sandbox_id="sb-B"),
         ]
 
-        # Both UNKNOWN — neither is HEALTHY
-        mock_controller.check_health.return_value = HealthCheck(
-            status=HealthStatus.UNKNOWN,
-            sandbox_id="sb-A",
-        )
-        mock_lifecycle.cleanup_orphans.return_value = ["sb-B"]
+        mock_lifecycle.orphans = ["sb-B"]
 
+        # Both UNKNOWN — neither is HEALTHY
         result = _handle_multiple_sandboxes(
-            mock_controller, mock_lifecycle, config, sandboxes
+            mock_controller,
+            mock_lifecycle,
+            config,
+            sandboxes,
+            {"sb-A": _HC_UNKNOWN, "sb-B": _HC_UNKNOWN},
         )
         # UNKNOWN is not STUCK/DEAD, so keeper is left alive
         assert result.action == "cleaned"
@@ -367,82 +428,53 @@ class TestHandleMultipleSandboxes:
 class TestRunWatchdog:
     """Tests for the full run_watchdog function."""
 
-    @patch("scripts.watchdog_check.SandboxController")
-    @patch("scripts.watchdog_check.LifecycleManager")
     def test_no_sandboxes_deploys(
         self,
-        mock_lm_cls: MagicMock,
-        mock_ctrl_cls: MagicMock,
+        mock_controller: StubController,
         config: WatchdogConfig,
+        factories: dict[str, Any],
     ) -> None:
         """run_watchdog deploys when no sandboxes found."""
-        mock_ctrl = MagicMock()
-        mock_ctrl.list_sandboxes.return_value = []
-        mock_ctrl_cls.return_value = mock_ctrl
-
-        mock_lm = MagicMock()
-        mock_lm.create_successor.return_value = "sb-new"
-        mock_lm.deploy_self.return_value = True
-        mock_lm.controller = mock_ctrl
-        mock_lm_cls.return_value = mock_lm
-
-        result = run_watchdog(config)
+        result = run_watchdog(config, **factories)
         assert result.action == "deployed"
+        assert mock_controller.calls[-1] == ("close",)
 
-    @patch("scripts.watchdog_check.SandboxController")
-    @patch("scripts.watchdog_check.LifecycleManager")
     def test_healthy_sandbox(
         self,
-        mock_lm_cls: MagicMock,
-        mock_ctrl_cls: MagicMock,
+        mock_controller: StubController,
         config: WatchdogConfig,
+        factories: dict[str, Any],
     ) -> None:
         """run_watchdog reports healthy for healthy sandbox."""
-        mock_ctrl = MagicMock()
-        mock_ctrl.list_sandboxes.return_value = [
-            SandboxInfo(sandbox_id="sb-1"),
-        ]
-        mock_ctrl.check_health.return_value = HealthCheck(
-            status=HealthStatus.HEALTHY,
-            sandbox_id="sb-1",
-            seconds_since_heartbeat=5.0,
-        )
-        mock_ctrl_cls.return_value = mock_ctrl
-
-        mock_lm = MagicMock()
-        mock_lm_cls.return_value = mock_lm
+        mock_controller.sandboxes = [SandboxInfo(sandbox_id="sb-1")]
+        mock_controller.health = _HC_HEALTHY
 
-        result = run_watchdog(config)
+        result = run_watchdog(config, **factories)
         assert result.action == "healthy"
         assert result.sandbox_id == "sb-1"
 
-    @patch("scripts.watchdog_check.SandboxController")
-    @patch("scripts.watchdog_check.LifecycleManager")
     def test_multiple_sandboxes_cleaned(
         self,
-        mock_lm_cls: MagicMock,
-        mock_ctrl_cls: MagicMock,
+        mock_controller: StubController,
+        mock_lifecycle: StubLifecycle,
         config: WatchdogConfig,
+        factories: dict[str, Any],
     ) -> None:
         """run_watchdog cleans up multiple sandboxes."""
-        mock_ctrl = MagicMock()
-        mock_ctrl.list_sandboxes.return_value = [
+        mock_controller.sandboxes = [
             SandboxInfo(sandbox_id="sb-1"),
             SandboxInfo(sandbox_id="sb-2"),
         ]
-        mock_ctrl.check_health.return_value = HealthCheck(
-            status=HealthStatus.HEALTHY,
-            sandbox_id="sb-1",
-            seconds_since_heartbeat=5.0,
-        )
-        mock_ctrl_cls.return_value = mock_ctrl
-
-        mock_lm = MagicMock()
-        mock_lm.cleanup_orphans.return_value = ["sb-2"]
-        mock_lm_cls.return_value = mock_lm
+        mock_controller.health = _HC_HEALTHY
+        mock_lifecycle.orphans = ["sb-2"]
 
-        result = run_watchdog(config)
+        result = run_watchdog(config, **factories)
         assert result.action == "cleaned"
+        # One health check per sandbox; the keeper's result is reused
+        assert mock_controller.calls_to("check_health") == [
+            ("sb-1",),
+            ("sb-2",),
+        ]
 
 
 # --- WatchdogConfig envs tests ---
@@ -452,17 +484,13 @@ class TestWatchdogConfigEnvs:
     """Tests for envs dict in WatchdogConfig."""
 
     def test_from_env_collects_optional_secrets(
-        self, monkeypatch: pytest.MonkeyPatch
+        self, environ: dict[str, str]
     ) -> None:
         """from_env() collects optional secrets into envs dict."""
-        monkeypatch.setenv("E2B_API_KEY", "key1")
-        monkeypatch.setenv("BRAIN_REPO_URL", "https://example.com/brain")
-        monkeypatch.setenv("GITHUB_TOKEN", "ghp_tok")
-        monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
-        monkeypatch.setenv("MOLTBOOK_API_KEY", "mb-test")
-        monkeypatch.delenv("LANGSMITH_API_KEY", raising=False)
-
-        cfg = WatchdogConfig.from_env()
+        environ["OPENAI_API_KEY"] = "sk-test"
+        environ["MOLTBOOK_API_KEY"] = "mb-test"
+
+        cfg = WatchdogConfig.from_env(environ=environ)
         assert cfg.envs.get("OPENAI_API_KEY") == "sk-test"
         assert cfg.envs.get("MOLTBOOK_API_KEY") == "mb-test"
         assert cfg.envs.get("E2B_API_KEY") == "key1"
@@ -470,19 +498,16 @@ class TestWatchdogConfigEnvs:
         assert "LANGSMITH_API_KEY" not in cfg.envs
 
     def test_from_env_empty_optional_vars_excluded(
-        self, monkeypatch: pytest.MonkeyPatch
+        self, environ: dict[str, str]
     ) -> None:
         """Optional vars set to empty string are excluded from envs."""
-        monkeypatch.setenv("E2B_API_KEY", "key1")
-        monkeypatch.setenv("BRAIN_REPO_URL", "https://example.com/brain")
-        monkeypatch.setenv("GITHUB_TOKEN", "ghp_tok")
-        monkeypatch.setenv("OPENAI_API_KEY", "")  # empty — should be excluded
+        environ["OPENAI_API_KEY"] = ""  # empty — should be excluded
 
-        cfg = WatchdogConfig.from_env()
+        cfg = WatchdogConfig.from_env(environ=environ)
         assert "OPENAI_API_KEY" not in cfg.envs
 
     def test_envs_passed_to_deploy_self_on_no_sandboxes(
-        self, mock_lifecycle: MagicMock
+        self, mock_lifecycle: StubLifecycle
     ) -> None:
         """envs from config are forwarded to deploy_self when deploying fresh sandbox."""
         cfg = WatchdogConfig(
@@ -492,31 +517,18 @@ class TestWatchdogConfigEnvs:
             envs={"OPENAI_API_KEY": "sk-test"},
         )
         _handle_no_sandboxes(mock_lifecycle, cfg)
-        _, call_kwargs = mock_lifecycle.deploy_self.call_args
-        assert call_kwargs.get("envs", {}).get("OPENAI_API_KEY") == "sk-test"
+        *_, envs = mock_lifecycle.calls[-1]
+        assert envs == {"OPENAI_API_KEY": "sk-test"}
 
     def test_sandbox_controller_uses_api_key_param(
-        self, monkeypatch: pytest.MonkeyPatch
+        self,
+        environ: dict[str, str],
+        controller_kwargs: list[dict[str, Any]],
+        factories: dict[str, Any],
     ) -> None:
         """SandboxController is constructed with api_key= (not e2b_api_key=)."""
-        monkeypatch.setenv("E2B_API_KEY", "key1")
-        monkeypatch.setenv("BRAIN_REPO_URL", "https://example.com/brain")
-        monkeypatch.setenv("GITHUB_TOKEN", "ghp_tok")
-
-        with (
-            patch("scripts.watchdog_check.SandboxController") as mock_ctrl_cls,
-            patch("scripts.watchdog_check.LifecycleManager") as mock_lm_cls,
-        ):
-            mock_ctrl = MagicMock()
-            mock_ctrl.list_sandboxes.return_value = []
-            mock_ctrl_cls.return_value = mock_ctrl
-            mock_lm = MagicMock()
-            mock_lm.create_successor.return_value = "sb-new"
-            mock_lm.deploy_self.return_value = True
-            mock_lm_cls.return_value = mock_lm
-
-            cfg = WatchdogConfig.from_env()
-            run_watchdog(cfg)
-
-            # Must use api_key=, not e2b_api_key=
-            mock_ctrl_cls.assert_called_once_with(api_key="key1")
+        cfg = WatchdogConfig.from_env(environ=environ)
+        run_watchdog(cfg, **factories)
+
+        # Must use api_key=, not e2b_api_key=
+        assert controller_kwargs == [{"api_key": "key1"}]